@@ -0,0 +1,109 @@
+"""Measure the throughput of the batch planner (users planned per second) for different numbers of worker processes.
+
+Every user gets a busy day with meetings shared with a few teammates, so the planner has real invitee
+calendars to intersect, and every team is planned jointly as one group. Workers read everyone's busy time from
+shared memory, so the peak memory of a worker should stay flat as workers are added.
+
+Run with `uv run python -m benchmarks.batch`.
+"""
+
+import os
+import resource
+from datetime import datetime, timedelta
+from random import Random
+from time import perf_counter
+from typing import override
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.results.mock_results_store import MockReschedulingResultsStore
+from src.planning.batch import plan_batch
+from src.types.calendar import Calendar, CalendarId
+from src.types.calendar_event import CalendarEvent, CalendarEventId, CalendarEventInvitee
+from src.types.user import User, UserId
+from src.types.user_provider import UserNotFoundError, UserProvider
+
+TIMEZONE = "America/New_York"
+DATE = datetime(2025, 8, 11, tzinfo=ZoneInfo(TIMEZONE))
+USERS = 1_000
+EVENTS_PER_USER = 8
+INVITEES_PER_EVENT = 2
+# Invitees come from the owner's team, so each team is planned as one group.
+TEAM_SIZE = 10
+WORKER_COUNTS = sorted({1, 2, 4, os.process_cpu_count() or 1})
+
+
+class BenchmarkUserProvider(UserProvider):
+    users: dict[UserId, User]
+
+    @override
+    def get_user(self, user_id: UserId) -> User:
+        try:
+            return self.users[user_id]
+        except KeyError as e:
+            raise UserNotFoundError(user_id) from e
+
+
+def make_user(index: int) -> User:
+    return User(
+        id=UserId(uuid4()),
+        given_name=f"User {index}",
+        timezone=TIMEZONE,
+        avatar_url="https://example.com/avatar.svg",
+        preffered_working_hours=(9, 17),
+    )
+
+
+def generate_org(rng: Random) -> tuple[list[User], dict[UserId, Calendar]]:
+    """Generate users whose own events are spread over the day, each with a couple of teammates invited."""
+    users = [make_user(i) for i in range(USERS)]
+    events: dict[UserId, list[CalendarEvent]] = {user.id: [] for user in users}
+    next_id = 0
+    for index, user in enumerate(users):
+        team = users[index - index % TEAM_SIZE : index - index % TEAM_SIZE + TEAM_SIZE]
+        for quarter in sorted(rng.sample(range(9 * 4, 16 * 4, 2), EVENTS_PER_USER)):
+            start_time = DATE + timedelta(minutes=quarter * 15)
+            invitees = rng.sample([teammate for teammate in team if teammate is not user], INVITEES_PER_EVENT)
+            event = CalendarEvent(
+                id=CalendarEventId(next_id),
+                title=f"Event {next_id}",
+                owner=user.id,
+                invitees=[CalendarEventInvitee(id=invitee.id) for invitee in invitees],
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=30),
+                created_at=DATE,
+                updated_at=DATE,
+            )
+            next_id += 1
+            for attendee in {user.id, *(invitee.id for invitee in invitees)}:
+                events[attendee].append(event)
+    calendars: dict[UserId, Calendar] = {
+        user.id: MockCalendar(
+            id=CalendarId(uuid4()),
+            name=f"{user.given_name}'s Calendar",
+            owner=user.id,
+            events=events[user.id],
+            created_at=DATE,
+            updated_at=DATE,
+        )
+        for user in users
+    }
+    return users, calendars
+
+
+def main() -> None:
+    users, calendars = generate_org(Random(0))
+    user_provider = BenchmarkUserProvider(users={user.id: user for user in users})
+    print(f"{'workers':>8} {'users per second':>17} {'seconds':>8} {'peak worker RSS (MB)':>21}")
+    for workers in WORKER_COUNTS:
+        started = perf_counter()
+        plan_batch(users, [DATE], calendars, user_provider, MockReschedulingResultsStore(), workers=workers)
+        elapsed = perf_counter() - started
+        # The largest resident set of any worker so far, in kilobytes on Linux.
+        peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        print(f"{workers:>8} {len(users) / elapsed:>17,.0f} {elapsed:>8.2f} {peak_rss:>21,.0f}")
+
+
+if __name__ == "__main__":
+    main()
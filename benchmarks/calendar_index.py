@@ -0,0 +1,148 @@
+"""Compare the indexed MockCalendar against the original list scan.
+
+Run with `uv run python -m benchmarks.calendar_index`.
+"""
+
+import asyncio
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from random import Random
+from time import perf_counter
+from typing import Self, override
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from pydantic import Field
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.user.mock_user_provider import me, mock_users, my_user_id
+from src.types.calendar import Calendar, CalendarId, EventTimeChange, EventTimeChangeResult
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+
+EVENT_COUNTS = (1_000, 10_000, 50_000)
+DAYS = 365
+LOOKUPS = 500
+
+
+class ListScanCalendar(Calendar):
+    """The original MockCalendar implementation, kept here as the baseline."""
+
+    events: list[CalendarEvent] = Field(default_factory=list)
+
+    def add_event(self: Self, event: CalendarEvent) -> None:
+        """Add an event to the calendar."""
+        self.events.append(event)
+
+    @override
+    def get_events_on(self: Self, date: datetime) -> list[CalendarEvent]:
+        return [event for event in self.events if event.start_time.date() == date.date()]
+
+    @override
+    def get_events_between(self: Self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        return sorted(
+            (event for event in self.events if event.start_time < end and event.end_time > start),
+            key=lambda event: event.start_time,
+        )
+
+    @override
+    async def change_event_time(self: Self, event_id: CalendarEventId, new_start_time: datetime, new_end_time: datetime) -> None:
+        self._move_event(event_id, new_start_time, new_end_time)
+
+    @override
+    async def change_event_times(self: Self, changes: Sequence[EventTimeChange]) -> list[EventTimeChangeResult]:
+        results: list[EventTimeChangeResult] = []
+        for change in changes:
+            try:
+                self._move_event(change.event_id, change.new_start_time, change.new_end_time)
+                results.append(EventTimeChangeResult(event_id=change.event_id, success=True))
+            except ValueError as e:
+                results.append(EventTimeChangeResult(event_id=change.event_id, success=False, error=str(e)))
+        return results
+
+    def _move_event(self: Self, event_id: CalendarEventId, new_start_time: datetime, new_end_time: datetime) -> None:
+        for event in self.events:
+            if event.id == event_id:
+                event.start_time = new_start_time
+                event.end_time = new_end_time
+                event.updated_at = datetime.now(tz=ZoneInfo(mock_users[event.owner].timezone))
+                self.notify_event_time_changed(event_id)
+                return
+        msg = f"Event with id {event_id} not found"
+        raise ValueError(msg)
+
+
+def generate_events(count: int, rng: Random) -> list[CalendarEvent]:
+    tz = ZoneInfo(me.timezone)
+    first_day = datetime(2025, 1, 1, tzinfo=tz)
+    events = []
+    for i in range(count):
+        start_time = first_day + timedelta(days=rng.randrange(DAYS), minutes=15 * rng.randrange(8 * 4, 18 * 4))
+        events.append(
+            CalendarEvent(
+                id=CalendarEventId(i),
+                title=f"Event {i}",
+                owner=my_user_id,
+                start_time=start_time,
+                end_time=start_time + timedelta(minutes=30),
+                created_at=first_day,
+                updated_at=first_day,
+            ),
+        )
+    return events
+
+
+def build(calendar_type: type[MockCalendar | ListScanCalendar], events: list[CalendarEvent]) -> MockCalendar | ListScanCalendar:
+    calendar = calendar_type(
+        id=CalendarId(uuid4()),
+        name="Benchmark Calendar",
+        owner=my_user_id,
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+    for event in events:
+        calendar.add_event(event.model_copy())
+    return calendar
+
+
+def time_per_call_us(calendar: Calendar, dates: list[datetime], event_ids: list[CalendarEventId]) -> tuple[float, float, float]:
+    started = perf_counter()
+    for date in dates:
+        calendar.get_events_on(date)
+    get_events_on = (perf_counter() - started) / len(dates) * 1e6
+
+    started = perf_counter()
+    for date in dates:
+        calendar.get_events_between(date, date + timedelta(days=7))
+    get_events_between = (perf_counter() - started) / len(dates) * 1e6
+
+    async def change_all() -> None:
+        for event_id, date in zip(event_ids, dates, strict=True):
+            await calendar.change_event_time(event_id, date, date + timedelta(minutes=30))
+
+    started = perf_counter()
+    asyncio.run(change_all())
+    change_event_time = (perf_counter() - started) / len(event_ids) * 1e6
+    return get_events_on, get_events_between, change_event_time
+
+
+def main() -> None:
+    rng = Random(0)
+    print(
+        f"{'events':>8} {'calendar':>16} {'get_events_on (us)':>20} {'get_events_between 7d (us)':>28} "
+        f"{'change_event_time (us)':>24}",
+    )
+    for count in EVENT_COUNTS:
+        events = generate_events(count, rng)
+        dates = [events[rng.randrange(count)].start_time for _ in range(LOOKUPS)]
+        event_ids = [CalendarEventId(rng.randrange(count)) for _ in range(LOOKUPS)]
+        for calendar_type in (ListScanCalendar, MockCalendar):
+            calendar = build(calendar_type, events)
+            get_events_on, get_events_between, change_event_time = time_per_call_us(calendar, dates, event_ids)
+            print(
+                f"{count:>8} {calendar_type.__name__:>16} {get_events_on:>20.1f} {get_events_between:>28.1f} "
+                f"{change_event_time:>24.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
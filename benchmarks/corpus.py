@@ -0,0 +1,209 @@
+"""A generated corpus of single days to compact, each with its optimal objective worked out exactly.
+
+Days vary in event count, invitee count, the user's timezone and their working hours. Every event starts on a
+quarter hour and lasts a whole number of quarter hours, which keeps an exhaustive search over quarter-hour
+starts fast enough to find the optimum of every day when the corpus is generated.
+
+The optimum is the fewest gap minutes any valid schedule can reach, and the fewest moved events that reach it.
+The last term of `ScheduleObjective` (the sum of the starts) is only a tie-breaker, so it is not part of it.
+
+Users are copies of the mock users with a different timezone and working hours, so the rescheduling agent can
+still look their names up.
+"""
+
+import itertools
+from datetime import datetime, timedelta
+from random import Random
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.user.mock_user_provider import adams_user, me, pauls_user, sallys_user
+from src.planning.free_busy import fitting_starts
+from src.planning.solver import CompactionProblem
+from src.types.calendar import Calendar, CalendarId
+from src.types.calendar_event import CalendarEvent, CalendarEventId, CalendarEventInvitee
+from src.types.user import User
+
+QUARTER = 15
+TIMEZONES = ("America/New_York", "America/Los_Angeles", "Europe/London", "Asia/Tokyo")
+WORKING_HOURS = ((9, 17), (8, 16), (10, 18), (7, 15))
+EVENT_COUNTS = range(4, 11)
+INVITEE_COUNTS = range(4)
+DURATIONS = (15, 30, 45, 60, 90)
+INVITE_PROBABILITY = 0.6
+INVITEE_EVENTS = range(3, 8)
+
+
+class CorpusDay(BaseModel):
+    """One day of a user's calendar, with the calendars of their invitees and the best objective reachable."""
+
+    name: str
+    date: datetime
+    user: User
+    events: list[CalendarEvent]
+    invitees: list[User]
+    invitee_events: list[list[CalendarEvent]]
+    optimal_gap_minutes: int
+    optimal_moved_events: int
+
+    def calendars(self) -> tuple[MockCalendar, list[tuple[User, Calendar]]]:
+        """Build the user's calendar and every invitee's calendar, sharing the event objects between them."""
+        return make_calendar(self.user, self.events), [
+            (invitee, make_calendar(invitee, events)) for invitee, events in zip(self.invitees, self.invitee_events, strict=True)
+        ]
+
+
+def make_calendar(owner: User, events: list[CalendarEvent]) -> MockCalendar:
+    return MockCalendar(
+        id=CalendarId(uuid4()),
+        name=f"{owner.given_name}'s Calendar",
+        owner=owner.id,
+        events=events,
+        created_at=datetime(2025, 8, 1, tzinfo=ZoneInfo(owner.timezone)),
+        updated_at=datetime(2025, 8, 1, tzinfo=ZoneInfo(owner.timezone)),
+    )
+
+
+def make_event(event_id: int, start_time: datetime, minutes: int, owner: User, invitees: list[User]) -> CalendarEvent:
+    return CalendarEvent(
+        id=CalendarEventId(event_id),
+        title=f"Event {event_id}",
+        owner=owner.id,
+        invitees=[CalendarEventInvitee(id=invitee.id) for invitee in invitees],
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=minutes),
+        created_at=start_time,
+        updated_at=start_time,
+    )
+
+
+def overlaps(event: CalendarEvent, others: list[CalendarEvent]) -> bool:
+    return any(event.start_time < other.end_time and other.start_time < event.end_time for other in others)
+
+
+def quarter_hour_starts(rng: Random, count: int, day: datetime, hours: tuple[int, int]) -> list[datetime]:
+    """Pick `count` distinct quarter-hour start times inside the working hours of `day`, in order."""
+    quarters = range(hours[0] * 4, hours[1] * 4)
+    return [day + timedelta(minutes=quarter * QUARTER) for quarter in sorted(rng.sample(quarters, count))]
+
+
+def generate_day(rng: Random, index: int) -> CorpusDay:
+    """Generate a day with a few of the user's own events, some shared with invitees who have events of their own."""
+    user = me.model_copy(update={"timezone": rng.choice(TIMEZONES), "preffered_working_hours": rng.choice(WORKING_HOURS)})
+    invitees = rng.sample([adams_user, sallys_user, pauls_user], rng.choice(INVITEE_COUNTS))
+    date = datetime(2025, 8, 11, tzinfo=ZoneInfo(user.timezone))
+    next_id = index * 100
+
+    events: list[CalendarEvent] = []
+    # Events overlapping an earlier one are dropped, which varies the event counts further.
+    for start_time in quarter_hour_starts(rng, rng.choice(EVENT_COUNTS), date, user.preffered_working_hours):
+        event = make_event(
+            next_id,
+            start_time,
+            rng.choice(DURATIONS),
+            user,
+            [i for i in invitees if rng.random() < INVITE_PROBABILITY],
+        )
+        next_id += 1
+        if not overlaps(event, events):
+            events.append(event)
+
+    invitee_events: list[list[CalendarEvent]] = []
+    for invitee in invitees:
+        attended = [event for event in events if invitee.id in {i.id for i in event.invitees}]
+        own: list[CalendarEvent] = []
+        # The invitee's own day that overlaps most of the user's day, which differs across the date line.
+        local_day = (date + timedelta(hours=12)).astimezone(ZoneInfo(invitee.timezone)).replace(hour=0, minute=0)
+        for start_time in quarter_hour_starts(rng, rng.choice(INVITEE_EVENTS), local_day, invitee.preffered_working_hours):
+            event = make_event(next_id, start_time, rng.choice(DURATIONS), invitee, [])
+            next_id += 1
+            if not overlaps(event, [*attended, *own]):
+                own.append(event)
+        invitee_events.append([*attended, *own])
+
+    day = CorpusDay(
+        name=f"day-{index:03d}",
+        date=date,
+        user=user,
+        events=events,
+        invitees=invitees,
+        invitee_events=invitee_events,
+        optimal_gap_minutes=0,
+        optimal_moved_events=0,
+    )
+    calendar, other_invitees = day.calendars()
+    day.optimal_gap_minutes, day.optimal_moved_events = optimal_objective(
+        CompactionProblem.build(date, user, calendar, other_invitees),
+    )
+    return day
+
+
+def generate_corpus(days: int = 60, seed: int = 0) -> list[CorpusDay]:
+    """Generate the same corpus for the same seed."""
+    rng = Random(seed)
+    return [generate_day(rng, index) for index in range(days)]
+
+
+def quarters_of(bitmap: np.ndarray[tuple[int], np.dtype[np.bool_]]) -> int:
+    """Pack a minute bitmap into an int with one bit per quarter hour that has any minute set."""
+    return sum(1 << quarter for quarter in np.flatnonzero(bitmap.reshape(-1, QUARTER).any(axis=1)).tolist())
+
+
+def optimal_objective(problem: CompactionProblem) -> tuple[int, int]:
+    """Find the fewest gap minutes any schedule reaches, then the fewest moved events that reach it.
+
+    Every event either stays where it is (always allowed, even outside working hours) or moves to a quarter-hour
+    start where every attendee is free and working. The spans are tried from the shortest up, with every
+    position inside the day, until some schedule fits; then the move budget is raised from zero until one fits
+    the same span.
+
+    Returns:
+        The optimal gap minutes and moved events.
+
+    """
+    if problem.size == 0:
+        return problem.objective(problem.original_starts).gap_minutes, 0
+    slots = problem.window.minutes // QUARTER
+    fixed = quarters_of(problem.fixed_busy)
+    lengths = [int(duration) // QUARTER for duration in problem.durations.tolist()]
+    originals = [int(start) // QUARTER for start in problem.original_starts.tolist()]
+    moves = [
+        sorted(
+            {
+                int(start) // QUARTER
+                for start in fitting_starts(problem.allowed[i], int(problem.durations[i]))
+                if start % QUARTER == 0
+            }
+            - {originals[i]},
+        )
+        for i in range(problem.size)
+    ]
+    # Events with the fewest places to go first, so dead ends are found early.
+    order = sorted(range(problem.size), key=lambda i: len(moves[i]))
+
+    def fits(depth: int, occupied: int, low: int, high: int, budget: int) -> bool:
+        if depth == len(order):
+            return True
+        i = order[depth]
+        block = (1 << lengths[i]) - 1
+        starts = [(originals[i], 0)] + ([(start, 1) for start in moves[i]] if budget > 0 else [])
+        return any(
+            low <= start
+            and start + lengths[i] <= high
+            and not occupied & (block << start)
+            and fits(depth + 1, occupied | (block << start), low, high, budget - cost)
+            for start, cost in starts
+        )
+
+    def fits_span(span: int, budget: int) -> bool:
+        inside = range(slots - span + 1)
+        return any(not fixed & ~(((1 << span) - 1) << low) and fits(0, fixed, low, low + span, budget) for low in inside)
+
+    busy = fixed.bit_count() + sum(lengths)
+    span = next(span for span in itertools.count(busy) if fits_span(span, problem.size))
+    moved = next(budget for budget in range(problem.size + 1) if fits_span(span, budget))
+    return (span - busy) * QUARTER, moved
@@ -0,0 +1,109 @@
+"""Compare every rescheduling strategy against the known optimum of each day of the generated corpus.
+
+For each strategy this reports the latency percentiles, how many proposals break the rules the rescheduling
+agent is given, and how far the resulting schedules are from the optimum: the extra gap minutes left, the share
+of days solved optimally (fewest gap minutes with the fewest moves) and the extra events moved on the days
+where the gap is optimal.
+
+The hybrid and LLM strategies call a model for every day, so they only run with `--llm`.
+
+Run with `uv run python -m benchmarks.optimality [--llm]`.
+"""
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+from statistics import mean
+from time import perf_counter
+
+import numpy as np
+
+from benchmarks.corpus import CorpusDay, generate_corpus
+from src.agents.explanation import explain_rescheduling_proposals
+from src.agents.rescheduling import generate_uncached_rescheduling_proposals
+from src.planning.scoring import DayScorer
+from src.planning.search import search_rescheduling_proposals
+from src.planning.solver import solve_rescheduling_proposals
+from src.planning.validation import validate_rescheduling_proposals
+from src.types.rescheduled_event import PendingRescheduledEvent
+
+SEARCH_BUDGET_SECONDS = 0.1
+PERCENTILES = (50, 90, 99)
+
+Strategy = Callable[[CorpusDay], Awaitable[list[PendingRescheduledEvent]]]
+
+
+async def no_changes(_day: CorpusDay) -> list[PendingRescheduledEvent]:
+    return []
+
+
+async def solver(day: CorpusDay) -> list[PendingRescheduledEvent]:
+    calendar, other_invitees = day.calendars()
+    return solve_rescheduling_proposals(day.date, day.user, calendar, other_invitees)
+
+
+async def searcher(day: CorpusDay) -> list[PendingRescheduledEvent]:
+    calendar, other_invitees = day.calendars()
+    return search_rescheduling_proposals(day.date, day.user, calendar, other_invitees, SEARCH_BUDGET_SECONDS)[0]
+
+
+async def hybrid(day: CorpusDay) -> list[PendingRescheduledEvent]:
+    calendar, other_invitees = day.calendars()
+    proposals = [
+        proposal.model_copy(update={"explanation": None})
+        for proposal in solve_rescheduling_proposals(day.date, day.user, calendar, other_invitees)
+    ]
+    before, after = DayScorer.for_day(day.date, day.user, calendar).score_rescheduled_events([[], proposals])
+    # Measured as if the proposals were shown right away, which is when their explanations get written.
+    return await explain_rescheduling_proposals(day.user, proposals, before, after)
+
+
+async def llm(day: CorpusDay) -> list[PendingRescheduledEvent]:
+    calendar, other_invitees = day.calendars()
+    return await generate_uncached_rescheduling_proposals(day.date, day.user, calendar, other_invitees)
+
+
+async def evaluate(name: str, strategy: Strategy, corpus: list[CorpusDay]) -> None:
+    latencies: list[float] = []
+    violations: list[int] = []
+    extra_gaps: list[int] = []
+    extra_moves: list[int] = []
+    optimal = 0
+    for day in corpus:
+        started = perf_counter()
+        proposals = await strategy(day)
+        latencies.append((perf_counter() - started) * 1e3)
+
+        calendar, other_invitees = day.calendars()
+        violations.append(len(validate_rescheduling_proposals(day.date, day.user, calendar, other_invitees, proposals)))
+        objective = DayScorer.for_day(day.date, day.user, calendar).score_rescheduled_events([proposals])[0]
+        extra_gaps.append(objective.gap_minutes - day.optimal_gap_minutes)
+        if objective.gap_minutes == day.optimal_gap_minutes:
+            extra_moves.append(objective.moved_events - day.optimal_moved_events)
+            optimal += objective.moved_events == day.optimal_moved_events
+
+    p50, p90, p99 = np.percentile(latencies, PERCENTILES).tolist()
+    print(
+        f"{name:>11} {p50:>9.1f} {p90:>9.1f} {p99:>9.1f} {sum(violations):>11} {sum(map(bool, violations)):>15} "
+        f"{mean(extra_gaps):>11.1f} {optimal / len(corpus):>8.0%} {mean(extra_moves) if extra_moves else 0:>12.2f}",
+    )
+
+
+async def main() -> None:
+    started = perf_counter()
+    corpus = generate_corpus()
+    print(f"Generated {len(corpus)} days and their optima in {perf_counter() - started:.1f}s\n")
+
+    strategies: dict[str, Strategy] = {"none": no_changes, "solver": solver, f"search {SEARCH_BUDGET_SECONDS}s": searcher}
+    if "--llm" in sys.argv[1:]:
+        strategies |= {"hybrid": hybrid, "llm": llm}
+    print(
+        f"{'strategy':>11} {'p50 (ms)':>9} {'p90 (ms)':>9} {'p99 (ms)':>9} {'violations':>11} {'days violating':>15} "
+        f"{'extra gap':>11} {'optimal':>8} {'extra moves':>12}",
+    )
+    for name, strategy in strategies.items():
+        await evaluate(name, strategy, corpus)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Compare the two reasoning modes of the rescheduling and messaging agents.
+
+In the 'two_call' mode each agent answers in free text and a second call formats the answer, while in the
+'single_call' mode the agent gives the structured answer directly. For each mode and agent this reports the
+latency percentiles, the model calls and prompt tokens per answer, and how good the answers are: rule
+violations of the rescheduling proposals, and the share of the canned replies of `src.utilities.sentiment`
+that are resolved correctly.
+
+Every answer calls a model, so this needs an OpenAI API key.
+
+Run with `uv run python -m benchmarks.reasoning [days]`.
+"""
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from time import perf_counter
+from typing import Literal
+
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+from src.agents.messaging import determine_rescheduling_proposal_resolution
+from src.agents.rescheduling import generate_uncached_rescheduling_proposals
+from src.callbacks.record_prompt_token_usage import prompt_token_usage
+from src.config.main import config
+from src.planning.validation import validate_rescheduling_proposals
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent
+from src.utilities.sentiment import NEGATIVE_RESPONSES, POSITIVE_RESPONSES
+
+DAYS = 10
+MODES: tuple[Literal["single_call", "two_call"], ...] = ("two_call", "single_call")
+PERCENTILES = (50, 90)
+
+
+def usage() -> tuple[int, int]:
+    """Get the model calls and prompt tokens of every source so far."""
+    return sum(usage.calls for usage in prompt_token_usage.values()), sum(
+        usage.input_tokens for usage in prompt_token_usage.values()
+    )
+
+
+async def measure(name: str, answers: list[Callable[[], Awaitable[bool]]]) -> None:
+    """Run every answer in turn, each returning whether it is correct, and report on them."""
+    latencies: list[float] = []
+    correct = 0
+    calls, tokens = usage()
+    for answer in answers:
+        started = perf_counter()
+        correct += await answer()
+        latencies.append((perf_counter() - started) * 1e3)
+    end_calls, end_tokens = usage()
+
+    p50, p90 = np.percentile(latencies, PERCENTILES).tolist()
+    print(
+        f"{name:>24} {p50:>9.0f} {p90:>9.0f} {(end_calls - calls) / len(answers):>7.1f} "
+        f"{(end_tokens - tokens) / len(answers):>14.0f} {correct / len(answers):>8.0%}",
+    )
+
+
+async def main() -> None:
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else DAYS
+    corpus = generate_corpus(days)
+    day = corpus[0]
+    event = day.events[0]
+    proposal = PendingRescheduledEvent(
+        original_event=event,
+        new_start_time=event.start_time + timedelta(hours=1),
+        new_end_time=event.end_time + timedelta(hours=1),
+    )
+    message = f"Hi, can we move {event.title} an hour later?"
+    replies = [(reply, True) for reply in POSITIVE_RESPONSES] + [(reply, False) for reply in NEGATIVE_RESPONSES]
+
+    print(f"Rescheduling {len(corpus)} days and resolving {len(replies)} replies in each mode\n")
+    print(f"{'mode and agent':>24} {'p50 (ms)':>9} {'p90 (ms)':>9} {'calls':>7} {'prompt tokens':>14} {'correct':>8}")
+
+    for mode in MODES:
+        config.llm_reasoning_mode = mode
+
+        def reschedule(day_index: int) -> Callable[[], Awaitable[bool]]:
+            async def answer() -> bool:
+                corpus_day = corpus[day_index]
+                calendar, other_invitees = corpus_day.calendars()
+                proposals = await generate_uncached_rescheduling_proposals(
+                    corpus_day.date,
+                    corpus_day.user,
+                    calendar,
+                    other_invitees,
+                )
+                return not validate_rescheduling_proposals(corpus_day.date, corpus_day.user, calendar, other_invitees, proposals)
+
+            return answer
+
+        def resolve(reply: str, *, accepted: bool) -> Callable[[], Awaitable[bool]]:
+            async def answer() -> bool:
+                resolution = await determine_rescheduling_proposal_resolution(proposal, message, reply)
+                return isinstance(resolution, AcceptedRescheduledEvent) == accepted
+
+            return answer
+
+        await measure(f"{mode} rescheduling", [reschedule(i) for i in range(len(corpus))])
+        await measure(f"{mode} messaging", [resolve(reply, accepted=accepted) for reply, accepted in replies])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""Measure how many invitee replies the local classifier resolves without a model, and how well.
+
+The replies are the canned ones of `src.utilities.sentiment`, which the mock messaging platform sends, plus
+less clear ones an invitee might write. For the classifier this reports the hit rate (the share of replies it is
+sure enough of to resolve by itself), how long it takes per reply, and its accuracy on the canned replies.
+
+With `--llm` every reply also goes to `determine_rescheduling_proposal_resolution`, to report how often the
+classifier agrees with it on the replies it resolves, and the model latency those replies no longer pay.
+
+Run with `uv run python -m benchmarks.replies [--llm]`.
+"""
+
+import asyncio
+import sys
+from datetime import timedelta
+from statistics import median
+from time import perf_counter
+
+from benchmarks.corpus import generate_corpus
+from src.agents.helpers.reply_classifier import classify_reply
+from src.agents.messaging import determine_rescheduling_proposal_resolution
+from src.config.main import config
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent
+from src.utilities.sentiment import NEGATIVE_RESPONSES, POSITIVE_RESPONSES
+
+UNCLEAR_REPLIES = (
+    "Can we do 3pm instead?",
+    "Let me check with my manager.",
+    "Sure, but only if we keep it to 30 minutes.",
+    "Not sure yet.",
+    "Ok but not at 10",
+    "Maybe later?",
+    "I have a hard stop at 11, would that still work?",
+    "Yes for the first one, no for the second.",
+    "Happy to move it",
+    "No worries, go ahead",
+)
+REPEATS = 1_000
+
+
+async def main() -> None:
+    threshold = config.messaging_reply_classifier_min_confidence
+    labelled = [(reply, True) for reply in POSITIVE_RESPONSES] + [(reply, False) for reply in NEGATIVE_RESPONSES]
+    replies = [reply for reply, _ in labelled] + list(UNCLEAR_REPLIES)
+
+    durations: list[float] = []
+    for reply in replies:
+        started = perf_counter()
+        for _ in range(REPEATS):
+            classify_reply(reply)
+        durations.append((perf_counter() - started) / REPEATS * 1e6)
+    classifications = {reply: classify_reply(reply) for reply in replies}
+    hits = [reply for reply in replies if classifications[reply].confidence >= threshold]
+    canned_hits = [(reply, accepted) for reply, accepted in labelled if classifications[reply].confidence >= threshold]
+    correct = sum(classifications[reply].accepted == accepted for reply, accepted in canned_hits)
+
+    print(f"Classified {len(replies)} replies with a minimum confidence of {threshold}\n")
+    print(f"{'hit rate (all)':>22} {len(hits) / len(replies):>7.0%}")
+    print(f"{'hit rate (canned)':>22} {len(canned_hits) / len(labelled):>7.0%}")
+    print(f"{'hit rate (unclear)':>22} {sum(reply in hits for reply in UNCLEAR_REPLIES) / len(UNCLEAR_REPLIES):>7.0%}")
+    print(f"{'accuracy (canned hits)':>22} {correct / len(canned_hits) if canned_hits else 0:>7.0%}")
+    print(f"{'p50 per reply (us)':>22} {median(durations):>7.1f}")
+    print(f"{'max per reply (us)':>22} {max(durations):>7.1f}")
+
+    if "--llm" not in sys.argv[1:]:
+        return
+
+    event = generate_corpus(1)[0].events[0]
+    proposal = PendingRescheduledEvent(
+        original_event=event,
+        new_start_time=event.start_time + timedelta(hours=1),
+        new_end_time=event.end_time + timedelta(hours=1),
+    )
+    message = f"Hi, can we move {event.title} an hour later?"
+    agreements = 0
+    latencies: list[float] = []
+    for reply in hits:
+        started = perf_counter()
+        resolution = await determine_rescheduling_proposal_resolution(proposal, message, reply)
+        latencies.append((perf_counter() - started) * 1e3)
+        agreements += isinstance(resolution, AcceptedRescheduledEvent) == classifications[reply].accepted
+    print(f"{'agreement with model':>22} {agreements / len(hits) if hits else 0:>7.0%}")
+    print(f"{'model p50 saved (ms)':>22} {median(latencies) if latencies else 0:>7.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""Compare the rescheduling strategies that run without an LLM, and measure how fast schedules can be scored.
+
+Every strategy's proposals are scored with the same `DayScorer`, so the objectives are directly comparable.
+
+Run with `uv run python -m benchmarks.rescheduling`.
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from random import Random
+from statistics import mean
+from time import perf_counter
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.user.mock_user_provider import adams_user, me
+from src.planning.scoring import DayScorer
+from src.planning.search import search_rescheduling_proposals
+from src.planning.solver import solve_rescheduling_proposals
+from src.types.calendar import Calendar, CalendarId
+from src.types.calendar_event import CalendarEvent, CalendarEventId, CalendarEventInvitee
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.user import User
+
+DATE = datetime(2025, 8, 11, tzinfo=ZoneInfo(me.timezone))
+DAYS = 20
+EVENTS_PER_DAY = 16
+INVITE_PROBABILITY = 0.5
+SEARCH_BUDGETS_SECONDS = (0.1, 0.5)
+SCORING_BATCH_SIZES = (1, 100, 1_000, 10_000)
+
+
+def make_calendar(owner: User, events: list[CalendarEvent]) -> MockCalendar:
+    return MockCalendar(
+        id=CalendarId(uuid4()),
+        name=f"{owner.given_name}'s Calendar",
+        owner=owner.id,
+        events=events,
+        created_at=DATE,
+        updated_at=DATE,
+    )
+
+
+def make_event(event_id: int, start_time: datetime, minutes: int, owner: User, invitees: tuple[User, ...]) -> CalendarEvent:
+    return CalendarEvent(
+        id=CalendarEventId(event_id),
+        title=f"Event {event_id}",
+        owner=owner.id,
+        invitees=[CalendarEventInvitee(id=invitee.id) for invitee in invitees],
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=minutes),
+        created_at=DATE,
+        updated_at=DATE,
+    )
+
+
+def generate_day(rng: Random) -> tuple[MockCalendar, list[tuple[User, Calendar]]]:
+    """Generate a day of non-overlapping events, some with Adam, plus a few of Adam's own events."""
+    events: list[CalendarEvent] = []
+    free_from = 9 * 60
+    for quarter in sorted(rng.sample(range(9 * 4, 16 * 4), EVENTS_PER_DAY)):
+        minute = quarter * 15
+        if minute >= free_from:
+            duration = rng.choice([15, 30, 45, 60])
+            invitees = (adams_user,) if rng.random() < INVITE_PROBABILITY else ()
+            events.append(make_event(len(events) + 1, DATE + timedelta(minutes=minute), duration, me, invitees))
+            free_from = minute + duration
+    adams_events = [make_event(100 + i, DATE + timedelta(hours=rng.randint(9, 16)), 30, adams_user, ()) for i in range(3)]
+    return make_calendar(me, events), [(adams_user, make_calendar(adams_user, [*events, *adams_events]))]
+
+
+Strategy = Callable[[MockCalendar, list[tuple[User, Calendar]]], list[PendingRescheduledEvent]]
+
+
+def no_changes(_calendar: MockCalendar, _other_invitees: list[tuple[User, Calendar]]) -> list[PendingRescheduledEvent]:
+    return []
+
+
+def solver(calendar: MockCalendar, other_invitees: list[tuple[User, Calendar]]) -> list[PendingRescheduledEvent]:
+    return solve_rescheduling_proposals(DATE, me, calendar, other_invitees)
+
+
+def searcher(budget_seconds: float) -> Strategy:
+    def search(calendar: MockCalendar, other_invitees: list[tuple[User, Calendar]]) -> list[PendingRescheduledEvent]:
+        return search_rescheduling_proposals(DATE, me, calendar, other_invitees, budget_seconds)[0]
+
+    return search
+
+
+def compare_strategies(days: list[tuple[MockCalendar, list[tuple[User, Calendar]]]]) -> None:
+    strategies: dict[str, Strategy] = {
+        "none": no_changes,
+        "solver": solver,
+        **{f"search {budget}s": searcher(budget) for budget in SEARCH_BUDGETS_SECONDS},
+    }
+    print(f"{'strategy':>12} {'gap minutes':>12} {'moved events':>13} {'latency (ms)':>13}")
+    for name, strategy in strategies.items():
+        gaps: list[int] = []
+        moves: list[int] = []
+        latencies: list[float] = []
+        for calendar, other_invitees in days:
+            started = perf_counter()
+            proposals = strategy(calendar, other_invitees)
+            latencies.append((perf_counter() - started) * 1e3)
+            objective = DayScorer.for_day(DATE, me, calendar).score_rescheduled_events([proposals])[0]
+            gaps.append(objective.gap_minutes)
+            moves.append(objective.moved_events)
+        print(f"{name:>12} {mean(gaps):>12.1f} {mean(moves):>13.1f} {mean(latencies):>13.1f}")
+
+
+def measure_scoring(calendar: MockCalendar) -> None:
+    scorer = DayScorer.for_day(DATE, me, calendar)
+    rng = np.random.default_rng(0)
+    print(f"\n{'schedules per call':>18} {'schedules per second':>21}")
+    for batch_size in SCORING_BATCH_SIZES:
+        schedules = rng.integers(9 * 60, 17 * 60, size=(batch_size, scorer.size))
+        calls = max(1, 10_000 // batch_size)
+        started = perf_counter()
+        for _ in range(calls):
+            scorer.score(schedules)
+        print(f"{batch_size:>18} {calls * batch_size / (perf_counter() - started):>21,.0f}")
+
+
+def main() -> None:
+    rng = Random(0)
+    days = [generate_day(rng) for _ in range(DAYS)]
+    compare_strategies(days)
+    measure_scoring(days[0][0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from src.agents.helpers.models import get_llm
+from src.agents.helpers.prompts import cacheable_prompt
+from src.config.main import config
+from src.domains.user.mock_user_provider import user_provider
+from src.types.calendar_event import CalendarEventId, CalendarEventInvitee
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.schedule_objective import ScheduleObjective
+from src.types.user import User
+from src.types.user_provider import UserNotFoundError
+from src.utilities.timestamp_formatting import format_time_human_friendly
+from src.utilities.ttl_cache import TTLCache
+
+
+class EventExplanation(BaseModel):
+    event_id: CalendarEventId
+    explanation: str
+
+
+class Explanations(BaseModel):
+    events: list[EventExplanation] = Field(
+        description="One explanation for every moved event.",
+    )
+
+
+structured_llm = get_llm(
+    source="explanation.structured_output",
+    model=config.rescheduling_explanation_model,
+).with_structured_output(
+    Explanations,
+    method="json_schema",
+)
+
+# The same on every call for every user. See `cacheable_prompt` for when the provider caches it.
+STATIC_PREFIX = "".join(
+    (
+        "- A user's calendar is being compacted to remove the unscheduled time between events.\n",
+        "- Each request gives you the user's name, how much unscheduled time the moves cut, and the moves.\n",
+        "- For every move, write one or two friendly sentences to the user, by name, explaining why it helps.\n",
+    ),
+)
+
+
+ExplanationKey = tuple[CalendarEventId, datetime, datetime, tuple[int, int, int], tuple[int, int, int]]
+
+explanation_cache: TTLCache[ExplanationKey, str] = TTLCache(
+    config.rescheduling_explanation_cache_max_entries,
+    config.rescheduling_cache_ttl_seconds,
+)
+
+
+def explanation_key(
+    proposal: PendingRescheduledEvent,
+    before: ScheduleObjective,
+    after: ScheduleObjective,
+) -> ExplanationKey:
+    """Identify a move by the event, its new times and the objectives of the plan it is part of.
+
+    The explanation quotes the unscheduled time the whole plan cuts, so the same move in another plan (e.g. after a
+    replan) gets its own explanation rather than the totals of the old one.
+    """
+    return proposal.original_event.id, proposal.new_start_time, proposal.new_end_time, before.key(), after.key()
+
+
+def invitee_name(invitee: CalendarEventInvitee) -> str:
+    """Get the name of an invitee, or their ID if the user provider does not know them."""
+    try:
+        return user_provider.get_user(invitee.id).given_name
+    except UserNotFoundError:
+        return str(invitee.id)
+
+
+def serialize_move(proposal: PendingRescheduledEvent) -> str:
+    event = proposal.original_event
+    invitees = ", ".join(invitee_name(invitee) for invitee in event.invitees) or "None"
+    return (
+        f"- Event ID {event.id!s}: {event.title} (invitees: {invitees}) moves from "
+        f"{format_time_human_friendly(event.start_time)} - {format_time_human_friendly(event.end_time)}"
+        f"{event.end_time.strftime('%p')} to {format_time_human_friendly(proposal.new_start_time)} - "
+        f"{format_time_human_friendly(proposal.new_end_time)}{proposal.new_end_time.strftime('%p')}.\n"
+    )
+
+
+async def write_explanations(prompt_str: str) -> Explanations:
+    """Ask the explanation model for the explanations of the moves in the prompt."""
+    explanations = await structured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt_str))
+    if not isinstance(explanations, Explanations):
+        msg = f"Response is not an Explanations object: {explanations}"
+        raise TypeError(msg)
+    return explanations
+
+
+async def explain_rescheduling_proposals(
+    user: User,
+    proposals: Sequence[PendingRescheduledEvent],
+    before: ScheduleObjective,
+    after: ScheduleObjective,
+) -> list[PendingRescheduledEvent]:
+    """Write the explanations that are still missing, the first time someone asks for them.
+
+    Proposals carry the move only, so nothing pays for explanations nobody reads, e.g. in batch runs or for plans
+    the user rejects. The moves are final, so a cheap model is only asked for one short explanation per event, in
+    a single call. Explanations are cached per move and plan, so asking again (e.g. when a node is re-run after an
+    interrupt) is free.
+
+    Args:
+        user: The user whose calendar is being rescheduled.
+        proposals: The chosen moves.
+        before: The objective of the user's calendar as it is.
+        after: The objective of the user's calendar with every proposal applied.
+
+    Returns:
+        The proposals, in the same order, with every explanation filled in. Proposals that already had one keep
+        it, and the ones the model leaves out stay without one.
+
+    """
+    keys = [explanation_key(proposal, before, after) for proposal in proposals]
+    explanations = {
+        key: explanation
+        for proposal, key in zip(proposals, keys, strict=True)
+        if (explanation := proposal.explanation or explanation_cache.get(key)) is not None
+    }
+    missing = [(proposal, key) for proposal, key in zip(proposals, keys, strict=True) if key not in explanations]
+    if missing:
+        prompt_str = "".join(
+            (
+                f"- The user is {user.given_name}.\n",
+                f"- The moves below cut the unscheduled time from {before.gap_minutes} to {after.gap_minutes} minutes.\n",
+                "\n",
+                "MOVES:\n",
+                "".join(serialize_move(proposal) for proposal, _ in missing),
+            ),
+        )
+        written = {event.event_id: event.explanation for event in (await write_explanations(prompt_str)).events}
+        for proposal, key in missing:
+            if (explanation := written.get(proposal.original_event.id)) is not None:
+                explanations[key] = explanation
+                explanation_cache.set(key, explanation)
+    return [
+        proposal.model_copy(update={"explanation": explanations.get(key)}) for proposal, key in zip(proposals, keys, strict=True)
+    ]
@@ -1,53 +1,56 @@
 from datetime import datetime
 
 from src.agents.helpers.models import get_llm
+from src.agents.helpers.prompts import cacheable_prompt
 from src.agents.helpers.serialization import serialize_event, serialize_rescheduling_proposal
 from src.types.state import StateAfterSendingReschedulingProposals, StateWithCalendar
 from src.types.user import User
 
-unstructured_llm = get_llm(source="guide.public")
-
-
-def get_baseline_context(user: User, date: datetime) -> str:
+# The narration of the steps that do not look at the calendar is the same for every user and date, so every run
+# replays it.
+unstructured_llm = get_llm(source="guide.public", cache_responses=True)
+
+
+# The same on every call for every user. See `cacheable_prompt` for when the provider caches it.
+STATIC_PREFIX = "".join(
+    (
+        "CONTEXT:\n",
+        "- You are an assistant that can help with calendar events.\n",
+        "- You are a part of an application called 'calendar-condenser'.\n",
+        "- The application is designed to help users streamline their calendar events.\n",
+        "- Each request gives you an objective. Requests about the user's calendar also give you the current date "
+        "and the user you are speaking with.\n",
+        "\n",
+        "FORMATTING RULES:\n",
+        "- You MUST respond with a short sentence.\n",
+        "- You are speaking directly to the user. You MUST be engaging and friendly.\n",
+        "- You MUST use Markdown formatting to style your response.\n",
+        "- NEVER use code blocks in your response.\n",
+        "- You MUST respond in English.\n",
+        "- You MUST NOT use any emojis.\n",
+        "- Do NOT include semicolons in your response.\n",
+        "- Do NOT mention you are working for the calendar-condenser application.\n",
+        "- you MUST use bold text to highlight important information.\n",
+        "FORMATTING SUGGESTIONS:\n",
+        "- Use numbered lists to list series of steps, but do NOT list the 'Step 1' etc. in the list.\n",
+    ),
+)
+
+
+def get_user_context(user: User, date: datetime) -> str:
     return "".join(
         (
-            "CONTEXT:\n",
-            "- You are an assistant that can help with calendar events.\n",
-            f"- The current date is {date.strftime('%Y-%m-%d')}.\n"
-            f"- You are speaking with {user.given_name}. Their user ID is {user.id!s}.\n"
+            "USER CONTEXT:\n",
+            f"- The current date is {date.strftime('%Y-%m-%d')}.\n",
+            f"- You are speaking with {user.given_name}. Their user ID is {user.id!s}.\n",
             f"- The user's timezone is {user.timezone}.\n",
-            "- You are a part of an application called 'calendar-condenser'.\n",
-            "- The application is designed to help users streamline their calendar events.\n",
         ),
     )
 
 
-def get_formatting_rules() -> str:
-    return "".join(
-        (
-            "FORMATTING RULES:\n",
-            "- You MUST respond with a short sentence.\n",
-            "- You are speaking directly to the user. You MUST be engaging and friendly.\n",
-            "- You MUST use Markdown formatting to style your response.\n",
-            "- NEVER use code blocks in your response.\n",
-            "- You MUST respond in English.\n",
-            "- You MUST NOT use any emojis.\n",
-            "- Do NOT include semicolons in your response.\n",
-            "- Do NOT mention you are working for the calendar-condenser application.\n",
-            "- you MUST use bold text to highlight important information.\n",
-            "FORMATTING SUGGESTIONS:\n",
-            "- Use numbered lists to list series of steps, but do NOT list the 'Step 1' etc. in the list.\n",
-        ),
-    )
-
-
-async def introduction_to_user(user: User, date: datetime) -> None:
-    baseline_context = get_baseline_context(user, date)
-    formatting_rules = get_formatting_rules()
+async def introduction_to_user() -> None:
     prompt = "".join(
         (
-            baseline_context,
-            "\n",
             "CORE OBJECTIVE:\n",
             "- Introduce yourself to the user and explain what you can do for them.\n",
             "- Below you will find a list of steps you will take to streamline the user's calendar.\n",
@@ -61,22 +64,16 @@ async def introduction_to_user(user: User, date: datetime) -> None:
             "- Step 5: You will wait for the invitees to accept or reject the rescheduling proposals.\n",
             "- Step 6: You will update the user's calendar with the accepted rescheduling proposals.\n",
             "- Step 7: You will summarize the rescheduling proposals and send the summary to the user.\n",
-            "\n",
-            formatting_rules,
         ),
     )
 
-    await unstructured_llm.ainvoke(prompt)
+    await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
 
 
 async def summarize_state_with_calendar(state: StateWithCalendar) -> None:
-    baseline_context = get_baseline_context(state.user, state.date)
-    formatting_rules = get_formatting_rules()
     calendar_events = state.calendar.get_events_on(state.date)
     prompt = "".join(
         (
-            baseline_context,
-            "\n",
             "CORE OBJECTIVE:\n",
             "- Summarize the user's calendar for the given date.\n",
             "- Include the following information:\n",
@@ -88,89 +85,90 @@ async def summarize_state_with_calendar(state: StateWithCalendar) -> None:
             "\n",
             "RULES:\n",
             "- Do not count the current user towards the total number of invitees.\n",
-            formatting_rules,
+            "\n",
+            get_user_context(state.user, state.date),
             "\n",
             "CALENDAR EVENTS:\n",
             "".join(serialize_event(event) for event in calendar_events),
         ),
     )
 
-    await unstructured_llm.ainvoke(prompt)
+    await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
 
 
-async def anticipate_rescheduling_proposals(state: StateWithCalendar) -> None:
-    baseline_context = get_baseline_context(state.user, state.date)
-    formatting_rules = get_formatting_rules()
+async def anticipate_rescheduling_proposals() -> None:
     prompt = "".join(
         (
-            baseline_context,
-            "\n",
             "CORE OBJECTIVE:\n",
             "- Explain to the user you will be generating rescheduling proposals for their calendar events.\n",
             "- Explain that you will try and find the best time to reschedule their events.\n",
             "- Indicate you are thinking very hard by using language like 'Hmmm...' or 'Let me think about this...'.\n",
             "- Indicate this may take a bit of time, but clarify it should usually only be a few seconds.\n",
-            "\n",
-            formatting_rules,
         ),
     )
 
-    await unstructured_llm.ainvoke(prompt)
+    await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
 
 
 async def summarize_state_after_sending_rescheduling_proposals(state: StateAfterSendingReschedulingProposals) -> None:
-    baseline_context = get_baseline_context(state.user, state.date)
-    formatting_rules = get_formatting_rules()
     accepted_rescheduling_proposals = state.accepted_rescheduling_proposals
     rejected_rescheduling_proposals = state.rejected_rescheduling_proposals
 
     if len(rejected_rescheduling_proposals) == 0 and len(accepted_rescheduling_proposals) > 0:
         prompt = "".join(
             (
-                baseline_context,
-                "\n",
                 "CORE OBJECTIVE:\n",
                 "- Explain to the user that all rescheduling proposals were accepted.\n",
                 "- Explain that you will now update the user's calendar to reflect the new event times.\n",
+                "\n",
+                get_user_context(state.user, state.date),
+                "\n",
                 "ACCEPTED RESCHEDULING PROPOSALS:\n",
                 "".join(serialize_rescheduling_proposal(proposal) for proposal in accepted_rescheduling_proposals),
-                "\n",
-                formatting_rules,
             ),
         )
     else:
         prompt = "".join(
             (
-                baseline_context,
-                "\n",
                 "CORE OBJECTIVE:\n",
                 "- Explain to the user that some rescheduling proposals were rejected.\n",
                 "- Explain that you will not update the user's calendar to reflect the new event times.\n",
+                "\n",
+                get_user_context(state.user, state.date),
+                "\n",
                 "REJECTED RESCHEDULING PROPOSALS:\n",
                 "".join(serialize_rescheduling_proposal(proposal) for proposal in rejected_rescheduling_proposals),
-                "\n",
-                formatting_rules,
             ),
         )
 
-    await unstructured_llm.ainvoke(prompt)
+    await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
 
 
-async def conclusion(state: StateAfterSendingReschedulingProposals) -> None:
-    baseline_context = get_baseline_context(state.user, state.date)
-    formatting_rules = get_formatting_rules()
+async def conclusion() -> None:
     prompt = "".join(
         (
-            baseline_context,
-            "\n",
             "CORE OBJECTIVE:\n",
             "- Explain to the user that you've successfuly updated the user's calendar with the new event times.\n",
             "- Explain you've tried to optimize the user's calendar for the best use of their time.\n",
             "- Thank the user for their time.\n",
             "RULES:\n",
             "- You MUST have a celebratory tone in your response.\n",
-            formatting_rules,
         ),
     )
 
-    await unstructured_llm.ainvoke(prompt)
+    await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
+
+
+async def conclusion_with_nothing_to_do() -> None:
+    prompt = "".join(
+        (
+            "CORE OBJECTIVE:\n",
+            "- Explain to the user that their calendar is already compact, so there is nothing worth rescheduling.\n",
+            "- Explain that you have not changed any events or contacted any invitees.\n",
+            "- Thank the user for their time.\n",
+            "RULES:\n",
+            "- You MUST have a friendly and reassuring tone in your response.\n",
+        ),
+    )
+
+    await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
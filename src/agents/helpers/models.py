@@ -1,8 +1,119 @@
+import asyncio
+import contextlib
+import threading
+from typing import Any, Self
+
+import httpx
 from langchain_openai import ChatOpenAI
 
+from src.agents.helpers.response_cache import CachedChatOpenAI, llm_response_cache
 from src.callbacks.add_source_to_messages import AddSourceToMessagesCallback
+from src.callbacks.record_prompt_token_usage import RecordPromptTokenUsageCallback
 from src.config.main import config
 
 
-def get_llm(source: str, model: str = config.default_model) -> ChatOpenAI:
-    return ChatOpenAI(model=model, api_key=config.openai_api_key, callbacks=[AddSourceToMessagesCallback(source=source)])
+class LLMClientRegistry:
+    """The HTTP clients of every model in the process, one keep-alive connection pool per model endpoint.
+
+    Models are cheap to create, but each would otherwise open its own connections, so every call after a quiet
+    spell pays for a new TCP and TLS handshake. Sharing the pools keeps connections warm across models and
+    threads.
+    """
+
+    def __init__(
+        self: Self,
+        max_keepalive_connections: int,
+        keepalive_seconds: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize the registry without any clients.
+
+        Args:
+            max_keepalive_connections: The most idle connections to keep open per endpoint.
+            keepalive_seconds: How long an idle connection is kept open.
+            transport: The transport of the async clients, replaceable in tests.
+
+        """
+        self.limits = httpx.Limits(max_keepalive_connections=max_keepalive_connections, keepalive_expiry=keepalive_seconds)
+        self._transport = transport
+        self._clients: dict[str, httpx.Client] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+        # Models are also created from worker threads, which must not race to create a second pool.
+        self._lock = threading.Lock()
+
+    def client(self: Self, base_url: str) -> httpx.Client:
+        """Get the shared client of an endpoint, for synchronous calls."""
+        with self._lock:
+            if base_url not in self._clients:
+                self._clients[base_url] = httpx.Client(base_url=base_url, limits=self.limits)
+            return self._clients[base_url]
+
+    def async_client(self: Self, base_url: str) -> httpx.AsyncClient:
+        """Get the shared client of an endpoint, for asynchronous calls."""
+        with self._lock:
+            if base_url not in self._async_clients:
+                self._async_clients[base_url] = httpx.AsyncClient(
+                    base_url=base_url,
+                    limits=self.limits,
+                    transport=self._transport,
+                )
+            return self._async_clients[base_url]
+
+    async def prewarm(self: Self, connections: int) -> None:
+        """Open connections to every endpoint in use, TLS handshake included, before the first model call.
+
+        The requests run concurrently, so each opens its own connection, which then stays in the pool. Failures
+        are ignored, since the first model call can always open its own connection.
+        """
+
+        async def open_connection(client: httpx.AsyncClient) -> None:
+            with contextlib.suppress(httpx.HTTPError):
+                await client.head("/")
+
+        await asyncio.gather(
+            *(open_connection(client) for client in list(self._async_clients.values()) for _ in range(connections)),
+        )
+
+    async def aclose(self: Self) -> None:
+        """Close every client and its connections."""
+        with self._lock:
+            clients, async_clients = list(self._clients.values()), list(self._async_clients.values())
+            self._clients.clear()
+            self._async_clients.clear()
+        for client in clients:
+            client.close()
+        await asyncio.gather(*(client.aclose() for client in async_clients))
+
+
+llm_clients = LLMClientRegistry(config.llm_max_keepalive_connections, config.llm_keepalive_seconds)
+
+
+def get_llm(source: str, model: str = config.default_model, *, cache_responses: bool = False) -> ChatOpenAI:
+    """Get a model whose messages are tagged with their source.
+
+    Args:
+        source: The source to tag the messages of the model with.
+        model: The name of the model.
+        cache_responses: Whether to answer prompts seen before from `llm_response_cache`. Only worth it for
+            prompts that repeat, and whose answer may repeat too.
+
+    Returns:
+        The model.
+
+    """
+    if cache_responses:
+        return CachedChatOpenAI(response_cache=llm_response_cache, **llm_arguments(source, model))
+    return ChatOpenAI(**llm_arguments(source, model))
+
+
+def llm_arguments(source: str, model: str) -> dict[str, Any]:
+    return {
+        "model": model,
+        "api_key": config.openai_api_key,
+        "base_url": config.openai_base_url,
+        "http_client": llm_clients.client(config.openai_base_url),
+        "http_async_client": llm_clients.async_client(config.openai_base_url),
+        # Streamed responses only report their token usage when asked to.
+        "stream_usage": True,
+        "callbacks": [AddSourceToMessagesCallback(source=source), RecordPromptTokenUsageCallback(source=source)],
+    }
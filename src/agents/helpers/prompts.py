@@ -0,0 +1,16 @@
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+
+def cacheable_prompt(static_prefix: str, dynamic_suffix: str) -> list[BaseMessage]:
+    """Lay out a prompt so the provider can cache its static part across users and calls, once it is long enough.
+
+    Providers cache the longest prompt prefix they have seen recently, so the static part goes first, in a
+    system message of its own. It has to be byte-identical on every call, so it must not mention dates, names
+    or IDs. Everything that changes goes in the user message after it, with the instructions that are the same
+    for every call of a task before the values that are not.
+
+    OpenAI only caches prompts of 1024 tokens or more. The static prefixes are a few hundred tokens each, so they
+    are not cached on their own, only as part of calls whose whole prompt reaches that length (such as
+    rescheduling a busy day). The cached tokens each source gets are recorded in `prompt_token_usage`.
+    """
+    return [SystemMessage(content=static_prefix), HumanMessage(content=dynamic_suffix)]
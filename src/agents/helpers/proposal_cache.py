@@ -0,0 +1,222 @@
+import contextlib
+import hashlib
+import json
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Self
+
+from pydantic import BaseModel, ValidationError
+
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.user import User
+from src.utilities.ttl_cache import TTLCache
+
+
+def event_inputs(event: CalendarEvent) -> dict[str, Any]:
+    """Get everything about an event that the rescheduling prompt shows."""
+    return {
+        "id": event.id,
+        "title": event.title,
+        "description": event.description,
+        "owner": str(event.owner),
+        "invitees": [str(invitee.id) for invitee in event.invitees],
+        # Keeping the offset means a change of timezone changes the key, since the prompt shows local times.
+        "start_time": event.start_time.isoformat(),
+        "end_time": event.end_time.isoformat(),
+    }
+
+
+def user_inputs(user: User) -> dict[str, Any]:
+    """Get everything about a user that the rescheduling prompt and the validation of its proposals depend on."""
+    return {
+        "id": str(user.id),
+        "given_name": user.given_name,
+        "timezone": user.timezone,
+        "working_hours": list(user.preffered_working_hours),
+    }
+
+
+def fingerprint_rescheduling_inputs(
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    models: Sequence[str],
+) -> tuple[str, list[CalendarEventId]]:
+    """Hash the inputs of `generate_rescheduling_proposals` into a key that is stable across runs and processes.
+
+    Covers the user's events, the invitees' conflicting events, everyone's working hours, the date and the models.
+    Two calls with the same fingerprint send the same prompt, so they can share proposals.
+
+    Returns:
+        The fingerprint, and the ids of every event it covers.
+
+    """
+    users_events = users_calendar.get_events_on(date)
+    invitees_events = [
+        [event for event in calendar.get_events_on(date) if event.owner != user.id] for _, calendar in other_invitees
+    ]
+    inputs = {
+        "date": date.strftime("%Y-%m-%d"),
+        "models": list(models),
+        "user": user_inputs(user),
+        "events": [event_inputs(event) for event in users_events],
+        "invitees": [
+            {**user_inputs(invitee), "events": [event_inputs(event) for event in events]}
+            for (invitee, _), events in zip(other_invitees, invitees_events, strict=True)
+        ],
+    }
+    fingerprint = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+    event_ids = [event.id for event in users_events] + [event.id for events in invitees_events for event in events]
+    return fingerprint, event_ids
+
+
+class CachedProposals(BaseModel):
+    """Proposals as stored by the cache, with the events they were generated from."""
+
+    event_ids: list[CalendarEventId]
+    proposals: list[PendingRescheduledEvent]
+    saved_at: float
+
+
+class ProposalCache:
+    """Rescheduling proposals keyed by the fingerprint of their inputs, in memory and optionally on disk.
+
+    The memory tier is a bounded LRU cache with a TTL. The disk tier keeps one JSON file per fingerprint, so
+    proposals survive restarts and are shared between processes. It is only bounded by the same TTL.
+
+    Entries are dropped as soon as any event they were generated from changes time. A new time gives a new
+    fingerprint anyway, but the cached proposals hold the event objects themselves, which would no longer match.
+    Both tiers index their entries by event, in memory and with an empty marker file per event and fingerprint
+    on disk, so dropping the entries of an event only looks up those entries.
+    """
+
+    def __init__(
+        self: Self,
+        max_entries: int,
+        ttl_seconds: float,
+        directory: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: The most entries to keep in memory. 0 disables the memory tier.
+            ttl_seconds: How long entries stay valid, in both tiers.
+            directory: Where the disk tier keeps its files. Disabled when None.
+            clock: Returns the current wall-clock time in seconds. Wall-clock rather than monotonic, so entries
+                written by another process expire on time.
+
+        """
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self._clock = clock
+        self._memory: TTLCache[str, CachedProposals] = TTLCache(max_entries, ttl_seconds, clock)
+        # May still name entries the memory tier has evicted since, until it is rebuilt.
+        self._fingerprints_by_event: dict[CalendarEventId, set[str]] = {}
+        self._indexed_since_rebuild = 0
+
+    def get(self: Self, fingerprint: str) -> list[PendingRescheduledEvent] | None:
+        """Get the proposals for a fingerprint, or None if neither tier has them."""
+        cached = self._memory.get(fingerprint)
+        # Entries read from disk get a fresh TTL in memory, so check the time they were generated as well.
+        if cached is not None and self._clock() >= cached.saved_at + self.ttl_seconds:
+            self._memory.pop(fingerprint)
+            cached = None
+        if cached is None and (cached := self._read(fingerprint)) is not None:
+            self._memory.set(fingerprint, cached)
+            self._index(fingerprint, cached.event_ids)
+        return None if cached is None else list(cached.proposals)
+
+    def set(
+        self: Self,
+        fingerprint: str,
+        event_ids: Sequence[CalendarEventId],
+        proposals: Sequence[PendingRescheduledEvent],
+    ) -> None:
+        """Save the proposals generated from inputs with the given fingerprint, in both tiers."""
+        cached = CachedProposals(event_ids=list(event_ids), proposals=list(proposals), saved_at=self._clock())
+        self._memory.set(fingerprint, cached)
+        self._index(fingerprint, event_ids)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so other processes never read a partial entry.
+            temporary = self._path(fingerprint).with_suffix(".tmp")
+            temporary.write_text(cached.model_dump_json())
+            temporary.replace(self._path(fingerprint))
+            for event_id in event_ids:
+                marker = self._marker_path(event_id, fingerprint)
+                marker.parent.mkdir(parents=True, exist_ok=True)
+                marker.touch()
+
+    def invalidate_event(self: Self, event_id: CalendarEventId) -> None:
+        """Drop every entry generated from the event, in both tiers."""
+        for fingerprint in self._fingerprints_by_event.pop(event_id, set()):
+            self._memory.pop(fingerprint)
+        if self.directory is not None and (markers := self.directory / "events" / str(event_id)).is_dir():
+            for marker in markers.iterdir():
+                self._unlink(marker.name, self._load(self._path(marker.name)))
+                marker.unlink(missing_ok=True)
+            self._remove_if_empty(markers)
+
+    def _index(self: Self, fingerprint: str, event_ids: Sequence[CalendarEventId]) -> None:
+        if self._memory.max_entries == 0:
+            return
+        for event_id in event_ids:
+            self._fingerprints_by_event.setdefault(event_id, set()).add(fingerprint)
+        # Rebuilding drops the fingerprints of evicted entries. Doing it once per max_entries entries keeps the
+        # index bounded, at a constant cost per entry.
+        self._indexed_since_rebuild += 1
+        if self._indexed_since_rebuild < self._memory.max_entries:
+            return
+        self._fingerprints_by_event = {}
+        self._indexed_since_rebuild = 0
+        for indexed, cached in self._memory.items():
+            for event_id in cached.event_ids:
+                self._fingerprints_by_event.setdefault(event_id, set()).add(indexed)
+
+    def _path(self: Self, fingerprint: str) -> Path:
+        if self.directory is None:
+            msg = "The disk tier is disabled"
+            raise ValueError(msg)
+        return self.directory / f"{fingerprint}.json"
+
+    def _marker_path(self: Self, event_id: CalendarEventId, fingerprint: str) -> Path:
+        if self.directory is None:
+            msg = "The disk tier is disabled"
+            raise ValueError(msg)
+        return self.directory / "events" / str(event_id) / fingerprint
+
+    def _unlink(self: Self, fingerprint: str, cached: CachedProposals | None) -> None:
+        """Remove the file of an entry from disk, with the markers of its events if it could be read."""
+        self._path(fingerprint).unlink(missing_ok=True)
+        for event_id in [] if cached is None else cached.event_ids:
+            marker = self._marker_path(event_id, fingerprint)
+            marker.unlink(missing_ok=True)
+            self._remove_if_empty(marker.parent)
+
+    @staticmethod
+    def _remove_if_empty(directory: Path) -> None:
+        # Fails while the directory still has files, which is fine.
+        with contextlib.suppress(OSError):
+            directory.rmdir()
+
+    def _read(self: Self, fingerprint: str) -> CachedProposals | None:
+        if self.directory is None:
+            return None
+        cached = self._load(self._path(fingerprint))
+        if cached is not None and self._clock() >= cached.saved_at + self.ttl_seconds:
+            self._unlink(fingerprint, cached)
+            return None
+        return cached
+
+    @staticmethod
+    def _load(path: Path) -> CachedProposals | None:
+        try:
+            return CachedProposals.model_validate_json(path.read_bytes())
+        except (FileNotFoundError, ValidationError):
+            return None
@@ -0,0 +1,137 @@
+import re
+
+from pydantic import BaseModel, Field
+
+# Phrases that accept or reject a proposal on their own, matched longest first, so "no problem" and "no can do"
+# are not read as "no" and "can do".
+LEXICON: dict[tuple[str, ...], bool] = {
+    **dict.fromkeys(
+        [
+            ("yes",),
+            ("yep",),
+            ("yeah",),
+            ("yup",),
+            ("sure",),
+            ("ok",),
+            ("okay",),
+            ("fine",),
+            ("absolutely",),
+            ("definitely",),
+            ("perfect",),
+            ("great",),
+            ("works",),
+            ("agreed",),
+            ("accepted",),
+            ("can", "do"),
+            ("sounds", "good"),
+            ("sounds", "great"),
+            ("works", "for", "me"),
+            ("great", "idea"),
+            ("count", "me", "in"),
+            ("i'm", "in"),
+            ("i'm", "on", "it"),
+            ("i'll", "do", "it"),
+            ("let's", "do", "it"),
+            ("perfect", "timing"),
+            ("no", "problem"),
+            ("👍",),
+            ("👌",),
+            ("✅",),
+            ("✔",),
+            ("🙌",),
+        ],
+        True,
+    ),
+    **dict.fromkeys(
+        [
+            ("no",),
+            ("nope",),
+            ("nah",),
+            ("not",),
+            ("sorry",),
+            ("can't",),
+            ("cannot",),
+            ("won't",),
+            ("busy",),
+            ("booked",),
+            ("swamped",),
+            ("unavailable",),
+            ("declined",),
+            ("can", "not"),
+            ("no", "can", "do"),
+            ("can't", "make", "it"),
+            ("not", "available"),
+            ("not", "possible"),
+            ("not", "happening"),
+            ("not", "this", "time"),
+            ("i'm", "out"),
+            ("tied", "up"),
+            ("👎",),
+            ("❌",),
+            ("🚫",),
+            ("🙅",),
+        ],
+        False,
+    ),
+}
+LONGEST_PHRASE = max(len(phrase) for phrase in LEXICON)
+# Words that neither accept nor reject, so they do not make a reply any less clear.
+FILLER = frozenset(
+    ("i", "i'm", "it", "that", "this", "me", "for", "then", "do", "can", "the", "a", "so", "just", "really", "very", "oh"),
+)
+# Words, and single symbols such as emoji. Emoji variation selectors and skin tones are dropped beforehand.
+TOKEN = re.compile(r"[a-z']+|[^\w\s]")
+EMOJI_MODIFIERS = re.compile("[\ufe0f\U0001f3fb-\U0001f3ff]")
+# Punctuation that does not change what a reply means, other than ending a clause. Anything else, such as a question
+# mark, is unexplained.
+IGNORED = frozenset(".,!")
+# Words that turn a rejection later in the same clause around, as in "I'm not busy".
+NEGATIONS = frozenset((("no",), ("not",)))
+
+
+class ReplyClassification(BaseModel):
+    """Whether a reply accepts a proposal, and how sure the classifier is of it."""
+
+    accepted: bool
+    confidence: float = Field(
+        description="The share of the reply explained by phrases of a single meaning and filler, from 0 to 1.",
+    )
+
+
+def classify_reply(reply: str) -> ReplyClassification:
+    """Classify a reply to a rescheduling proposal from a lexicon of phrases and emoji, without calling a model.
+
+    Replies mixing acceptances and rejections, negating a rejection (as in "I'm not busy"), or without either,
+    get a confidence of 0. Otherwise the confidence is the share of the reply's words and symbols that are either
+    phrases of its meaning or filler, so "Yes!" is certain while "Yes, if we keep it short?" is not.
+    """
+    tokens = TOKEN.findall(EMOJI_MODIFIERS.sub("", reply.lower().replace("\u2019", "'")))
+    meanings: set[bool] = set()
+    explained = 0
+    negated = False
+    i = 0
+    while i < len(tokens):
+        if tokens[i] in IGNORED:
+            negated = False
+            i += 1
+            continue
+        for length in range(min(LONGEST_PHRASE, len(tokens) - i), 0, -1):
+            phrase = tuple(tokens[i : i + length])
+            if phrase in LEXICON:
+                # A negated rejection may well be an acceptance, so it reads as mixed and is left to the model.
+                meanings |= {True, False} if negated and not LEXICON[phrase] else {LEXICON[phrase]}
+                negated = phrase in NEGATIONS
+                explained += length
+                i += length
+                break
+        else:
+            negated = negated and tokens[i] in FILLER
+            explained += tokens[i] in FILLER
+            i += 1
+
+    if len(meanings) != 1:
+        return ReplyClassification(accepted=False, confidence=0)
+    return ReplyClassification(
+        accepted=meanings.pop(),
+        confidence=explained / sum(token not in IGNORED for token in tokens),
+    )
@@ -0,0 +1,190 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from pathlib import Path
+from typing import Any, Self, override
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.config.main import config
+from src.utilities.ttl_cache import TTLCache
+
+# Words with their trailing whitespace, so a replayed response reads like one streamed by the model.
+REPLAY_TOKEN = re.compile(r"\s*\S+\s*")
+
+
+def response_key(model: str, messages: Sequence[BaseMessage]) -> str:
+    """Hash a model and a prompt into a key that is stable across runs and processes.
+
+    Runs of whitespace are collapsed, so prompts that only differ in layout share a response.
+    """
+    inputs = {
+        "model": model,
+        "messages": [[message.type, " ".join(message.text().split())] for message in messages],
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+class CachedResponse(BaseModel):
+    """A response as stored by the cache."""
+
+    content: str
+    saved_at: float
+
+
+class ResponseCache:
+    """The text of model responses keyed by their prompt, in memory and optionally in a SQLite database.
+
+    The memory tier is a bounded LRU cache with a TTL. The disk tier keeps one row per prompt, so responses
+    survive restarts and are shared between processes. It is only bounded by the same TTL.
+    """
+
+    def __init__(
+        self: Self,
+        max_entries: int,
+        ttl_seconds: float,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: The most responses to keep in memory. 0 disables the memory tier.
+            ttl_seconds: How long responses stay valid, in both tiers.
+            path: The SQLite database of the disk tier. Disabled when None.
+            clock: Returns the current wall-clock time in seconds. Wall-clock rather than monotonic, so responses
+                written by another process expire on time.
+
+        """
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._clock = clock
+        self._memory: TTLCache[str, CachedResponse] = TTLCache(max_entries, ttl_seconds, clock)
+
+    def get(self: Self, key: str) -> str | None:
+        """Get the response for a key, or None if neither tier has it."""
+        cached = self._memory.get(key)
+        # Responses read from disk get a fresh TTL in memory, so check the time they were generated as well.
+        if cached is not None and self._clock() >= cached.saved_at + self.ttl_seconds:
+            self._memory.pop(key)
+            cached = None
+        if cached is None and (cached := self._read(key)) is not None:
+            self._memory.set(key, cached)
+        return None if cached is None else cached.content
+
+    def set(self: Self, key: str, content: str) -> None:
+        """Save the response for a key, in both tiers."""
+        cached = CachedResponse(content=content, saved_at=self._clock())
+        self._memory.set(key, cached)
+        if self.path is not None:
+            with contextlib.closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, content, saved_at) VALUES (?, ?, ?)",
+                    (key, cached.content, cached.saved_at),
+                )
+
+    def _connect(self: Self) -> sqlite3.Connection:
+        if self.path is None:
+            msg = "The disk tier is disabled"
+            raise ValueError(msg)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL, saved_at REAL NOT NULL)",
+        )
+        return connection
+
+    def _read(self: Self, key: str) -> CachedResponse | None:
+        if self.path is None:
+            return None
+        with contextlib.closing(self._connect()) as connection, connection:
+            row: tuple[str, float] | None = connection.execute(
+                "SELECT content, saved_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            cached = CachedResponse(content=row[0], saved_at=row[1])
+            if self._clock() >= cached.saved_at + self.ttl_seconds:
+                connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+        return cached
+
+
+class CachedChatOpenAI(ChatOpenAI):
+    """A model that answers prompts it has seen before from a `ResponseCache`, without calling the API.
+
+    Cached responses are streamed back a word at a time, through the same callbacks as a real call, so they are
+    tagged with their source and show up in the UI like any other response. Calls with extra arguments, such as
+    tools or a response format, are never cached.
+    """
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+    response_cache: ResponseCache = Field(exclude=True, description="Where responses are kept.")
+
+    @override
+    async def _astream(
+        self: Self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if stop or kwargs:
+            async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+                yield chunk
+            return
+
+        key = response_key(self.model_name, messages)
+        content = self.response_cache.get(key)
+        if content is not None:
+            for token in REPLAY_TOKEN.findall(content):
+                yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+                # Let each token reach the UI before the next one.
+                await asyncio.sleep(0)
+            return
+
+        tokens: list[str] = []
+        async for chunk in super()._astream(messages, stop, run_manager, **kwargs):
+            tokens.append(chunk.text)
+            yield chunk
+        if tokens:
+            self.response_cache.set(key, "".join(tokens))
+
+    @override
+    async def _agenerate(
+        self: Self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if stop or kwargs:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+        key = response_key(self.model_name, messages)
+        content = self.response_cache.get(key)
+        if content is not None:
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        if content := result.generations[0].text:
+            self.response_cache.set(key, content)
+        return result
+
+
+llm_response_cache = ResponseCache(
+    config.llm_response_cache_max_entries,
+    config.llm_response_cache_ttl_seconds,
+    config.llm_response_cache_path,
+)
@@ -1,6 +1,6 @@
 from src.domains.user.mock_user_provider import user_provider
 from src.types.calendar_event import CalendarEvent
-from src.types.rescheduled_event import AcceptedRescheduledEvent, RejectedRescheduledEvent
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent, RejectedRescheduledEvent
 
 
 def serialize_event(event: CalendarEvent, *, include_id: bool = True) -> str:
@@ -28,3 +28,11 @@ Original end time: {rescheduling_proposal.original_event.end_time.strftime("%Y-%
 New start time: {rescheduling_proposal.new_start_time.strftime("%Y-%m-%d %H:%M")}
 New end time: {rescheduling_proposal.new_end_time.strftime("%Y-%m-%d %H:%M")}
 """
+
+
+def serialize_pending_rescheduled_event(rescheduled_event: PendingRescheduledEvent) -> str:
+    return f"""
+Event ID: {rescheduled_event.original_event.id!s}
+New start time: {rescheduled_event.new_start_time.strftime("%Y-%m-%d %H:%M")}
+New end time: {rescheduled_event.new_end_time.strftime("%Y-%m-%d %H:%M")}
+"""
@@ -0,0 +1,56 @@
+import json
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+
+from langchain_core.utils.json import parse_partial_json
+
+
+def list_items(text: str, key: str, *, partial: bool) -> list[object]:
+    """Get the items of the list under `key` of a JSON object, which may be cut off anywhere when `partial`."""
+    if not text.strip():
+        return []
+    try:
+        parsed = parse_partial_json(text) if partial else json.loads(text)
+    except json.JSONDecodeError:
+        if partial:
+            return []
+        raise
+    items = parsed.get(key, []) if isinstance(parsed, dict) else []
+    return items if isinstance(items, list) else []
+
+
+async def stream_list_items(texts: AsyncIterable[str], key: str) -> AsyncIterator[object]:
+    """Yield the items of the list under `key` of a streamed JSON object, each as soon as it is complete.
+
+    An item is complete once the next one has started, or once the stream ends, so stopping early never acts
+    on an item that is cut off. The text received so far is re-parsed on every chunk, which is fine for
+    responses of a few kilobytes.
+
+    Args:
+        texts: The chunks of the JSON object's text.
+        key: The key of the list in the top-level object.
+
+    Raises:
+        JSONDecodeError: If the complete text is not valid JSON.
+
+    """
+    text = ""
+    yielded = 0
+    async for chunk in texts:
+        text += chunk
+        items = list_items(text, key, partial=True)
+        while yielded < len(items) - 1:
+            yield items[yielded]
+            yielded += 1
+    for item in list_items(text, key, partial=False)[yielded:]:
+        yield item
+
+
+@asynccontextmanager
+async def closing[T](stream: AsyncIterator[T]) -> AsyncGenerator[AsyncIterator[T]]:
+    """Close a stream when leaving the block, even if it was not read to the end, which cancels the request behind it."""
+    try:
+        yield stream
+    finally:
+        if isinstance(stream, AsyncGenerator):
+            await stream.aclose()
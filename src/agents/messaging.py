@@ -4,6 +4,9 @@ from typing import cast
 from pydantic import BaseModel, Field
 
 from src.agents.helpers.models import get_llm
+from src.agents.helpers.prompts import cacheable_prompt
+from src.agents.helpers.reply_classifier import classify_reply
+from src.config.main import config
 from src.domains.messaging.mock_messaging_platform import MockMessagingPlatform
 from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent, RejectedRescheduledEvent
 
@@ -21,12 +24,50 @@ class ReschedulingProposalResolutionOutput(BaseModel):
     reason: str = Field(description="The reason for the resolution.")
 
 
+# Answers directly in the 'single_call' reasoning mode, and formats the answer of `unstructured_llm` in the
+# 'two_call' one.
 structured_llm = get_llm(source="messaging.structured_output").with_structured_output(
     ReschedulingProposalResolutionOutput,
 )
 
 unstructured_llm = get_llm(source="messaging.private")
 
+# The same on every call for every invitee. See `cacheable_prompt` for when the provider caches it.
+STATIC_PREFIX = "".join(
+    (
+        "CONTEXT:\n",
+        "- A user has been given a proposal reschedule an event on their calendar.\n",
+        "- Each request gives you the message the user was told, and the message they responded with.\n",
+        "\n",
+        "CORE OBJECTIVE:\n",
+        "- Determine whether the user accepted or rejected the rescheduling proposal.\n",
+        "\n",
+        "RULES:\n",
+        "- You MUST respond with a valid enum value.\n",
+        "- If you cannot determine whether the user accepted the rescheduling proposal, consider it rejected.\n",
+        "- You MUST provide a short sentence for the reason why you made your decision.\n",
+    ),
+)
+
+
+async def resolve_rescheduling_proposal(
+    rescheduling_proposal: PendingRescheduledEvent,
+    message: str,
+    response: str,
+) -> AcceptedRescheduledEvent | RejectedRescheduledEvent:
+    """Resolve a proposal from the invitee's response, without calling a model when the response is clear.
+
+    Most responses are short acceptances or rejections such as "Yes!" or "👎", which the local classifier resolves
+    in microseconds. Only the responses it is less sure about than `messaging_reply_classifier_min_confidence` go
+    to `determine_rescheduling_proposal_resolution`.
+    """
+    classification = classify_reply(response)
+    if classification.confidence < config.messaging_reply_classifier_min_confidence:
+        return await determine_rescheduling_proposal_resolution(rescheduling_proposal, message, response)
+    if classification.accepted:
+        return AcceptedRescheduledEvent(**rescheduling_proposal.model_dump())
+    return RejectedRescheduledEvent(**rescheduling_proposal.model_dump())
+
 
 async def determine_rescheduling_proposal_resolution(
     rescheduling_proposal: PendingRescheduledEvent,
@@ -35,25 +76,18 @@ async def determine_rescheduling_proposal_resolution(
 ) -> AcceptedRescheduledEvent | RejectedRescheduledEvent:
     prompt = "".join(
         (
-            "CONTEXT:\n",
-            "- A user has been given a proposal reschedule an event on their calendar.\n",
+            "INVITEE'S MESSAGES:\n",
             "- The user was told the following message:\n",
             f"{message}\n",
             "- The user responded with the following message:\n",
             f"{response}\n",
-            "\n",
-            "CORE OBJECTIVE:\n",
-            "- Determine whether the user accepted or rejected the rescheduling proposal.\n",
-            "\n",
-            "RULES:\n",
-            "- You MUST respond with a valid enum value.\n",
-            "- If you cannot determine whether the user accepted the rescheduling proposal, consider it rejected.\n",
-            "- You MUST provide a short sentence for the reason why you made your decision.\n",
         ),
     )
-    reasoning_response = await unstructured_llm.ainvoke(prompt)
-    reasoning = cast("str", reasoning_response.content)
-    output = await structured_llm.ainvoke(reasoning)
+    if config.llm_reasoning_mode == "two_call":
+        reasoning_response = await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
+        output = await structured_llm.ainvoke(cast("str", reasoning_response.content))
+    else:
+        output = await structured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt))
 
     if isinstance(output, ReschedulingProposalResolutionOutput):
         if output.resolution == ReschedulingProposalResolution.ACCEPTED:
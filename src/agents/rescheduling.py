@@ -1,23 +1,30 @@
-from collections.abc import Sequence
-from datetime import datetime
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Collection, Mapping, Sequence
+from datetime import datetime, timedelta
 from typing import cast
+from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel, Field
 
 from src.agents.helpers.models import get_llm
-from src.agents.helpers.serialization import serialize_event
+from src.agents.helpers.prompts import cacheable_prompt
+from src.agents.helpers.proposal_cache import ProposalCache, fingerprint_rescheduling_inputs
+from src.agents.helpers.serialization import serialize_event, serialize_pending_rescheduled_event
+from src.agents.helpers.streaming import closing, stream_list_items
 from src.config.main import config
-from src.types.calendar import Calendar
-from src.types.calendar_event import CalendarEventId
+from src.planning.validation import drop_invalid_proposals, validate_rescheduling_proposals
+from src.types.calendar import Calendar, EventTimeChange, EventTimeChangeResult
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+from src.types.proposal_violation import ProposalViolation
 from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent
-from src.types.user import User
+from src.types.user import User, UserId
 
 
 class EventReschedulingProposal(BaseModel):
     event_id: CalendarEventId
     new_start_time: datetime
     new_end_time: datetime
-    explanation: str
 
 
 class ReschedulingProposal(BaseModel):
@@ -27,22 +34,100 @@ class ReschedulingProposal(BaseModel):
 
 
 unstructured_llm = get_llm(source="rescheduling.private", model=config.rescheduling_agent_model)
-structured_llm = get_llm(source="rescheduling.structured_output").with_structured_output(
-    ReschedulingProposal,
-    method="json_schema",
+# Both structured models are streamed rather than parsed as a whole, so a proposal that breaks the rules stops the
+# generation early. This one formats the answer of `unstructured_llm`, in the 'two_call' reasoning mode.
+streaming_structured_llm = get_llm(source="rescheduling.structured_output").bind(response_format=ReschedulingProposal)
+# Answers with the proposals directly, in the 'single_call' reasoning mode.
+single_call_structured_llm = get_llm(source="rescheduling.private", model=config.rescheduling_agent_model).bind(
+    response_format=ReschedulingProposal,
 )
 
 
+# The instructions of both calls, the same on every call for every user. See `cacheable_prompt` for when the
+# provider caches them.
+STATIC_PREFIX = "".join(
+    (
+        "CONTEXT:\n",
+        "- You are an assistant that can help with calendar events.\n",
+        (
+            "- You will be given the user's context, a list of calendar events for the user and a list of all "
+            "invitees and their events.\n"
+        ),
+        "\n",
+        "CORE OBJECTIVE:\n",
+        "- Reschedule one or more events on the user's calendar to minimize gaps between consecutive events.\n",
+        "- Create the most efficient, back-to-back schedule as possible for the user.\n",
+        "- Avoid rescheduling events that cause conflicts with other user's events.\n",
+        "\n",
+        "RULES: (All of these rules MUST be followed.)\n",
+        "- You MUST reschedule at least one event on the user's calendar.\n",
+        "- You MUST only reschedule events owned by the user.\n",
+        "- A rescheduled event MUST NOT conflict with any unchanged event on the user's calendar.\n",
+        "- A rescheduled event MUST NOT conflict with any event on any other user's calendar.\n",
+        (
+            "- A rescheduled event MUST have its start and end times within the work hours of the user and of "
+            "every invitee of the event.\n"
+        ),
+        "- The rescheduled event MUST be scheduled for the same day as the original event.\n",
+        "- DO NOT reschedule an event if it does not need to be rescheduled.\n",
+        "- Events must maintain their original duration.\n",
+        "- Events cannot be split or merged.\n",
+        "- You MUST localize all times to the user's timezone.\n",
+        "- When rescheduling an event, you MUST choose a completely different start and end time for the event.\n",
+        "\n",
+        "PRIORITIES (in order of importance):\n",
+        "- Minimize the amount of unscheduled time between events.\n",
+        "- Minimize the number of events that need to be rescheduled.\n",
+        "- Events later in the day should be rescheduled to be earlier in the day.\n",
+        "\n",
+        "SAFETY CHECKS (if any fail, you MUST generate new rescheduling proposals):\n",
+        "- Verify the reschedule event exists on the user's calendar.\n",
+        "- Verify the rescheduled event does not create any new conflicts.\n",
+        "- Verify the user is the owner of ALL rescheduled events.\n",
+        "- Ensure all invitees remain available at new times.\n",
+    ),
+)
+FORMATTING_STATIC_PREFIX = "".join(
+    (
+        "CORE OBJECTIVE:\n",
+        "- Format the given response into a valid ReschedulingProposal object.\n",
+        "\n",
+        "RULES:\n",
+        "- You MUST return a valid response in the proper JSON format.\n",
+        "- You MUST localize all times to the user's timezone.\n",
+    ),
+)
+
+
+proposal_cache = ProposalCache(
+    config.rescheduling_cache_max_entries,
+    config.rescheduling_cache_ttl_seconds,
+    config.rescheduling_cache_dir,
+)
+Calendar.event_time_change_listeners.append(proposal_cache.invalidate_event)
+
+
+def serialize_working_hours(date: datetime, person: User, subject: User) -> str:
+    """Give a person's working hours on the date in the subject's timezone, like every other time in the prompt."""
+    start_hour, end_hour = person.preffered_working_hours
+    day = datetime.combine(date.astimezone(ZoneInfo(subject.timezone)).date(), datetime.min.time(), ZoneInfo(person.timezone))
+    start, end = ((day + timedelta(hours=hour)).astimezone(ZoneInfo(subject.timezone)) for hour in (start_hour, end_hour))
+    return f"{start.strftime('%H:%M')} to {end.strftime('%H:%M')}"
+
+
 def serialize_invitee_other_events_on(date: datetime, invitee: User, calendar: Calendar, subject: User) -> str:
     invitees_events = calendar.get_events_on(date)
     invitees_events_not_owned_by_subject = list(
         filter(lambda event: event.owner != subject.id, invitees_events),
     )
+    working_hours = f"{invitee.given_name} works from {serialize_working_hours(date, invitee, subject)}.\n"
     if len(invitees_events_not_owned_by_subject) == 0:
-        return f"{invitee.given_name} has no other events scheduled on {date.strftime('%Y-%m-%d')}.\n"
+        return working_hours + f"{invitee.given_name} has no other events scheduled on {date.strftime('%Y-%m-%d')}.\n"
     else:
-        return f"{invitee.given_name} has these additional events scheduled on {date.strftime('%Y-%m-%d')}:\n" + "".join(
-            serialize_event(event, include_id=False) for event in invitees_events_not_owned_by_subject
+        return (
+            working_hours
+            + f"{invitee.given_name} has these additional events scheduled on {date.strftime('%Y-%m-%d')}:\n"
+            + "".join(serialize_event(event, include_id=False) for event in invitees_events_not_owned_by_subject)
         )
 
 
@@ -52,51 +137,44 @@ async def generate_rescheduling_proposals(
     users_calendar: Calendar,
     other_invitees: Sequence[tuple[User, Calendar]],
 ) -> list[PendingRescheduledEvent]:
-    """Generate a rescheduling proposal for a calendar event."""
+    """Generate a rescheduling proposal for a calendar event.
+
+    Proposals are cached by the fingerprint of the inputs, so reopening the app with unchanged calendars does not
+    ask the rescheduling agent again.
+    """
+    models = [config.rescheduling_agent_model]
+    if config.llm_reasoning_mode == "two_call":
+        models.append(config.default_model)
+    fingerprint, event_ids = fingerprint_rescheduling_inputs(date, user, users_calendar, other_invitees, models)
+    if (cached := proposal_cache.get(fingerprint)) is not None:
+        return cached
+
+    proposals = await generate_uncached_rescheduling_proposals(date, user, users_calendar, other_invitees)
+    proposal_cache.set(fingerprint, event_ids, proposals)
+    return proposals
+
+
+async def generate_uncached_rescheduling_proposals(
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+) -> list[PendingRescheduledEvent]:
+    """Ask the rescheduling agent for proposals, re-prompting it with the rules it broke until they are valid."""
     users_events = users_calendar.get_events_on(date)
     baseline_context = "".join(
         (
-            "- You are an assistant that can help with calendar events.\n",
-            f"- The current date is {date.strftime('%Y-%m-%d')}.\n"
-            f"- You are speaking with {user.given_name}. Their user ID is {user.id!s}.\n"
+            "USER CONTEXT:\n",
+            f"- The current date is {date.strftime('%Y-%m-%d')}.\n",
+            f"- You are speaking with {user.given_name}. Their user ID is {user.id!s}.\n",
             f"- The user's timezone is {user.timezone}.\n",
             "- All times mentioned are in the user's local timezone on the current date.\n",
-            "- The user's work hours are from 9am to 5pm in their local timezone.\n",
+            f"- The user's work hours are from {serialize_working_hours(date, user, user)} in their local timezone.\n",
         ),
     )
     prompt_str = "".join(
         (
-            "CONTEXT:\n",
             baseline_context,
-            "- You will be given a list of calendar events for the user and a list of all invitees and their events.\n",
-            "\n",
-            "CORE OBJECTIVE:\n",
-            f"- Reschedule one or more events on {user.given_name}'s calendar to minimize gaps between consecutive events.\n",
-            f"- Create the most efficient, back-to-back schedule as possible for {user.given_name}.\n",
-            "- Avoid rescheduling events that cause conflicts with other user's events.\n",
-            "\n",
-            "RULES: (All of these rules MUST be followed.)\n",
-            f"- You MUST reschedule at least one event on {user.given_name}'s calendar.\n",
-            f"- You MUST only reschedule events owned by {user.given_name}.\n",
-            "- A rescheduled event MUST NOT conflict with any unchanged event on the user's calendar.\n",
-            "- A rescheduled event MUST NOT conflict with any event on any other user's calendar.\n",
-            "- A rescheduled event MUST have its start and end times within the user's work hours.\n",
-            "- The rescheduled event MUST be scheduled for the same day as the original event.\n",
-            "- DO NOT reschedule an event if it does not need to be rescheduled.\n",
-            "- Events must maintain their original duration.\n",
-            "- Events cannot be split or merged.\n",
-            "- When rescheduling an event, you MUST choose a completely different start and end time for the event.\n",
-            "\n",
-            "PRIORITIES (in order of importance):\n",
-            "- Minimize the amount of unscheduled time between events.\n",
-            "- Minimize the number of events that need to be rescheduled.\n",
-            "- Events later in the day should be rescheduled to be earlier in the day.\n",
-            "\n",
-            "SAFETY CHECKS (if any fail, you MUST generate new rescheduling proposals):\n",
-            f"- Verify the reschedule event exists on {user.given_name}'s calendar.\n",
-            "- Verify the rescheduled event does not create any new conflicts.\n",
-            f"- Verify {user.given_name} is the owner of ALL rescheduled events.\n",
-            "- Ensure all invitees remain available at new times.\n",
             "\n",
             "--------------------------------",
             "\n",
@@ -111,58 +189,165 @@ async def generate_rescheduling_proposals(
                 for invitee, invitees_calendar in other_invitees
             ),
             "\n",
-            "You MUST give your response now - return a list of rescheduled events.",
+            # Explanations are written later, by a cheaper model, and only if someone reads them.
+            (
+                "You MUST give your response now - return a list of rescheduled events with their new times only, "
+                "without explaining them."
+            ),
         ),
     )
-    reasoning_response = await unstructured_llm.ainvoke(prompt_str)
-    reasoning = "".join(
-        (
-            "CONTEXT:\n",
+    rescheduled_events: list[PendingRescheduledEvent] = []
+    attempt_prompt_str = prompt_str
+    for _ in range(config.rescheduling_max_repair_attempts + 1):
+        rescheduled_events, violations = await propose_rescheduled_events(
+            attempt_prompt_str,
             baseline_context,
-            "CORE OBJECTIVE:\n",
-            "- Format the given response into a valid ReschedulingProposal object.",
-            "\n",
-            "RULES:\n",
-            "- You MUST return a valid response in the proper JSON format.",
-            "- You MUST localize all times to the user's timezone.",
-            "\n",
-            "RESPONSE:\n",
-            cast("str", reasoning_response.content),
-        ),
-    )
-    rescheduling_proposal = await structured_llm.ainvoke(reasoning)
+            users_events,
+            lambda proposals, pending_event_ids: validate_rescheduling_proposals(
+                date,
+                user,
+                users_calendar,
+                other_invitees,
+                proposals,
+                pending_event_ids=pending_event_ids,
+            ),
+        )
+        # A stopped generation is retried straight away, with the violations that stopped it.
+        violations = violations or validate_rescheduling_proposals(date, user, users_calendar, other_invitees, rescheduled_events)
+        if not violations:
+            return rescheduled_events
+        # Only the latest rejected attempt is shown, so the prompt stays the same size across retries.
+        attempt_prompt_str = "".join(
+            (
+                prompt_str,
+                "\n\n",
+                "--------------------------------",
+                "\n",
+                "YOUR PREVIOUS RESPONSE BROKE THE RULES AND WAS REJECTED:\n",
+                "".join(serialize_pending_rescheduled_event(event) for event in rescheduled_events),
+                "\n",
+                "VIOLATIONS (you MUST fix all of these):\n",
+                "".join(f"- {violation.message}\n" for violation in violations),
+                "\n",
+                "You MUST give a corrected response now - return a list of rescheduled events with their new times only.",
+            ),
+        )
 
-    if isinstance(rescheduling_proposal, ReschedulingProposal):
-        rescheduled_events = []
-        for event_rescheduling_proposal in rescheduling_proposal.events:
-            try:
-                # Filter out events that are not owned by the user
-                event = next(
-                    filter(lambda event: str(event_rescheduling_proposal.event_id) in str(event.id), users_events),
-                )
-                rescheduled_events.append(
-                    PendingRescheduledEvent(
-                        original_event=event,
-                        new_start_time=event_rescheduling_proposal.new_start_time,
-                        new_end_time=event_rescheduling_proposal.new_end_time,
-                        explanation=event_rescheduling_proposal.explanation,
-                    ),
-                )
-            except StopIteration:  # If the event is not found, we skip it
-                continue
-        return rescheduled_events
+    # Out of attempts: keep whatever is still valid rather than messaging invitees about moves that cannot work.
+    return drop_invalid_proposals(date, user, users_calendar, other_invitees, rescheduled_events)
+
+
+async def propose_rescheduled_events(
+    prompt_str: str,
+    baseline_context: str,
+    users_events: Sequence[CalendarEvent],
+    validate_so_far: Callable[[Sequence[PendingRescheduledEvent], Collection[CalendarEventId]], list[ProposalViolation]],
+) -> tuple[list[PendingRescheduledEvent], list[ProposalViolation]]:
+    """Ask the rescheduling agent for proposals and match them to the user's events as they are streamed in.
+
+    In the 'two_call' reasoning mode the agent answers in free text first, and a second call formats its answer.
+
+    Each proposal is checked as soon as it is complete, together with the ones before it. Conflicts with events
+    that may still get a proposal are left for the check of the whole response, so any violation found here
+    cannot be fixed by the rest of the response, and the generation is stopped right away.
 
-    msg = f"Response is not a ReschedulingProposal object: {rescheduling_proposal}"
-    raise TypeError(msg)
+    Args:
+        prompt_str: The part of the rescheduling agent's prompt after `STATIC_PREFIX`.
+        baseline_context: The user's context, shared with the formatting prompt of the 'two_call' reasoning mode.
+        users_events: The user's events that can be rescheduled.
+        validate_so_far: Checks the proposals received so far, ignoring conflicts with the given events.
+
+    Returns:
+        The proposals received, and the violations that stopped the generation. No violations means the whole
+        response was received.
+
+    """
+    if config.llm_reasoning_mode == "two_call":
+        reasoning_response = await unstructured_llm.ainvoke(cacheable_prompt(STATIC_PREFIX, prompt_str))
+        reasoning = cacheable_prompt(
+            FORMATTING_STATIC_PREFIX,
+            "".join((baseline_context, "\n", "RESPONSE:\n", cast("str", reasoning_response.content))),
+        )
+        stream = streaming_structured_llm.astream(reasoning)
+    else:
+        stream = single_call_structured_llm.astream(cacheable_prompt(STATIC_PREFIX, prompt_str))
+
+    users_events_by_id = {event.id: event for event in users_events}
+    rescheduled_events: list[PendingRescheduledEvent] = []
+    # Leaving the block closes the stream, which cancels the rest of the generation.
+    async with closing(stream) as chunks:
+        async for item in stream_list_items((chunk.text() async for chunk in chunks), "events"):
+            event_rescheduling_proposal = EventReschedulingProposal.model_validate(item)
+            event = users_events_by_id.get(event_rescheduling_proposal.event_id)
+            if event is None:
+                return rescheduled_events, [
+                    ProposalViolation(
+                        event_id=event_rescheduling_proposal.event_id,
+                        kind="unknown_event",
+                        message=f"Event ID {event_rescheduling_proposal.event_id!s} is not on the user's calendar.",
+                    ),
+                ]
+            rescheduled_events.append(
+                PendingRescheduledEvent(
+                    original_event=event,
+                    new_start_time=event_rescheduling_proposal.new_start_time,
+                    new_end_time=event_rescheduling_proposal.new_end_time,
+                ),
+            )
+            proposed = {proposal.original_event.id for proposal in rescheduled_events}
+            if violations := validate_so_far(rescheduled_events, users_events_by_id.keys() - proposed):
+                return rescheduled_events, violations
+    return rescheduled_events, []
 
 
 async def apply_rescheduling_proposals(
-    rescheduling_proposals: list[AcceptedRescheduledEvent],
-    calendar: Calendar,
-) -> None:
-    for rescheduling_proposal in rescheduling_proposals:
-        await calendar.change_event_time(
-            rescheduling_proposal.original_event.id,
-            rescheduling_proposal.new_start_time,
-            rescheduling_proposal.new_end_time,
+    rescheduling_proposals: Sequence[AcceptedRescheduledEvent],
+    calendars: Mapping[UserId, Calendar],
+    max_concurrency: int = config.update_calendar_max_concurrency,
+) -> list[EventTimeChangeResult]:
+    """Write accepted rescheduling proposals to the calendars of the events' owners.
+
+    Proposals are grouped into a single `change_event_times` call per calendar, and the calls run
+    concurrently with at most `max_concurrency` in flight.
+
+    Returns:
+        One result per proposal, in the same order as the proposals.
+
+    """
+    changes_by_owner: dict[UserId, list[tuple[int, EventTimeChange]]] = defaultdict(list)
+    results: list[EventTimeChangeResult | None] = [None] * len(rescheduling_proposals)
+
+    for i, proposal in enumerate(rescheduling_proposals):
+        change = EventTimeChange(
+            event_id=proposal.original_event.id,
+            new_start_time=proposal.new_start_time,
+            new_end_time=proposal.new_end_time,
         )
+        if proposal.original_event.owner in calendars:
+            changes_by_owner[proposal.original_event.owner].append((i, change))
+        else:
+            results[i] = EventTimeChangeResult(
+                event_id=change.event_id,
+                success=False,
+                error=f"No calendar found for owner {proposal.original_event.owner}",
+            )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def write(owner: UserId, indexed_changes: list[tuple[int, EventTimeChange]]) -> None:
+        changes = [change for _, change in indexed_changes]
+        async with semaphore:
+            try:
+                calendar_results = await calendars[owner].change_event_times(changes)
+                if len(calendar_results) != len(changes):
+                    msg = f"Expected {len(changes)} results from the calendar of {owner}, got {len(calendar_results)}"
+                    raise ValueError(msg)  # noqa: TRY301 - Handled below like any other failing provider call
+            except Exception as e:  # noqa: BLE001 - A failing provider call fails its events, not the whole update
+                calendar_results = [
+                    EventTimeChangeResult(event_id=change.event_id, success=False, error=str(e)) for change in changes
+                ]
+        for (i, _), result in zip(indexed_changes, calendar_results, strict=True):
+            results[i] = result
+
+    await asyncio.gather(*(write(owner, indexed_changes) for owner, indexed_changes in changes_by_owner.items()))
+    return [result for result in results if result is not None]
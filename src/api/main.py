@@ -1,9 +1,23 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from src.agents.helpers.models import llm_clients
 from src.api.routes.graphs import router as graphs_router
 from src.api.routes.users import router as users_router
+from src.config.main import config
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
+    # Every model was created when the graph was imported, so their endpoints are known by now.
+    await llm_clients.prewarm(config.llm_prewarm_connections)
+    yield
+    await llm_clients.aclose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(users_router, prefix="/api/v1")
 app.include_router(graphs_router, prefix="/api/v1")
@@ -0,0 +1,55 @@
+# ruff: noqa: ARG002
+
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks.base import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from src.types.prompt_token_usage import PromptTokenUsage
+
+# The usage of every source in the process, so it can be checked that provider-side prompt caching takes effect.
+prompt_token_usage: dict[str, PromptTokenUsage] = {}
+
+
+class RecordPromptTokenUsageCallback(BaseCallbackHandler):
+    """Callback that adds the prompt tokens of every model call, and how many were cached, to `prompt_token_usage`."""
+
+    def __init__(self, source: str) -> None:
+        """Initialize the callback with a source identifier.
+
+        Args:
+            source: The source identifier to record the usage under
+
+        """
+        super().__init__()
+        self.source = source
+
+    def on_llm_end(
+        self,
+        response: LLMResult,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Record the token usage reported with the response, if any.
+
+        Args:
+            response: The response of the model
+            run_id: The ID of the current run
+            parent_run_id: The ID of the parent run
+            **kwargs: Additional keyword arguments
+
+        """
+        for generations in response.generations:
+            for generation in generations:
+                if not isinstance(generation, ChatGeneration):
+                    continue
+                usage_metadata = getattr(generation.message, "usage_metadata", None)
+                if usage_metadata is None:
+                    continue
+                usage = prompt_token_usage.setdefault(self.source, PromptTokenUsage())
+                usage.calls += 1
+                usage.input_tokens += usage_metadata["input_tokens"]
+                usage.cached_input_tokens += usage_metadata.get("input_token_details", {}).get("cache_read", 0)
@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -6,6 +9,42 @@ class Config(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env")
 
     openai_api_key: SecretStr = Field(description="The API key for the OpenAI API.")
+    openai_base_url: str = Field(
+        default="https://api.openai.com/v1",
+        description="The endpoint of the OpenAI API. Every model on the same endpoint shares one connection pool.",
+    )
+    llm_max_keepalive_connections: int = Field(
+        default=20,
+        ge=1,  # Greater than or equal to 1
+        description="The most idle connections to keep open to each model endpoint.",
+    )
+    llm_keepalive_seconds: float = Field(
+        default=60,
+        gt=0,  # Greater than 0
+        description="How long an idle connection to a model endpoint is kept open, in seconds.",
+    )
+    llm_prewarm_connections: int = Field(
+        default=2,
+        ge=0,  # Greater than or equal to 0
+        description="How many connections to each model endpoint to open when the app starts. 0 disables it.",
+    )
+    llm_response_cache_max_entries: int = Field(
+        default=256,
+        ge=0,  # Greater than or equal to 0
+        description=(
+            "How many responses of the guide to keep in memory, keyed by their prompt, and replay instead of calling "
+            "the model again. 0 disables it."
+        ),
+    )
+    llm_response_cache_ttl_seconds: float = Field(
+        default=86400,
+        gt=0,  # Greater than 0
+        description="How long cached responses of the guide stay valid, in seconds.",
+    )
+    llm_response_cache_path: Path | None = Field(
+        default=None,
+        description="A SQLite database to also keep cached responses of the guide in, so they survive restarts. Off when unset.",
+    )
     default_model: str = Field(
         default="gpt-4o-mini",
         description="The default model to use for the OpenAI API.",
@@ -14,12 +53,99 @@ class Config(BaseSettings):
         default="gpt-5",
         description="The model to use for the rescheduling agent.",
     )
+    rescheduling_explanation_model: str = Field(
+        default="gpt-4o-mini",
+        description=(
+            "The model that writes the explanations of rescheduling proposals that have none, the first time they "
+            "are shown. Proposals of the 'llm' and 'hybrid' strategies carry the moves only."
+        ),
+    )
+    llm_reasoning_mode: Literal["single_call", "two_call"] = Field(
+        default="single_call",
+        description=(
+            "How the rescheduling and messaging agents get a structured answer. 'single_call' asks for it directly, "
+            "'two_call' asks for a free-text answer first and has a second call format it."
+        ),
+    )
+
+    rescheduling_strategy: Literal["llm", "solver", "search", "hybrid"] = Field(
+        default="llm",
+        description=(
+            "How to generate rescheduling proposals. 'llm' asks the rescheduling agent, "
+            "'solver' runs the deterministic compaction solver without any network calls, "
+            "'search' keeps improving on the solver until the search budget runs out, "
+            "'hybrid' runs the solver and has a cheap model explain its moves once they are shown."
+        ),
+    )
+    rescheduling_search_budget_seconds: float = Field(
+        default=0.5,
+        gt=0,  # Greater than 0
+        description="The wall-clock budget of the 'search' rescheduling strategy, in seconds.",
+    )
+
+    rescheduling_min_gap_reduction_minutes: int = Field(
+        default=15,
+        ge=0,  # Greater than or equal to 0
+        description=(
+            "Skip straight to the conclusion when moving events could close fewer gap minutes than this, without "
+            "generating any rescheduling proposals or messaging any invitees."
+        ),
+    )
+
+    rescheduling_cache_max_entries: int = Field(
+        default=256,
+        ge=0,  # Greater than or equal to 0
+        description="How many sets of rescheduling proposals to keep in memory, keyed by their inputs. 0 disables it.",
+    )
+    rescheduling_cache_ttl_seconds: float = Field(
+        default=3600,
+        gt=0,  # Greater than 0
+        description="How long cached rescheduling proposals stay valid, in seconds.",
+    )
+    rescheduling_explanation_cache_max_entries: int = Field(
+        default=1024,
+        ge=0,  # Greater than or equal to 0
+        description="How many explanations of single moves to keep in memory, for as long as cached proposals. 0 disables it.",
+    )
+    rescheduling_cache_dir: Path | None = Field(
+        default=None,
+        description="Where to also keep cached rescheduling proposals on disk, so they survive restarts. Off when unset.",
+    )
+
+    rescheduling_allow_cross_day_moves: bool = Field(
+        default=False,
+        description=(
+            "When condensing several days, let the 'solver' and 'search' strategies move events to another day of "
+            "the range. Otherwise every event stays on its own day."
+        ),
+    )
+
+    rescheduling_max_repair_attempts: int = Field(
+        default=2,
+        ge=0,  # Greater than or equal to 0
+        description=(
+            "How many times to re-prompt the rescheduling agent with the rule violations found in its proposals "
+            "before dropping the invalid proposals."
+        ),
+    )
+
+    rescheduling_max_replans: int = Field(
+        default=1,
+        ge=0,  # Greater than or equal to 0
+        description="How many times to find new times for rejected moves and ask the affected invitees again.",
+    )
 
     include_llm_messages: bool = Field(
         default=False,
         description="If False, skip LLM messages in the UI to speed up graph execution.",
     )
 
+    update_calendar_max_concurrency: int = Field(
+        default=4,
+        ge=1,  # Greater than or equal to 1
+        description="The maximum number of calendars to update concurrently when applying accepted proposals.",
+    )
+
     delay_seconds_load_calendar: float = Field(
         default=0,
         description="The number of seconds to delay the loading of the calendar. Simulates network latency.",
@@ -50,6 +176,16 @@ class Config(BaseSettings):
         description="The number of seconds to delay the receiving of the message. Simulates network latency.",
     )
 
+    messaging_reply_classifier_min_confidence: float = Field(
+        default=0.8,
+        ge=0,  # Greater than or equal to 0
+        le=1,  # Less than or equal to 1
+        description=(
+            "How sure the local classifier of invitee replies must be to resolve a reply by itself. Less clear "
+            "replies are left to the messaging agent."
+        ),
+    )
+
     mock_messaging_platform_positive_response_probability: float = Field(
         default=0.5,
         ge=0,  # Greater than or equal to 0
@@ -0,0 +1,134 @@
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from heapq import merge
+from typing import Self
+
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+
+# Events longer than this, such as multi-day events, are kept apart so they do not widen every range query.
+LONG_EVENT_SECONDS = timedelta(days=1).total_seconds()
+
+
+def start_timestamp(event: CalendarEvent) -> float:
+    """Return the start of the event as a POSIX timestamp so events in different timezones sort together."""
+    return event.start_time.timestamp()
+
+
+class EventIndex:
+    """In-memory index over a calendar's events.
+
+    Keeps these views of the same events in sync:
+    - an id -> event hash map for O(1) lookups by id,
+    - per-day buckets keyed by the event's local start date, each sorted by UTC start time,
+    - two lists sorted by UTC start time, used for range queries: one of the events up to a day long, and one
+      of the few longer events,
+    - how many events up to a day long there are of each duration, so range queries know how far back to look,
+    - the (day, timestamp, duration) every event was indexed under, so a moved event can be found and re-bucketed.
+
+    Event times MUST only be changed through `reindex` (or the owning calendar's `change_event_time`),
+    otherwise the buckets will go stale.
+    """
+
+    def __init__(self: Self) -> None:
+        """Initialize an empty index."""
+        self._by_id: dict[CalendarEventId, CalendarEvent] = {}
+        self._by_day: dict[date, list[CalendarEvent]] = {}
+        self._by_start: list[CalendarEvent] = []
+        self._long_by_start: list[CalendarEvent] = []
+        # Range queries only need to look as far back as the longest event in `_by_start` to find events that
+        # started earlier but are still running. Counting every duration lets that bound shrink again.
+        self._duration_counts: dict[float, int] = {}
+        self._durations: list[float] = []
+        # Keyed by object identity since event ids are not guaranteed to be unique within a calendar.
+        self._positions: dict[int, tuple[date, float, float]] = {}
+
+    def __contains__(self: Self, event: CalendarEvent) -> bool:
+        """Return True if this exact event object is indexed."""
+        return id(event) in self._positions
+
+    def add(self: Self, event: CalendarEvent) -> None:
+        """Add an event to the index.
+
+        If another event with the same id is already indexed, lookups by id keep returning the first one.
+        """
+        self._by_id.setdefault(event.id, event)
+        self._insert(event)
+
+    def get(self: Self, event_id: CalendarEventId) -> CalendarEvent | None:
+        """Get an event by its id, or None if it is not indexed."""
+        return self._by_id.get(event_id)
+
+    def on(self: Self, day: date) -> list[CalendarEvent]:
+        """Get all events starting on the given local day, sorted by start time."""
+        return list(self._by_day.get(day, ()))
+
+    def between(self: Self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Get all events overlapping the half-open interval [start, end), sorted by start time.
+
+        Only looks at the events up to a day long starting in [start - longest of them, end), and at the events
+        longer than a day, so the cost depends on the number of events near the window rather than on the size
+        of the calendar.
+        """
+        if end < start:
+            msg = f"End {end.isoformat()} is before start {start.isoformat()}"
+            raise ValueError(msg)
+
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        lookback = self._durations[-1] if self._durations else 0.0
+        lo = bisect_left(self._by_start, start_ts - lookback, key=self._indexed_timestamp)
+        hi = bisect_left(self._by_start, end_ts, lo=lo, key=self._indexed_timestamp)
+        long_hi = bisect_left(self._long_by_start, end_ts, key=self._indexed_timestamp)
+        return [
+            event
+            for event in merge(self._by_start[lo:hi], self._long_by_start[:long_hi], key=self._indexed_timestamp)
+            # Zero-length events have no end after their start, so keep them when they start inside the window.
+            if event.end_time.timestamp() > start_ts or self._indexed_timestamp(event) >= start_ts
+        ]
+
+    def reindex(self: Self, event: CalendarEvent) -> None:
+        """Move an already indexed event to the position matching its current start time.
+
+        Does nothing if the event is not part of this index.
+        """
+        if event not in self:
+            return
+        self._remove(event)
+        self._insert(event)
+
+    def _indexed_timestamp(self: Self, event: CalendarEvent) -> float:
+        return self._positions[id(event)][1]
+
+    def _insert(self: Self, event: CalendarEvent) -> None:
+        day = event.start_time.date()
+        duration = (event.end_time - event.start_time).total_seconds()
+        self._positions[id(event)] = (day, start_timestamp(event), duration)
+        insort(self._by_day.setdefault(day, []), event, key=self._indexed_timestamp)
+        if duration > LONG_EVENT_SECONDS:
+            insort(self._long_by_start, event, key=self._indexed_timestamp)
+            return
+        insort(self._by_start, event, key=self._indexed_timestamp)
+        if duration not in self._duration_counts:
+            insort(self._durations, duration)
+        self._duration_counts[duration] = self._duration_counts.get(duration, 0) + 1
+
+    def _remove(self: Self, event: CalendarEvent) -> None:
+        day, timestamp, duration = self._positions[id(event)]
+        self._remove_from_sorted(self._by_day[day], event, timestamp)
+        if not self._by_day[day]:
+            del self._by_day[day]
+        if duration > LONG_EVENT_SECONDS:
+            self._remove_from_sorted(self._long_by_start, event, timestamp)
+            return
+        self._remove_from_sorted(self._by_start, event, timestamp)
+        self._duration_counts[duration] -= 1
+        if not self._duration_counts[duration]:
+            del self._duration_counts[duration]
+            del self._durations[bisect_left(self._durations, duration)]
+
+    def _remove_from_sorted(self: Self, events: list[CalendarEvent], event: CalendarEvent, timestamp: float) -> None:
+        # Lists are sorted by the timestamp each event was indexed under rather than its current start
+        # time, so the old timestamp still finds an event that has already been moved.
+        i = bisect_left(events, timestamp, key=self._indexed_timestamp)
+        while events[i] is not event:
+            i += 1
+        del events[i]
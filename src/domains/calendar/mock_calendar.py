@@ -1,10 +1,13 @@
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Self, override
+from typing import Any, ClassVar, Self, override
 from uuid import uuid4
+from weakref import WeakValueDictionary, finalize
 from zoneinfo import ZoneInfo
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
+from src.domains.calendar.event_index import EventIndex
 from src.domains.calendar.mock_events import adams_event, my_first_event, my_second_event, sallys_event
 from src.domains.user.mock_user_provider import (
     adams_user,
@@ -15,31 +18,104 @@ from src.domains.user.mock_user_provider import (
     sallys_user,
     sallys_user_id,
 )
-from src.types.calendar import Calendar, CalendarId
+from src.types.calendar import Calendar, CalendarId, EventTimeChange, EventTimeChangeResult
 from src.types.calendar_event import CalendarEvent, CalendarEventId
 
 
 class MockCalendar(Calendar):
     events: list[CalendarEvent] = Field(default_factory=list)
 
+    _index: EventIndex = PrivateAttr(default_factory=EventIndex)
+    _tracked_event_ids: set[CalendarEventId] = PrivateAttr(default_factory=set)
+
+    # The same event object can live on several calendars (e.g. a meeting on both the owner's and the
+    # invitees' calendars), so moving it on one calendar has to re-bucket it on all of them.
+    _calendars_by_event_id: ClassVar[dict[CalendarEventId, WeakValueDictionary[int, "MockCalendar"]]] = {}
+
+    @override
+    def model_post_init(self, __context: Any, /) -> None:
+        super().model_post_init(__context)
+        self._start_tracking()
+
+    def _start_tracking(self: Self) -> None:
+        # The finalizer holds the tracked ids rather than the calendar, so it does not keep the calendar alive.
+        finalize(self, MockCalendar._forget_calendar, id(self), self._tracked_event_ids)
+        for event in self.events:
+            self._track_event(event)
+
+    @staticmethod
+    def _forget_calendar(calendar_id: int, event_ids: set[CalendarEventId]) -> None:
+        """Drop a collected calendar from the registry, with the events no other calendar has."""
+        for event_id in event_ids:
+            calendars = MockCalendar._calendars_by_event_id.get(event_id)
+            if calendars is None:
+                continue
+            calendars.pop(calendar_id, None)
+            if not calendars:
+                del MockCalendar._calendars_by_event_id[event_id]
+
+    # The index is keyed by object identity, which does not survive pickling, so it is rebuilt instead of pickled.
+    @override
+    def __getstate__(self) -> dict[Any, Any]:
+        state = super().__getstate__()
+        return {**state, "__pydantic_private__": {}}
+
+    @override
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        super().__setstate__(state)
+        self._index = EventIndex()
+        self._tracked_event_ids = set()
+        self._start_tracking()
+
     def add_event(self: Self, event: CalendarEvent) -> None:
         """Add an event to the calendar."""
         self.events.append(event)
+        self._track_event(event)
+
+    def _track_event(self: Self, event: CalendarEvent) -> None:
+        self._index.add(event)
+        self._tracked_event_ids.add(event.id)
+        self._calendars_by_event_id.setdefault(event.id, WeakValueDictionary())[id(self)] = self
 
     @override
     def get_events_on(self: Self, date: datetime) -> list[CalendarEvent]:
-        return [event for event in self.events if event.start_time.date() == date.date()]
+        return self._index.on(date.date())
+
+    @override
+    def get_events_between(self: Self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        return self._index.between(start, end)
 
     @override
     async def change_event_time(self: Self, event_id: CalendarEventId, new_start_time: datetime, new_end_time: datetime) -> None:
-        for event in self.events:
-            if event.id == event_id:
-                event.start_time = new_start_time
-                event.end_time = new_end_time
-                event.updated_at = datetime.now(tz=ZoneInfo(mock_users[event.owner].timezone))
-                return
-        msg = f"Event with id {event_id} not found"
-        raise ValueError(msg)
+        self._move_event(event_id, new_start_time, new_end_time)
+
+    @override
+    async def change_event_times(self: Self, changes: Sequence[EventTimeChange]) -> list[EventTimeChangeResult]:
+        results: list[EventTimeChangeResult] = []
+        for change in changes:
+            try:
+                self._move_event(change.event_id, change.new_start_time, change.new_end_time)
+                results.append(EventTimeChangeResult(event_id=change.event_id, success=True))
+            except ValueError as e:
+                results.append(EventTimeChangeResult(event_id=change.event_id, success=False, error=str(e)))
+        return results
+
+    def _move_event(self: Self, event_id: CalendarEventId, new_start_time: datetime, new_end_time: datetime) -> None:
+        event = self._index.get(event_id)
+        if event is None:
+            msg = f"Event with id {event_id} not found"
+            raise ValueError(msg)
+        # Nothing moves, so nothing cached about the event goes stale (e.g. when the demo graph resets the calendar).
+        if (event.start_time, event.end_time) == (new_start_time, new_end_time):
+            return
+
+        event.start_time = new_start_time
+        event.end_time = new_end_time
+        event.updated_at = datetime.now(tz=ZoneInfo(mock_users[event.owner].timezone))
+
+        for calendar in list(self._calendars_by_event_id[event_id].values()):
+            calendar._index.reindex(event)  # noqa: SLF001
+        self.notify_event_time_changed(event_id)
 
 
 my_calendar = MockCalendar(
@@ -77,3 +153,9 @@ sallys_calendar = MockCalendar(
 sallys_calendar.add_event(my_first_event)
 sallys_calendar.add_event(my_second_event)
 sallys_calendar.add_event(sallys_event)
+
+mock_calendars = {
+    my_user_id: my_calendar,
+    adams_user_id: adams_calendar,
+    sallys_user_id: sallys_calendar,
+}
@@ -0,0 +1,21 @@
+import datetime as dt
+from collections.abc import Sequence
+from typing import override
+
+from pydantic import Field
+
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.results_store import ReschedulingResultsStore
+from src.types.user import UserId
+
+
+class MockReschedulingResultsStore(ReschedulingResultsStore):
+    results: dict[tuple[UserId, dt.date], list[PendingRescheduledEvent]] = Field(default_factory=dict)
+
+    @override
+    def save(self, user_id: UserId, date: dt.datetime, proposals: Sequence[PendingRescheduledEvent]) -> None:
+        self.results[user_id, date.date()] = list(proposals)
+
+    @override
+    def get(self, user_id: UserId, date: dt.datetime) -> list[PendingRescheduledEvent] | None:
+        return self.results.get((user_id, date.date()))
@@ -6,13 +6,17 @@ from src.graph.nodes.before_rescheduling_proposals.main import before_rescheduli
 from src.graph.nodes.conclusion.main import conclusion
 from src.graph.nodes.confirm_rescheduling_proposals.main import confirm_rescheduling_proposals
 from src.graph.nodes.confirm_start.main import confirm_start
+from src.graph.nodes.estimate_rescheduling_gain.main import estimate_rescheduling_gain, skip_when_nothing_to_do
+from src.graph.nodes.explain_rescheduling_proposals.main import explain_rescheduling_proposals
 from src.graph.nodes.get_rescheduling_proposals.main import get_rescheduling_proposals
 from src.graph.nodes.introduction.main import introduction
 from src.graph.nodes.load_calendar.main import load_calendar
 from src.graph.nodes.load_invitees.main import load_invitees
 from src.graph.nodes.load_user.main import load_user
+from src.graph.nodes.replan_rescheduling_proposals.main import replan_rescheduling_proposals
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.main import (
     invoke_send_rescheduling_proposal_to_invitee,
+    send_replanned_rescheduling_proposals_to_invitees,
     send_rescheduling_proposal_to_invitees,
 )
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.main import (
@@ -44,13 +48,16 @@ uncompiled_graph.add_node("confirm_start", confirm_start)
 uncompiled_graph.add_node("summarize_calendar", summarize_calendar)
 uncompiled_graph.add_node("load_calendar", load_calendar)
 uncompiled_graph.add_node("load_invitees", load_invitees)
+uncompiled_graph.add_node("estimate_rescheduling_gain", estimate_rescheduling_gain)
 uncompiled_graph.add_node("before_rescheduling_proposals", before_rescheduling_proposals)
 uncompiled_graph.add_node("get_rescheduling_proposals", get_rescheduling_proposals)
+uncompiled_graph.add_node("explain_rescheduling_proposals", explain_rescheduling_proposals)
 uncompiled_graph.add_node("confirm_rescheduling_proposals", confirm_rescheduling_proposals)
 uncompiled_graph.add_node("send_rescheduling_proposal_to_invitees", send_rescheduling_proposal_to_invitees)
 # NOTE: We intentionally disable the type checker for this node because the subgraph is invoked via Send
 #       with a different input schema than the graph's.
 uncompiled_graph.add_node("invoke_send_rescheduling_proposal_to_invitee", invoke_send_rescheduling_proposal_to_invitee)  # pyright: ignore reportArgumentType
+uncompiled_graph.add_node("replan_rescheduling_proposals", replan_rescheduling_proposals)
 uncompiled_graph.add_node("after_rescheduling_proposals", after_rescheduling_proposals)
 uncompiled_graph.add_node("conclusion", conclusion)
 uncompiled_graph.add_node("update_calendar", update_calendar)
@@ -62,15 +69,26 @@ uncompiled_graph.add_edge("introduction", "confirm_start")
 uncompiled_graph.add_edge("confirm_start", "load_calendar")
 uncompiled_graph.add_edge("load_calendar", "summarize_calendar")
 uncompiled_graph.add_edge("summarize_calendar", "load_invitees")
-uncompiled_graph.add_edge("load_invitees", "before_rescheduling_proposals")
+uncompiled_graph.add_edge("load_invitees", "estimate_rescheduling_gain")
+uncompiled_graph.add_conditional_edges(
+    "estimate_rescheduling_gain",
+    skip_when_nothing_to_do,
+    ["before_rescheduling_proposals", "conclusion"],
+)
 uncompiled_graph.add_edge("before_rescheduling_proposals", "get_rescheduling_proposals")
-uncompiled_graph.add_edge("get_rescheduling_proposals", "confirm_rescheduling_proposals")
+uncompiled_graph.add_edge("get_rescheduling_proposals", "explain_rescheduling_proposals")
+uncompiled_graph.add_edge("explain_rescheduling_proposals", "confirm_rescheduling_proposals")
 uncompiled_graph.add_conditional_edges(
     "confirm_rescheduling_proposals",
     send_rescheduling_proposal_to_invitees,
-    ["invoke_send_rescheduling_proposal_to_invitee"],
+    ["invoke_send_rescheduling_proposal_to_invitee", "replan_rescheduling_proposals"],
+)
+uncompiled_graph.add_edge("invoke_send_rescheduling_proposal_to_invitee", "replan_rescheduling_proposals")
+uncompiled_graph.add_conditional_edges(
+    "replan_rescheduling_proposals",
+    send_replanned_rescheduling_proposals_to_invitees,
+    ["invoke_send_rescheduling_proposal_to_invitee", "after_rescheduling_proposals"],
 )
-uncompiled_graph.add_edge("invoke_send_rescheduling_proposal_to_invitee", "after_rescheduling_proposals")
 uncompiled_graph.add_edge("after_rescheduling_proposals", "update_calendar")
 uncompiled_graph.add_edge("update_calendar", "load_calendar_after_update")
 uncompiled_graph.add_edge("load_calendar_after_update", "conclusion")
@@ -5,4 +5,4 @@ from src.types.state import StateWithInvitees
 
 async def before_rescheduling_proposals(state: StateWithInvitees) -> None:
     if config.include_llm_messages:
-        await anticipate_rescheduling_proposals(state)
+        await anticipate_rescheduling_proposals()
@@ -1,8 +1,13 @@
 from src.agents.guide import conclusion as guide_conclusion
+from src.agents.guide import conclusion_with_nothing_to_do
 from src.config.main import config
-from src.types.state import StateAfterSendingReschedulingProposals
+from src.types.state import StateWithReschedulingGain
 
 
-async def conclusion(state: StateAfterSendingReschedulingProposals) -> None:
+async def conclusion(state: StateWithReschedulingGain) -> None:
+    # The calendar may not have been updated, since the rescheduling steps are skipped when there is nothing to gain.
     if config.include_llm_messages:
-        await guide_conclusion(state)
+        if state.nothing_to_do:
+            await conclusion_with_nothing_to_do()
+        else:
+            await guide_conclusion()
@@ -1,10 +1,34 @@
 from langgraph.types import interrupt
 
+from src.graph.nodes.confirm_rescheduling_proposals.types import ConfirmReschedulingProposalsResponse
+from src.planning.scoring import DayScorer
 from src.types.state import StateWithPendingReschedulingProposals
 
 
-async def confirm_rescheduling_proposals(state: StateWithPendingReschedulingProposals) -> None:
+async def confirm_rescheduling_proposals(
+    state: StateWithPendingReschedulingProposals,
+) -> ConfirmReschedulingProposalsResponse:
+    # The explanations were written by the node before, so re-running this node on resume calls no model.
+    proposals = state.pending_rescheduling_proposals
+    after = DayScorer.for_day(state.date, state.user, state.calendar, days=state.days).score_rescheduled_events([proposals])[0]
+
+    names = ", ".join(alternative.name for alternative in state.rescheduling_alternatives)
     value = interrupt(
-        "Do these rescheduling proposals look good?",
+        "Do these rescheduling proposals look good?\n"
+        + "".join(
+            f"- {proposal.original_event.title}: {proposal.explanation}\n" for proposal in proposals if proposal.explanation
+        )
+        + (f"Reply with the name of an alternative to pick it instead: {names}" if names else ""),
+    )
+    if value == "CONFIRMED":
+        return ConfirmReschedulingProposalsResponse(pending_rescheduling_proposals=proposals, objective=after)
+
+    # The alternatives were computed together with the proposals, so picking one needs no more solving.
+    alternative = next((alternative for alternative in state.rescheduling_alternatives if alternative.name == value), None)
+    if alternative is None:
+        msg = f"Expected CONFIRMED or the name of a rescheduling alternative, got {value!r}"
+        raise ValueError(msg)
+    return ConfirmReschedulingProposalsResponse(
+        pending_rescheduling_proposals=alternative.pending_rescheduling_proposals,
+        objective=alternative.objective,
     )
-    assert value == "CONFIRMED"  # TODO Handle other values
@@ -0,0 +1,12 @@
+from pydantic import Field
+
+from src.types.nodes import NodeResponse
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.schedule_objective import ScheduleObjective
+
+
+class ConfirmReschedulingProposalsResponse(NodeResponse):
+    pending_rescheduling_proposals: list[PendingRescheduledEvent] = Field(
+        description=("The proposals the user confirmed, or the ones of the alternative they picked instead."),
+    )
+    objective: ScheduleObjective = Field(description="The objective of the schedule the picked proposals lead to.")
@@ -0,0 +1,22 @@
+from typing import Literal
+
+from src.config.main import config
+from src.domains.calendar.mock_calendar import my_calendar
+from src.domains.user.mock_user_provider import me
+from src.graph.nodes.estimate_rescheduling_gain.types import EstimateReschedulingGainResponse
+from src.planning.scoring import DayScorer
+from src.types.state import StateWithInvitees, StateWithReschedulingGain
+
+
+async def estimate_rescheduling_gain(state: StateWithInvitees) -> EstimateReschedulingGainResponse:
+    scorer = DayScorer.for_day(state.date, me, my_calendar, days=state.days)
+    achievable_gap_reduction_minutes = scorer.gap_reduction_bound()
+    return EstimateReschedulingGainResponse(
+        achievable_gap_reduction_minutes=achievable_gap_reduction_minutes,
+        nothing_to_do=achievable_gap_reduction_minutes < config.rescheduling_min_gap_reduction_minutes,
+    )
+
+
+def skip_when_nothing_to_do(state: StateWithReschedulingGain) -> Literal["before_rescheduling_proposals", "conclusion"]:
+    """Skip every LLM call and message of the rescheduling steps when there is too little to gain from them."""
+    return "conclusion" if state.nothing_to_do else "before_rescheduling_proposals"
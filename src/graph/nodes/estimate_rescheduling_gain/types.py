@@ -0,0 +1,13 @@
+from pydantic import Field
+
+from src.types.nodes import NodeResponse
+
+
+class EstimateReschedulingGainResponse(NodeResponse):
+    achievable_gap_reduction_minutes: int = Field(
+        description="An upper bound on the gap minutes rescheduling could close, computed without solving anything.",
+    )
+    nothing_to_do: bool = Field(
+        default=False,
+        description="Whether the gain is too small to be worth generating rescheduling proposals for.",
+    )
@@ -0,0 +1,15 @@
+from src.agents.explanation import explain_rescheduling_proposals as explain
+from src.graph.nodes.explain_rescheduling_proposals.types import ExplainReschedulingProposalsResponse
+from src.planning.scoring import DayScorer
+from src.types.state import StateWithPendingReschedulingProposals
+
+
+async def explain_rescheduling_proposals(state: StateWithPendingReschedulingProposals) -> ExplainReschedulingProposalsResponse:
+    # The proposals are about to be shown for the first time, so this is when their explanations are written. It is
+    # a node of its own so the explanations are checkpointed before the confirmation interrupts: the interrupting
+    # node is re-run when the user replies, possibly in another process.
+    scorer = DayScorer.for_day(state.date, state.user, state.calendar, days=state.days)
+    before, after = scorer.score_rescheduled_events([[], state.pending_rescheduling_proposals])
+    return ExplainReschedulingProposalsResponse(
+        pending_rescheduling_proposals=await explain(state.user, state.pending_rescheduling_proposals, before, after),
+    )
@@ -0,0 +1,10 @@
+from pydantic import Field
+
+from src.types.nodes import NodeResponse
+from src.types.rescheduled_event import PendingRescheduledEvent
+
+
+class ExplainReschedulingProposalsResponse(NodeResponse):
+    pending_rescheduling_proposals: list[PendingRescheduledEvent] = Field(
+        description="The proposals, with the explanations that were missing written.",
+    )
@@ -1,21 +1,72 @@
 import asyncio
+from datetime import timedelta
+from typing import TYPE_CHECKING
 
 from src.agents.rescheduling import generate_rescheduling_proposals
 from src.config.main import config
 from src.domains.calendar.mock_calendar import adams_calendar, my_calendar, sallys_calendar
 from src.domains.user.mock_user_provider import adams_user, me, sallys_user
 from src.graph.nodes.get_rescheduling_proposals.types import GetReschedulingProposalsResponse
+from src.planning.scoring import DayScorer
+from src.planning.search import search_rescheduling_proposals
+from src.planning.solver import solve_rescheduling_alternatives
 from src.types.state import StateWithInvitees
 from src.utilities.loading import indicate_loading
 
+if TYPE_CHECKING:
+    from src.types.rescheduling_alternative import ReschedulingAlternative
+
 
 async def get_rescheduling_proposals(state: StateWithInvitees) -> GetReschedulingProposalsResponse:
     indicate_loading("Generating rescheduling proposals...")
     await asyncio.sleep(config.delay_seconds_get_rescheduling_proposals)
 
     other_invitees = [(adams_user, adams_calendar), (sallys_user, sallys_calendar)]
-    pending_rescheduling_proposals = await generate_rescheduling_proposals(state.date, me, my_calendar, other_invitees)
+    objective = None
+    rescheduling_alternatives: list[ReschedulingAlternative] = []
+    if config.rescheduling_strategy == "search":
+        # The search uses its whole budget, so keep it off the event loop.
+        pending_rescheduling_proposals, objective, rescheduling_alternatives = await asyncio.to_thread(
+            search_rescheduling_proposals,
+            state.date,
+            me,
+            my_calendar,
+            other_invitees,
+            config.rescheduling_search_budget_seconds,
+            days=state.days,
+            allow_cross_day_moves=config.rescheduling_allow_cross_day_moves,
+        )
+    elif config.rescheduling_strategy in ("solver", "hybrid"):
+        pending_rescheduling_proposals, rescheduling_alternatives = solve_rescheduling_alternatives(
+            state.date,
+            me,
+            my_calendar,
+            other_invitees,
+            days=state.days,
+            allow_cross_day_moves=config.rescheduling_allow_cross_day_moves,
+        )
+    else:
+        # The rescheduling agent is prompted one day at a time, so its events always stay on their own day.
+        proposals_per_day = await asyncio.gather(
+            *(
+                generate_rescheduling_proposals(state.date + timedelta(days=day), me, my_calendar, other_invitees)
+                for day in range(state.days)
+            ),
+        )
+        pending_rescheduling_proposals = [proposal for proposals in proposals_per_day for proposal in proposals]
+
+    if objective is None:
+        scorer = DayScorer.for_day(state.date, me, my_calendar, days=state.days)
+        objective = scorer.score_rescheduled_events([pending_rescheduling_proposals])[0]
+
+    if config.rescheduling_strategy == "hybrid":
+        # The solver chose the moves, and a cheap model words their explanations once they are shown.
+        pending_rescheduling_proposals = [
+            proposal.model_copy(update={"explanation": None}) for proposal in pending_rescheduling_proposals
+        ]
 
     return GetReschedulingProposalsResponse(
         pending_rescheduling_proposals=pending_rescheduling_proposals,
+        objective=objective,
+        rescheduling_alternatives=rescheduling_alternatives,
     )
@@ -1,6 +1,18 @@
+from pydantic import Field
+
 from src.types.nodes import NodeResponse
 from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.rescheduling_alternative import ReschedulingAlternative
+from src.types.schedule_objective import ScheduleObjective
 
 
 class GetReschedulingProposalsResponse(NodeResponse):
     pending_rescheduling_proposals: list[PendingRescheduledEvent]
+    objective: ScheduleObjective | None = Field(
+        default=None,
+        description="The objective of the schedule the proposals lead to, scored the same way for every strategy.",
+    )
+    rescheduling_alternatives: list[ReschedulingAlternative] = Field(
+        default_factory=list,
+        description="Plans the user can pick instead of the proposals, from the same solve. Empty for the LLM.",
+    )
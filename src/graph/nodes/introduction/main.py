@@ -5,4 +5,4 @@ from src.types.state import StateWithUser
 
 async def introduction(state: StateWithUser) -> None:
     if config.include_llm_messages:
-        await introduction_to_user(state.user, state.date)
+        await introduction_to_user()
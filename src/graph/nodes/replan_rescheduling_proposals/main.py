@@ -0,0 +1,61 @@
+from src.config.main import config
+from src.domains.calendar.mock_calendar import adams_calendar, my_calendar, sallys_calendar
+from src.domains.user.mock_user_provider import adams_user, me, sallys_user
+from src.graph.nodes.replan_rescheduling_proposals.types import ReplanReschedulingProposalsResponse
+from src.planning.replanning import replan_rejected_proposals, resolve_rescheduling_proposals
+from src.planning.validation import drop_invalid_proposals
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.state import StateAfterReplanning
+from src.utilities.loading import indicate_loading
+
+
+async def replan_rescheduling_proposals(state: StateAfterReplanning) -> ReplanReschedulingProposalsResponse:
+    accepted, rejected = resolve_rescheduling_proposals(
+        state.pending_rescheduling_proposals,
+        state.rejected_rescheduling_proposals,
+    )
+    kept = [PendingRescheduledEvent(**proposal.model_dump()) for proposal in accepted]
+    other_invitees = [(adams_user, adams_calendar), (sallys_user, sallys_calendar)]
+    days, allow_cross_day_moves = state.days, config.rescheduling_allow_cross_day_moves
+
+    if not rejected or state.replans >= config.rescheduling_max_replans:
+        # Accepted moves may have relied on a rejected event leaving its slot, so only keep the ones that
+        # still work with the rejected events where they are.
+        return ReplanReschedulingProposalsResponse(
+            pending_rescheduling_proposals=drop_invalid_proposals(
+                state.date,
+                me,
+                my_calendar,
+                other_invitees,
+                kept,
+                days=days,
+                allow_cross_day_moves=allow_cross_day_moves,
+            ),
+            replans=state.replans,
+        )
+
+    indicate_loading("Replanning rejected rescheduling proposals...")
+    replanned = replan_rejected_proposals(
+        state.date,
+        me,
+        my_calendar,
+        other_invitees,
+        accepted_rescheduling_proposals=accepted,
+        rejected_rescheduling_proposals=state.rejected_rescheduling_proposals,
+        days=days,
+        allow_cross_day_moves=allow_cross_day_moves,
+    )
+    plan = drop_invalid_proposals(
+        state.date,
+        me,
+        my_calendar,
+        other_invitees,
+        [*kept, *replanned],
+        days=days,
+        allow_cross_day_moves=allow_cross_day_moves,
+    )
+    return ReplanReschedulingProposalsResponse(
+        pending_rescheduling_proposals=plan,
+        replanned_rescheduling_proposals=[proposal for proposal in replanned if proposal in plan],
+        replans=state.replans + 1,
+    )
@@ -0,0 +1,15 @@
+from pydantic import Field
+
+from src.types.nodes import NodeResponse
+from src.types.rescheduled_event import PendingRescheduledEvent
+
+
+class ReplanReschedulingProposalsResponse(NodeResponse):
+    pending_rescheduling_proposals: list[PendingRescheduledEvent] = Field(
+        description="The whole plan: accepted moves plus the replanned moves still waiting on invitees.",
+    )
+    replanned_rescheduling_proposals: list[PendingRescheduledEvent] = Field(
+        default_factory=list,
+        description="The moves that changed in the latest replan, which invitees still need to be asked about.",
+    )
+    replans: int = Field(default=0, description="How many times rejected moves have been replanned.")
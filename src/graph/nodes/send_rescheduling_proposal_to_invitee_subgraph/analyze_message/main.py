@@ -1,11 +1,11 @@
-from src.agents.messaging import determine_rescheduling_proposal_resolution
+from src.agents.messaging import resolve_rescheduling_proposal
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.analyze_message.types import AnalyzeMessageResponse
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.types import StateWithReceivedMessage
 from src.types.rescheduled_event import AcceptedRescheduledEvent
 
 
 async def analyze_message(state: StateWithReceivedMessage) -> AnalyzeMessageResponse:
-    resolution = await determine_rescheduling_proposal_resolution(
+    resolution = await resolve_rescheduling_proposal(
         state.pending_rescheduling_proposals[0],
         state.sent_message.content,
         state.received_message.content,
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from langgraph.graph import END, START, StateGraph
@@ -11,8 +12,9 @@ from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.types import
     InvokeSendReschedulingProposalResponse,
     StateWithMessageAnalysis,
 )
-from src.types.rescheduled_event import AcceptedRescheduledEvent, RejectedRescheduledEvent
-from src.types.state import StateWithPendingReschedulingProposals
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent, RejectedRescheduledEvent
+from src.types.state import StateAfterReplanning, StateWithPendingReschedulingProposals
+from src.types.user import User
 
 if TYPE_CHECKING:
     from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.analyze_message.types import MessageAnalysis
@@ -66,15 +68,30 @@ async def invoke_send_rescheduling_proposal_to_invitee(
         )
 
 
-async def send_rescheduling_proposal_to_invitees(state: StateWithPendingReschedulingProposals) -> list[Send]:
-    return [
-        Send(
-            "invoke_send_rescheduling_proposal_to_invitee",
-            InitialState(
-                user=state.user,
-                invitee=invitee,
-                pending_rescheduling_proposals=state.pending_rescheduling_proposals,
-            ),
-        )
-        for invitee in state.invitees
-    ]
+def sends_to_invitees(user: User, invitees: Sequence[User], proposals: Sequence[PendingRescheduledEvent]) -> list[Send]:
+    """Ask every invitee about the proposals for events they attend, skipping invitees with nothing to answer."""
+    sends: list[Send] = []
+    for invitee in invitees:
+        attended = [
+            proposal
+            for proposal in proposals
+            if any(event_invitee.id == invitee.id for event_invitee in proposal.original_event.invitees)
+        ]
+        if attended:
+            sends.append(
+                Send(
+                    "invoke_send_rescheduling_proposal_to_invitee",
+                    InitialState(user=user, invitee=invitee, pending_rescheduling_proposals=attended),
+                ),
+            )
+    return sends
+
+
+async def send_rescheduling_proposal_to_invitees(state: StateWithPendingReschedulingProposals) -> list[Send] | str:
+    # Invalid proposals are dropped before this point, so there may be nothing left to ask invitees about.
+    return sends_to_invitees(state.user, state.invitees, state.pending_rescheduling_proposals) or "replan_rescheduling_proposals"
+
+
+async def send_replanned_rescheduling_proposals_to_invitees(state: StateAfterReplanning) -> list[Send] | str:
+    # Only the invitees of events that moved again are asked again.
+    return sends_to_invitees(state.user, state.invitees, state.replanned_rescheduling_proposals) or "after_rescheduling_proposals"
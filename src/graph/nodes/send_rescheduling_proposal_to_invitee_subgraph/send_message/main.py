@@ -1,4 +1,5 @@
 import asyncio
+from collections.abc import Sequence
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -6,19 +7,30 @@ from src.config.main import config
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.send_message.types import SendMessageResponse
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.types import InitialState
 from src.types.messaging import OutgoingMessage
+from src.types.rescheduled_event import PendingRescheduledEvent
 from src.utilities.timestamp_formatting import format_time_human_friendly
 
 
+def describe_rescheduling_proposals(rescheduling_proposals: Sequence[PendingRescheduledEvent]) -> str:
+    """Describe every move in one sentence fragment, naming the day when the moves span several days."""
+    include_day = len({proposal.new_start_time.date() for proposal in rescheduling_proposals}) > 1
+    moves: list[str] = []
+    for proposal in rescheduling_proposals:
+        start_time = format_time_human_friendly(proposal.new_start_time)
+        end_time = format_time_human_friendly(proposal.new_end_time)
+        end_time_am_pm = proposal.new_end_time.strftime("%p")
+        day = f" on {proposal.new_start_time.strftime('%A')}" if include_day else ""
+        moves.append(f"{proposal.original_event.title} to {start_time} - {end_time}{end_time_am_pm}{day}")
+    if len(moves) == 1:
+        return moves[0]
+    return f"{', '.join(moves[:-1])} and {moves[-1]}"
+
+
 async def send_message(state: InitialState) -> SendMessageResponse:
     await asyncio.sleep(config.delay_seconds_send_rescheduling_proposal_to_invitee_send_message)
-    rescheduling_proposal = state.pending_rescheduling_proposals[0]
-
-    event_title = rescheduling_proposal.original_event.title
-    start_time = format_time_human_friendly(rescheduling_proposal.new_start_time)
-    end_time = format_time_human_friendly(rescheduling_proposal.new_end_time)
-    end_time_am_pm = rescheduling_proposal.new_end_time.strftime("%p")
 
-    content = f"Hey, is it alright if we reschedule {event_title} to {start_time} - {end_time}{end_time_am_pm}?"
+    # Every proposal the invitee attends goes into a single message, however many days they span.
+    content = f"Hey, is it alright if we reschedule {describe_rescheduling_proposals(state.pending_rescheduling_proposals)}?"
 
     return SendMessageResponse(
         sent_message=OutgoingMessage(
@@ -1,6 +1,8 @@
 import operator
 from typing import Annotated
 
+from pydantic import Field
+
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.analyze_message.types import (
     AnalyzeMessageResponse,
 )
@@ -31,5 +33,5 @@ class StateWithMessageAnalysis(StateWithReceivedMessage, AnalyzeMessageResponse)
 
 
 class InvokeSendReschedulingProposalResponse(NodeResponse):
-    rejected_rescheduling_proposals: Annotated[list[RejectedRescheduledEvent], operator.add]
-    accepted_rescheduling_proposals: Annotated[list[AcceptedRescheduledEvent], operator.add]
+    rejected_rescheduling_proposals: Annotated[list[RejectedRescheduledEvent], operator.add] = Field(default_factory=list)
+    accepted_rescheduling_proposals: Annotated[list[AcceptedRescheduledEvent], operator.add] = Field(default_factory=list)
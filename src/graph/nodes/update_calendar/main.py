@@ -1,27 +1,19 @@
 import asyncio
-from typing import TYPE_CHECKING
 
+from src.agents.rescheduling import apply_rescheduling_proposals
 from src.config.main import config
-from src.domains.calendar.mock_calendar import my_calendar
-
-if TYPE_CHECKING:
-    from src.types.calendar_event import CalendarEventId
-
+from src.domains.calendar.mock_calendar import mock_calendars
+from src.graph.nodes.update_calendar.types import UpdateCalendarResponse
+from src.planning.replanning import resolve_rescheduling_proposals
 from src.types.state import StateAfterSendingReschedulingProposals
 from src.utilities.loading import indicate_loading
 
 
-async def update_calendar(state: StateAfterSendingReschedulingProposals) -> None:
-    updated_events: dict[CalendarEventId, bool] = {}
+async def update_calendar(state: StateAfterSendingReschedulingProposals) -> UpdateCalendarResponse:
     indicate_loading("Updating your calendar...")
 
-    for accepted_rescheduling_proposal in state.accepted_rescheduling_proposals:
-        updated_events[accepted_rescheduling_proposal.original_event.id] = True
-
-        await my_calendar.change_event_time(
-            accepted_rescheduling_proposal.original_event.id,
-            accepted_rescheduling_proposal.new_start_time,
-            accepted_rescheduling_proposal.new_end_time,
-        )
+    accepted, _ = resolve_rescheduling_proposals(state.pending_rescheduling_proposals, state.rejected_rescheduling_proposals)
+    event_time_change_results = await apply_rescheduling_proposals(accepted, mock_calendars)
 
     await asyncio.sleep(config.delay_seconds_update_calendar)
+    return UpdateCalendarResponse(event_time_change_results=event_time_change_results)
@@ -0,0 +1,6 @@
+from src.types.calendar import EventTimeChangeResult
+from src.types.nodes import NodeResponse
+
+
+class UpdateCalendarResponse(NodeResponse):
+    event_time_change_results: list[EventTimeChangeResult]
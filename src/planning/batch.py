@@ -0,0 +1,209 @@
+import os
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from pydantic import BaseModel
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.planning.free_busy import TimeWindow
+from src.planning.joint import JointCompactionProblem, attendee_ids, joint_window, user_components
+from src.planning.scoring import movable_events
+from src.planning.shared_busy import SharedBusyCounts, SharedBusyCountsHandle
+from src.planning.solver import CompactionProblem, compact
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.results_store import ReschedulingResultsStore
+from src.types.user import User, UserId
+from src.types.user_provider import UserNotFoundError, UserProvider
+
+# Worker processes only pay off when each one gets a good number of jobs per round trip.
+CHUNKS_PER_WORKER = 4
+
+
+class PlanningBatch(BaseModel):
+    """Every calendar and user a batch needs, read once up front."""
+
+    window: TimeWindow
+    planned_user_ids: list[UserId]
+    users: dict[UserId, User]
+    calendars: dict[UserId, MockCalendar]
+
+
+class PlanningJob(BaseModel):
+    """A group of users connected by shared events on one day: just the events that may move and who attends them.
+
+    This keeps the job cheap to send to a worker. Everyone's busy time comes from the `SharedBusyCounts` the
+    worker is attached to.
+    """
+
+    users: list[User]
+    date: datetime
+    events: list[CalendarEvent]
+    invitees: list[User]
+    holders: list[list[UserId]]
+
+
+# The shared busy counts of the current worker process, attached when the worker starts.
+worker_counts: list[SharedBusyCounts] = []
+
+
+def snapshot_calendar(calendar: Calendar, window: TimeWindow) -> MockCalendar:
+    """Copy the events of a calendar overlapping the window into an in-memory calendar."""
+    return MockCalendar(
+        id=calendar.id,
+        name=calendar.name,
+        owner=calendar.owner,
+        events=list(calendar.get_events_between(window.start, window.end)),
+        created_at=calendar.created_at,
+        updated_at=calendar.updated_at,
+    )
+
+
+def load_planning_batch(
+    users: Sequence[User],
+    dates: Sequence[datetime],
+    calendars: Mapping[UserId, Calendar],
+    user_provider: UserProvider,
+) -> PlanningBatch:
+    """Read the calendars of the users and of every invitee of their events, with one range query per calendar.
+
+    Invitees that are unknown to the user provider or have no calendar are left out, and are treated as always
+    available, the same as users without a row in an `Availability`.
+
+    Args:
+        users: The users to plan for. Users without a calendar are left out.
+        dates: The days to plan, each in every user's own timezone.
+        calendars: Every user's calendar, including the invitees'.
+        user_provider: Looks up the invitees of the planned events.
+
+    """
+    # A day away from the earliest and latest date covers every user's local day, whatever their timezone.
+    span = TimeWindow.between(min(dates) - timedelta(days=1), max(dates) + timedelta(days=2))
+    batch = PlanningBatch(window=span, planned_user_ids=[], users={}, calendars={})
+    invitee_ids: set[UserId] = set()
+    for user in users:
+        if user.id in calendars:
+            snapshot = snapshot_calendar(calendars[user.id], span)
+            batch.planned_user_ids.append(user.id)
+            batch.users[user.id] = user
+            batch.calendars[user.id] = snapshot
+            invitee_ids.update(invitee.id for event in snapshot.events if event.owner == user.id for invitee in event.invitees)
+
+    for invitee_id in invitee_ids - batch.users.keys():
+        try:
+            invitee = user_provider.get_user(invitee_id)
+        except UserNotFoundError:
+            continue
+        if invitee_id in calendars:
+            batch.users[invitee_id] = invitee
+            batch.calendars[invitee_id] = snapshot_calendar(calendars[invitee_id], span)
+    return batch
+
+
+def build_planning_jobs(batch: PlanningBatch, dates: Sequence[datetime]) -> list[PlanningJob]:
+    """Build a job for every group of planned users connected by shared events, for every date.
+
+    Users connected through an event, directly or through an invitee they have in common, are planned together
+    so their proposals cannot conflict. Everyone else gets a job of their own.
+    """
+    event_ids = {user_id: {event.id for event in calendar.events} for user_id, calendar in batch.calendars.items()}
+    planned = [batch.users[user_id] for user_id in batch.planned_user_ids]
+    jobs: list[PlanningJob] = []
+    for date in dates:
+        events: dict[UserId, list[CalendarEvent]] = {}
+        for user in planned:
+            window = TimeWindow.for_day(date.astimezone(ZoneInfo(user.timezone)))
+            events[user.id] = movable_events(window, user, batch.calendars[user.id].get_events_between(window.start, window.end))
+        for component in user_components(events, (event for user_events in events.values() for event in user_events)):
+            component_events = [event for user_id in component for event in events[user_id]]
+            invitee_ids = {invitee.id for event in component_events for invitee in event.invitees} & batch.users.keys()
+            jobs.append(
+                PlanningJob(
+                    users=[batch.users[user_id] for user_id in component],
+                    date=date,
+                    events=component_events,
+                    invitees=[batch.users[invitee_id] for invitee_id in sorted(invitee_ids - set(component))],
+                    holders=[
+                        [attendee for attendee in attendee_ids(event) if event.id in event_ids.get(attendee, ())]
+                        for event in component_events
+                    ],
+                ),
+            )
+    return jobs
+
+
+def plan_job(counts: SharedBusyCounts, job: PlanningJob) -> dict[UserId, list[PendingRescheduledEvent]]:
+    """Plan a job's day, reading everyone's busy time from the shared counts.
+
+    A user on their own gets the compaction solver, the same as planning them directly. A group is planned
+    jointly so every shared event moves once, for all of its attendees.
+    """
+    ignored_events = list(zip(job.events, job.holders, strict=True))
+    if len(job.users) == 1:
+        [user] = job.users
+        window = TimeWindow.for_day(job.date.astimezone(ZoneInfo(user.timezone)))
+        availability = counts.availability(window, [user, *job.invitees], ignored_events)
+        problem = CompactionProblem.from_availability(user, job.events, availability)
+        return {user.id: problem.to_pending_rescheduled_events(compact(problem))}
+
+    users = [*job.users, *job.invitees]
+    availability = counts.availability(joint_window(job.date, job.users), users, ignored_events)
+    problem = JointCompactionProblem(job.date, users, [user.id for user in job.users], job.events, availability)
+    return problem.to_pending_rescheduled_events(problem.solve())
+
+
+def start_worker(handle: SharedBusyCountsHandle) -> None:
+    """Attach this worker process to the shared counts of the batch."""
+    worker_counts.append(SharedBusyCounts.attach(handle))
+
+
+def plan_worker_job(job: PlanningJob) -> dict[UserId, list[PendingRescheduledEvent]]:
+    """Plan a single job against the shared counts of the worker process."""
+    return plan_job(worker_counts[-1], job)
+
+
+def plan_batch(  # noqa: PLR0913 - The batch inputs plus where the results go and how many workers to use
+    users: Sequence[User],
+    dates: Sequence[datetime],
+    calendars: Mapping[UserId, Calendar],
+    user_provider: UserProvider,
+    store: ReschedulingResultsStore,
+    *,
+    workers: int | None = None,
+) -> int:
+    """Plan every user's days with the compaction solver, spread over a pool of worker processes.
+
+    Meant for condensing a whole organisation ahead of time, e.g. every user's next day overnight. No LLM is
+    involved, so each job is pure CPU work and scales with the number of cores. Users sharing events are
+    planned together, so the saved proposals never conflict with each other. Everyone's busy time is
+    published once in shared memory, so invitees shared by many users are not rebuilt by every worker.
+
+    Args:
+        users: The users to plan for.
+        dates: The days to plan for every user.
+        calendars: Every user's calendar, including the invitees'.
+        user_provider: Looks up the invitees of the planned events.
+        store: Where the proposals of every planned day are saved, including days with nothing to gain.
+        workers: The number of worker processes. Defaults to the number of cores available.
+
+    Returns:
+        The number of days planned.
+
+    """
+    if not users or not dates:
+        return 0
+    batch = load_planning_batch(users, dates, calendars, user_provider)
+    jobs = build_planning_jobs(batch, dates)
+    workers = workers or os.process_cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * CHUNKS_PER_WORKER))
+    with (
+        SharedBusyCounts.publish(batch.window, batch.calendars) as counts,
+        ProcessPoolExecutor(max_workers=workers, initializer=start_worker, initargs=(counts.handle,)) as executor,
+    ):
+        for job, plans in zip(jobs, executor.map(plan_worker_job, jobs, chunksize=chunksize), strict=True):
+            for user_id, proposals in plans.items():
+                store.save(user_id, job.date, proposals)
+    return len(batch.planned_user_ids) * len(dates)
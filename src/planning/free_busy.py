@@ -0,0 +1,277 @@
+import itertools
+import math
+from collections.abc import Collection, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Self
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel, ConfigDict
+
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+from src.types.user import User, UserId
+
+# Bitmaps have one entry per minute of a `TimeWindow` (True = busy, or True = inside working hours). Several
+# users are stacked into a matrix with one row per user, so intersecting availability is one reduction.
+Bitmap = npt.NDArray[np.bool_]
+BitmapMatrix = npt.NDArray[np.bool_]
+Offsets = npt.NDArray[np.int64]
+
+MINUTE = timedelta(minutes=1)
+
+
+class TimeWindow(BaseModel):
+    """A span of time split into one-minute slots, starting at a UTC instant.
+
+    Counting slots from a UTC instant lines up bitmaps built for users in different timezones slot for slot.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    start: datetime
+    minutes: int
+
+    @classmethod
+    def for_day(cls, date: datetime) -> Self:
+        """Get the window covering the local day of `date`, in the timezone of `date`.
+
+        Days with a daylight saving transition are 23 or 25 hours long.
+        """
+        return cls.for_days(date, 1)
+
+    @classmethod
+    def for_days(cls, date: datetime, days: int) -> Self:
+        """Get the window covering `days` local days starting with the local day of `date`, in the timezone of `date`."""
+        midnight = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        return cls.between(midnight, midnight + timedelta(days=days))
+
+    @classmethod
+    def between(cls, start: datetime, end: datetime) -> Self:
+        """Get the window covering [start, end), rounded up to a whole number of minutes."""
+        start_utc, end_utc = start.astimezone(UTC), end.astimezone(UTC)
+        return cls(start=start_utc, minutes=math.ceil((end_utc - start_utc) / MINUTE))
+
+    @property
+    def end(self: Self) -> datetime:
+        """The exclusive end of the window."""
+        return self.start + self.minutes * MINUTE
+
+    def offset(self: Self, time: datetime) -> int:
+        """Get the slot containing `time`. May fall outside [0, minutes) for times outside the window."""
+        return math.floor((time.astimezone(UTC) - self.start) / MINUTE)
+
+    def time_at(self: Self, offset: int, tz: str | None = None) -> datetime:
+        """Get the start of the given slot, localized to `tz` if given."""
+        time = self.start + offset * MINUTE
+        return time.astimezone(ZoneInfo(tz)) if tz else time
+
+    def day_starts(self: Self, tz: str) -> Offsets:
+        """Get the first slot of every local day in `tz` that the window touches, starting with slot 0."""
+        zone = ZoneInfo(tz)
+        day = self.start.astimezone(zone).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        starts = [0]
+        while day < self.end:
+            starts.append(self.offset(day))
+            day += timedelta(days=1)
+        return np.asarray(starts, dtype=np.int64)
+
+    def day_index(self: Self, tz: str) -> Offsets:
+        """Get the local day in `tz` of every slot, counting the first day of the window as day 0."""
+        return np.searchsorted(self.day_starts(tz), np.arange(self.minutes), side="right") - 1
+
+    def event_offsets(self: Self, events: Sequence[CalendarEvent]) -> tuple[Offsets, Offsets]:
+        """Get the slots each event covers as half-open [start, end) offsets, clipped to the window."""
+        return self.interval_offsets([event.start_time for event in events], [event.end_time for event in events])
+
+    def interval_offsets(self: Self, starts: Sequence[datetime], ends: Sequence[datetime]) -> tuple[Offsets, Offsets]:
+        """Get the slots each [start, end) interval covers as half-open offsets, clipped to the window.
+
+        Partially covered minutes count as covered, so 09:00:30-09:01:10 covers two slots.
+        """
+        origin = self.start.timestamp()
+        start_seconds = np.fromiter((start.timestamp() for start in starts), dtype=np.float64, count=len(starts))
+        end_seconds = np.fromiter((end.timestamp() for end in ends), dtype=np.float64, count=len(ends))
+        start_offsets = np.clip(np.floor((start_seconds - origin) / 60), 0, self.minutes).astype(np.int64)
+        end_offsets = np.clip(np.ceil((end_seconds - origin) / 60), 0, self.minutes).astype(np.int64)
+        return start_offsets, end_offsets
+
+
+def count_intervals(rows: Offsets, starts: Offsets, ends: Offsets, shape: tuple[int, int]) -> npt.NDArray[np.int32]:
+    """Count the intervals covering every slot of every row, for every [start, end) interval at once.
+
+    Uses a difference array: +1 at every start, -1 at every end, and a running sum along each row.
+    """
+    diff = np.zeros((shape[0], shape[1] + 1), dtype=np.int32)
+    np.add.at(diff, (rows, starts), 1)
+    np.add.at(diff, (rows, ends), -1)
+    return np.cumsum(diff[:, :-1], axis=1, dtype=np.int32)
+
+
+def fill_intervals(rows: Offsets, starts: Offsets, ends: Offsets, shape: tuple[int, int]) -> BitmapMatrix:
+    """Set [start, end) to True in the given row for every interval at once."""
+    return count_intervals(rows, starts, ends, shape) > 0
+
+
+def busy_bitmap(events: Sequence[CalendarEvent], window: TimeWindow) -> Bitmap:
+    """Get the minutes of the window covered by at least one of the events."""
+    starts, ends = window.event_offsets(events)
+    return fill_intervals(np.zeros(len(events), dtype=np.int64), starts, ends, (1, window.minutes))[0]
+
+
+def busy_counts(
+    calendars: Sequence[Calendar],
+    window: TimeWindow,
+    ignored_event_ids: Collection[CalendarEventId] = (),
+) -> npt.NDArray[np.int32]:
+    """Get how many events every calendar has in every minute of the window, as a (calendars x minutes) matrix.
+
+    Args:
+        calendars: The calendars to read events from.
+        window: The window to count events in.
+        ignored_event_ids: Events that are not counted, e.g. the events being rescheduled.
+
+    """
+    rows: list[int] = []
+    events: list[CalendarEvent] = []
+    for row, calendar in enumerate(calendars):
+        for event in calendar.get_events_between(window.start, window.end):
+            if event.id not in ignored_event_ids:
+                rows.append(row)
+                events.append(event)
+    starts, ends = window.event_offsets(events)
+    return count_intervals(np.asarray(rows, dtype=np.int64), starts, ends, (len(calendars), window.minutes))
+
+
+def busy_matrix(
+    calendars: Sequence[Calendar],
+    window: TimeWindow,
+    ignored_event_ids: Collection[CalendarEventId] = (),
+) -> BitmapMatrix:
+    """Get one busy bitmap per calendar, as a (calendars x minutes) matrix.
+
+    Args:
+        calendars: The calendars to read events from.
+        window: The window to build the bitmaps for.
+        ignored_event_ids: Events that do not make anyone busy, e.g. the events being rescheduled.
+
+    """
+    return busy_counts(calendars, window, ignored_event_ids) > 0
+
+
+def working_hours_matrix(users: Sequence[User], window: TimeWindow) -> BitmapMatrix:
+    """Get one bitmap per user marking the minutes inside their preferred working hours, in their own timezone."""
+    rows: list[int] = []
+    starts: list[int] = []
+    ends: list[int] = []
+    for row, user in enumerate(users):
+        tz = ZoneInfo(user.timezone)
+        start_hour, end_hour = user.preffered_working_hours
+        # Working hours are local, so check every local day the window touches (at most a few).
+        day = window.start.astimezone(tz).replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < window.end:
+            rows.append(row)
+            starts.append(window.offset(day + timedelta(hours=start_hour)))
+            ends.append(window.offset(day + timedelta(hours=end_hour)))
+            day += timedelta(days=1)
+    clip = (0, window.minutes)
+    return fill_intervals(
+        np.asarray(rows, dtype=np.int64),
+        np.clip(np.asarray(starts, dtype=np.int64), *clip),
+        np.clip(np.asarray(ends, dtype=np.int64), *clip),
+        (len(users), window.minutes),
+    )
+
+
+def working_hours_mask(user: User, window: TimeWindow) -> Bitmap:
+    """Get the minutes of the window inside the user's preferred working hours."""
+    return working_hours_matrix([user], window)[0]
+
+
+def gap_minutes(busy: Bitmap | BitmapMatrix, day_starts: Offsets | None = None) -> npt.NDArray[np.int64]:
+    """Get the number of free minutes between the first and last busy minute of each row.
+
+    Rows with no busy minutes have no gaps. A 1-D bitmap is treated as a single row.
+
+    Args:
+        busy: The bitmaps to measure.
+        day_starts: The first slot of every day, if the bitmaps cover several. The night between two days is
+            not a gap, so the gaps are measured per day and summed.
+
+    """
+    matrix = np.atleast_2d(busy)
+    if day_starts is not None and day_starts.size > 1:
+        bounds = [*day_starts.tolist(), matrix.shape[1]]
+        return np.sum([gap_minutes(matrix[:, start:end]) for start, end in itertools.pairwise(bounds)], axis=0).astype(np.int64)
+    any_busy = matrix.any(axis=1)
+    first = matrix.argmax(axis=1)
+    last = matrix.shape[1] - 1 - matrix[:, ::-1].argmax(axis=1)
+    span = last - first + 1
+    return np.where(any_busy, span - matrix.sum(axis=1), 0).astype(np.int64)
+
+
+def fitting_starts(fits: Bitmap, duration: int) -> Offsets:
+    """Get every offset where `duration` minutes in a row are all True."""
+    # A start works when the running count of True minutes grows by exactly `duration` over the next `duration` minutes.
+    so_far = np.concatenate(([0], np.cumsum(fits)))
+    return np.flatnonzero(so_far[duration:] - so_far[:-duration] == duration).astype(np.int64)
+
+
+def intervals(bitmap: Bitmap) -> Offsets:
+    """Get the runs of True in the bitmap as a (runs x 2) array of half-open [start, end) offsets."""
+    edges = np.diff(np.concatenate(([False], bitmap, [False])).astype(np.int8))
+    return np.column_stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))).astype(np.int64)
+
+
+class Availability:
+    """Busy and working-hours bitmaps for a set of users over one window, one row per user.
+
+    Users without a row are unknown to the planner and are treated as always available.
+    """
+
+    def __init__(
+        self: Self,
+        window: TimeWindow,
+        user_ids: Sequence[UserId],
+        busy: BitmapMatrix,
+        working_hours: BitmapMatrix,
+    ) -> None:
+        """Initialize from prebuilt matrices with one row per user, in the order of `user_ids`."""
+        self.window = window
+        self.user_ids = list(user_ids)
+        self.busy = busy
+        self.working_hours = working_hours
+        self._rows = {user_id: row for row, user_id in enumerate(self.user_ids)}
+
+    @classmethod
+    def build(
+        cls,
+        window: TimeWindow,
+        users: Iterable[tuple[User, Calendar]],
+        ignored_event_ids: Collection[CalendarEventId] = (),
+    ) -> Self:
+        """Build the bitmaps for every user from their calendar.
+
+        Args:
+            window: The window to build the bitmaps for.
+            users: Each user with their calendar.
+            ignored_event_ids: Events that do not make anyone busy, e.g. the events being rescheduled.
+
+        """
+        users = list(users)
+        return cls(
+            window,
+            [user.id for user, _ in users],
+            busy_matrix([calendar for _, calendar in users], window, ignored_event_ids),
+            working_hours_matrix([user for user, _ in users], window),
+        )
+
+    def rows(self: Self, user_ids: Iterable[UserId]) -> list[int]:
+        """Get the matrix rows of the given users, skipping unknown users."""
+        return [self._rows[user_id] for user_id in user_ids if user_id in self._rows]
+
+    def free(self: Self, user_ids: Iterable[UserId]) -> Bitmap:
+        """Get the minutes where every given user is inside working hours and not busy."""
+        rows = self.rows(user_ids)
+        return (self.working_hours[rows] & ~self.busy[rows]).all(axis=0)
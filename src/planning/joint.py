@@ -0,0 +1,283 @@
+from collections.abc import Collection, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Self
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.planning.free_busy import Availability, Bitmap, Offsets, TimeWindow, fitting_starts, gap_minutes
+from src.planning.replanning import feasible_start
+from src.planning.scoring import movable_events
+from src.planning.solver import CompactionProblem, compact, explain_move
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.schedule_objective import ScheduleObjective
+from src.types.user import User, UserId
+
+
+def user_components(user_ids: Iterable[UserId], events: Iterable[CalendarEvent]) -> list[list[UserId]]:
+    """Split users into groups connected by shared events, so each group can be planned on its own.
+
+    Two users are connected when one of them is invited to an event of the other. Attendees that are not in
+    `user_ids` still connect the users they share events with.
+
+    Returns:
+        The groups, each in the order the users were given, with attendees that are not in `user_ids` left out.
+
+    """
+    parents: dict[UserId, UserId] = {}
+
+    def root(user_id: UserId) -> UserId:
+        parents.setdefault(user_id, user_id)
+        while parents[user_id] != user_id:
+            # Path halving keeps the trees shallow without recursion.
+            parents[user_id] = parents[parents[user_id]]
+            user_id = parents[user_id]
+        return user_id
+
+    ordered = list(dict.fromkeys(user_ids))
+    for user_id in ordered:
+        root(user_id)
+    for event in events:
+        for invitee in event.invitees:
+            parents[root(invitee.id)] = root(event.owner)
+
+    components: dict[UserId, list[UserId]] = {}
+    for user_id in ordered:
+        components.setdefault(root(user_id), []).append(user_id)
+    return list(components.values())
+
+
+def attendee_ids(event: CalendarEvent) -> list[UserId]:
+    """Get the owner and invitees of an event."""
+    return [event.owner, *(invitee.id for invitee in event.invitees)]
+
+
+def joint_window(date: datetime, users: Iterable[User]) -> TimeWindow:
+    """Get the window covering the local day of `date` of every user, whatever their timezone."""
+    days = [TimeWindow.for_day(date.astimezone(ZoneInfo(user.timezone))) for user in users]
+    return TimeWindow.between(min(day.start for day in days), max(day.end for day in days))
+
+
+class JointCompactionProblem:
+    """The same day of several users' calendars, where moving a shared event moves it for every attendee at once.
+
+    The objective is the one of `ScheduleObjective`, with the gaps of every planned user summed. Each planned
+    user's gaps only count inside their own local day. Users who are not planned only constrain the moves,
+    through their busy time and working hours.
+    """
+
+    def __init__(
+        self: Self,
+        date: datetime,
+        users: Iterable[User],
+        planned_user_ids: Collection[UserId],
+        events: Sequence[CalendarEvent],
+        availability: Availability,
+    ) -> None:
+        """Initialize the problem.
+
+        Args:
+            date: The day being compacted, in every planned user's own timezone.
+            users: Every user with a row in `availability`, in any order.
+            planned_user_ids: The users whose calendars are being compacted. Their own events are the movable ones.
+            events: The movable events.
+            availability: Every user's busy time and working hours over a window covering every planned user's
+                day, with the movable events left out.
+
+        """
+        users_by_id = {user.id: user for user in users}
+        self.window = availability.window
+        self.users = [users_by_id[user_id] for user_id in availability.user_ids]
+        self.events = list(events)
+        self.fixed_busy = availability.busy
+        self.planned_rows = availability.rows(planned_user_ids)
+        self.original_starts, self.original_ends = self.window.event_offsets(self.events)
+        self.durations = self.original_ends - self.original_starts
+
+        # Each planned user's gaps are measured inside their own local day only.
+        self.day_mask = np.ones_like(self.fixed_busy)
+        for row in self.planned_rows:
+            day = TimeWindow.for_day(date.astimezone(ZoneInfo(self.users[row].timezone)))
+            self.day_mask[row] = False
+            self.day_mask[row, self.window.offset(day.start) : self.window.offset(day.end)] = True
+
+        planned = set(self.planned_rows)
+        self.attendees = [availability.rows(dict.fromkeys(attendee_ids(event))) for event in self.events]
+        self.planned_attendees = [[row for row in rows if row in planned] for rows in self.attendees]
+        self.events_by_row: list[list[int]] = [[] for _ in self.users]
+        for i, rows in enumerate(self.attendees):
+            for row in rows:
+                self.events_by_row[row].append(i)
+
+        # A shared event has to stay on the same local day for every planned attendee.
+        self.allowed = np.zeros((len(self.events), self.window.minutes), dtype=np.bool_)
+        for i, event in enumerate(self.events):
+            self.allowed[i] = availability.free(attendee_ids(event)) & self.day_mask[self.planned_attendees[i]].all(axis=0)
+
+    @classmethod
+    def build(cls, date: datetime, planned: Sequence[tuple[User, Calendar]], others: Sequence[tuple[User, Calendar]]) -> Self:
+        """Build the problem for every planned user's local day containing `date`.
+
+        Args:
+            date: The day to compact.
+            planned: The users whose calendars are being compacted, with their calendars.
+            others: Every other attendee of their events, with their calendars.
+
+        """
+        movable: list[CalendarEvent] = []
+        for user, calendar in planned:
+            day = TimeWindow.for_day(date.astimezone(ZoneInfo(user.timezone)))
+            movable.extend(movable_events(day, user, calendar.get_events_between(day.start, day.end)))
+        users = [*planned, *others]
+        availability = Availability.build(
+            joint_window(date, [user for user, _ in planned]),
+            users,
+            ignored_event_ids={event.id for event in movable},
+        )
+        return cls(date, [user for user, _ in users], [user.id for user, _ in planned], movable, availability)
+
+    @property
+    def size(self: Self) -> int:
+        """The number of movable events."""
+        return len(self.events)
+
+    def row_busy(self: Self, starts: Offsets, row: int, skip: Collection[int] = ()) -> Bitmap:
+        """Get the minutes a user is busy when the movable events start at `starts`, leaving out the `skip` events."""
+        busy = self.fixed_busy[row].copy()
+        for i in self.events_by_row[row]:
+            if i not in skip:
+                busy[starts[i] : starts[i] + self.durations[i]] = True
+        return busy
+
+    def row_gaps(self: Self, starts: Offsets, rows: Sequence[int]) -> Offsets:
+        """Get the gap minutes of each of the given planned users' days."""
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+        busy = np.stack([self.row_busy(starts, row) for row in rows]) & self.day_mask[list(rows)]
+        return gap_minutes(busy)
+
+    def objective(self: Self, starts: Offsets) -> ScheduleObjective:
+        """Score the schedule where the movable events start at `starts`."""
+        return ScheduleObjective(
+            gap_minutes=int(self.row_gaps(starts, self.planned_rows).sum()),
+            moved_events=int((starts != self.original_starts).sum()),
+            start_minutes=int(starts.sum()),
+        )
+
+    def feasible_starts(self: Self, starts: Offsets, i: int) -> Offsets:
+        """Get every start of event `i` where every attendee is free and working, with the other events where they are."""
+        occupied = np.zeros(self.window.minutes, dtype=np.bool_)
+        for row in self.attendees[i]:
+            occupied |= self.row_busy(starts, row, skip=(i,))
+        return fitting_starts(self.allowed[i] & ~occupied, int(self.durations[i]))
+
+    def gap_changes(self: Self, starts: Offsets, i: int, candidates: Offsets) -> Offsets:
+        """Get how much the summed gaps change when event `i` moves to each candidate start.
+
+        Only the planned attendees of the event are affected, and for each of them only the first and last busy
+        minute of their day matter, since the event moves into free time.
+        """
+        duration = int(self.durations[i])
+        changes = np.zeros(candidates.size, dtype=np.int64)
+        for row in self.planned_attendees[i]:
+            busy = np.flatnonzero(self.row_busy(starts, row, skip=(i,)) & self.day_mask[row])
+            current = self.row_gaps(starts, [row])[0]
+            if busy.size == 0:
+                changes -= current
+                continue
+            span = np.maximum(busy[-1], candidates + duration - 1) - np.minimum(busy[0], candidates) + 1
+            changes += span - (busy.size + duration) - current
+        return changes
+
+    def improve(self: Self, starts: Offsets) -> Offsets:
+        """Sweep over the events, moving each to its best start while that improves the objective, until a sweep changes nothing.
+
+        Sweeping rather than picking the single best move of all events keeps each pass linear in the number of
+        events, which matters for groups of many users.
+        """
+        starts = starts.copy()
+        improved = True
+        while improved:
+            improved = False
+            for i in range(self.size):
+                candidates = self.feasible_starts(starts, i)
+                if candidates.size == 0:
+                    continue
+                moved = (candidates != self.original_starts[i]).astype(np.int64) - int(starts[i] != self.original_starts[i])
+                terms = np.column_stack((self.gap_changes(starts, i, candidates), moved, candidates - starts[i]))
+                # lexsort sorts by the last key first, so pass the terms in reverse order of priority.
+                j = int(np.lexsort(terms.T[::-1])[0])
+                if tuple(terms[j].tolist()) < (0, 0, 0):
+                    starts[i] = candidates[j]
+                    improved = True
+        return starts
+
+    def compact_each_user(self: Self) -> Offsets:
+        """Compact the planned users one after another, each around the moves of the users before them.
+
+        Gives a schedule without conflicts that already closes most gaps, for `improve` to start from.
+        """
+        starts = self.original_starts.copy()
+        for row in self.planned_rows:
+            user = self.users[row]
+            owned = [i for i, event in enumerate(self.events) if event.owner == user.id]
+            if not owned:
+                continue
+            allowed = self.allowed[owned].copy()
+            for column, i in enumerate(owned):
+                for attendee in self.attendees[i]:
+                    allowed[column] &= ~self.row_busy(starts, attendee, skip=owned)
+            fixed_busy = self.row_busy(starts, row, skip=owned) & self.day_mask[row]
+            problem = CompactionProblem(self.window, user, [self.events[i] for i in owned], fixed_busy, allowed)
+            starts[owned] = compact(problem, start=feasible_start(problem)).starts
+        return starts
+
+    def solve(self: Self) -> Offsets:
+        """Get the best schedule found from both the current schedule and the one compacting each user in turn."""
+        seeds = [self.improve(self.original_starts), self.improve(self.compact_each_user())]
+        return min(seeds, key=lambda starts: self.objective(starts).key())
+
+    def to_pending_rescheduled_events(self: Self, starts: Offsets) -> dict[UserId, list[PendingRescheduledEvent]]:
+        """Turn every moved event into a rescheduling proposal for its owner, keyed by owner."""
+        before, after = self.objective(self.original_starts), self.objective(starts)
+        timezones = {user.id: user.timezone for user in self.users}
+        proposals: dict[UserId, list[PendingRescheduledEvent]] = {self.users[row].id: [] for row in self.planned_rows}
+        for event, original, start in zip(self.events, self.original_starts.tolist(), starts.tolist(), strict=True):
+            if start == original:
+                continue
+            # Shift by whole minutes so seconds and the exact duration are preserved.
+            new_start_time = (event.start_time.astimezone(UTC) + timedelta(minutes=start - original)).astimezone(
+                ZoneInfo(timezones[event.owner]),
+            )
+            new_end_time = new_start_time + (event.end_time - event.start_time)
+            proposals[event.owner].append(
+                PendingRescheduledEvent(
+                    original_event=event,
+                    new_start_time=new_start_time,
+                    new_end_time=new_end_time,
+                    explanation=explain_move(event, new_start_time, new_end_time, before, after),
+                ),
+            )
+        return proposals
+
+
+def solve_jointly(
+    date: datetime,
+    planned: Sequence[tuple[User, Calendar]],
+    others: Sequence[tuple[User, Calendar]],
+) -> dict[UserId, list[PendingRescheduledEvent]]:
+    """Generate rescheduling proposals for several users at once, so proposals for shared events never conflict.
+
+    Args:
+        date: The day to compact.
+        planned: The users whose calendars are being compacted, with their calendars.
+        others: Every other attendee of their events, with their calendars.
+
+    Returns:
+        The proposals of every planned user, keyed by user.
+
+    """
+    problem = JointCompactionProblem.build(date, planned, others)
+    return problem.to_pending_rescheduled_events(problem.solve())
@@ -0,0 +1,123 @@
+from collections.abc import Sequence
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.planning.free_busy import Availability, Offsets, TimeWindow
+from src.planning.scoring import movable_events, proposal_offsets
+from src.planning.solver import CompactionProblem, compact
+from src.types.calendar import Calendar
+from src.types.rescheduled_event import (
+    AcceptedRescheduledEvent,
+    PendingRescheduledEvent,
+    RejectedRescheduledEvent,
+    RescheduledEvent,
+)
+from src.types.user import User
+
+
+def same_move(a: RescheduledEvent, b: RescheduledEvent) -> bool:
+    """Check whether two rescheduling proposals move the same event to the same time."""
+    return (a.original_event.id, a.new_start_time, a.new_end_time) == (b.original_event.id, b.new_start_time, b.new_end_time)
+
+
+def resolve_rescheduling_proposals(
+    proposals: Sequence[PendingRescheduledEvent],
+    rejected_rescheduling_proposals: Sequence[RejectedRescheduledEvent],
+) -> tuple[list[AcceptedRescheduledEvent], list[RejectedRescheduledEvent]]:
+    """Split a plan into the proposals every invitee accepted and the ones at least one invitee rejected.
+
+    Rejections only count against the exact move that was rejected, so rejections from earlier rounds do not
+    affect a replanned move of the same event. Proposals no invitee had to be asked about are accepted.
+    """
+    accepted: list[AcceptedRescheduledEvent] = []
+    rejected: list[RejectedRescheduledEvent] = []
+    for proposal in proposals:
+        if any(same_move(proposal, rejection) for rejection in rejected_rescheduling_proposals):
+            rejected.append(RejectedRescheduledEvent(**proposal.model_dump()))
+        else:
+            accepted.append(AcceptedRescheduledEvent(**proposal.model_dump()))
+    return accepted, rejected
+
+
+def replan_rejected_proposals(  # noqa: PLR0913 - The solver inputs plus both halves of the resolved plan
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    *,
+    accepted_rescheduling_proposals: Sequence[AcceptedRescheduledEvent],
+    rejected_rescheduling_proposals: Sequence[RejectedRescheduledEvent],
+    days: int = 1,
+    allow_cross_day_moves: bool = False,
+) -> list[PendingRescheduledEvent]:
+    """Find new times for the events whose moves were rejected, without touching anything else.
+
+    Accepted moves stay where the invitees accepted them, every other event stays where it is, and no event
+    can go back to a slot that was rejected for it.
+
+    Args:
+        date: The day being rescheduled, or the first of them.
+        user: The user whose calendar is being rescheduled.
+        users_calendar: The user's calendar, before any of the proposals are applied.
+        other_invitees: Each invitee with their calendar.
+        accepted_rescheduling_proposals: The moves to keep.
+        rejected_rescheduling_proposals: Every rejected move so far, including earlier rounds.
+        days: The number of days being rescheduled.
+        allow_cross_day_moves: Whether rejected events may move to another day of the horizon.
+
+    Returns:
+        A proposal for every rejected event that found a new time. Events without one stay where they are.
+
+    """
+    window = TimeWindow.for_days(date.astimezone(ZoneInfo(user.timezone)), days)
+    accepted_ids = {proposal.original_event.id for proposal in accepted_rescheduling_proposals}
+    rejected_ids = {proposal.original_event.id for proposal in rejected_rescheduling_proposals} - accepted_ids
+    users_events = users_calendar.get_events_between(window.start, window.end)
+    events = [event for event in movable_events(window, user, users_events) if event.id in rejected_ids]
+
+    availability = Availability.build(
+        window,
+        [(user, users_calendar), *other_invitees],
+        ignored_event_ids=accepted_ids | rejected_ids,
+    )
+    # Accepted moves are fixed at their new time, for the user and for everyone attending them.
+    starts, ends = proposal_offsets(window, accepted_rescheduling_proposals)
+    for proposal, start, end in zip(accepted_rescheduling_proposals, starts.tolist(), ends.tolist(), strict=True):
+        event = proposal.original_event
+        availability.busy[availability.rows([event.owner, *(invitee.id for invitee in event.invitees)]), start:end] = True
+
+    allowed = np.zeros((len(events), window.minutes), dtype=np.bool_)
+    day_index = window.day_index(user.timezone)
+    original_starts, original_ends = window.event_offsets(events)
+    starts, ends = proposal_offsets(window, rejected_rescheduling_proposals)
+    for row, event in enumerate(events):
+        attendees = availability.rows([event.owner, *(invitee.id for invitee in event.invitees)])
+        allowed[row] = (availability.working_hours[attendees] & ~availability.busy[attendees]).all(axis=0)
+        if not allow_cross_day_moves:
+            allowed[row] &= day_index == day_index[original_starts[row]]
+        # Staying put is always fine unless an accepted move has taken the slot, even outside working hours.
+        original = slice(original_starts[row], original_ends[row])
+        allowed[row, original] = ~availability.busy[attendees, original].any(axis=0)
+        for rejection, start, end in zip(rejected_rescheduling_proposals, starts.tolist(), ends.tolist(), strict=True):
+            if rejection.original_event.id == event.id:
+                allowed[row, start:end] = False
+
+    problem = CompactionProblem(window, user, events, availability.busy[availability.rows([user.id])[0]], allowed)
+    schedule = compact(problem, start=feasible_start(problem))
+    return problem.to_pending_rescheduled_events(schedule)
+
+
+def feasible_start(problem: CompactionProblem) -> Offsets:
+    """Get a schedule to start compacting from, moving events whose current slot has been taken by an accepted move.
+
+    Such events go to their nearest feasible start. Events with no feasible start at all are left where they
+    are, and the caller's validation drops whichever accepted move they conflict with.
+    """
+    starts = problem.original_starts.copy()
+    for i in range(problem.size):
+        feasible = problem.feasible_starts(i, problem.occupancy(starts, skip=i))
+        if feasible.size > 0 and starts[i] not in feasible:
+            starts[i] = feasible[np.argmin(np.abs(feasible - problem.original_starts[i]))]
+    return starts
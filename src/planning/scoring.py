@@ -0,0 +1,147 @@
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Self
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import numpy.typing as npt
+
+from src.planning.free_busy import MINUTE, Bitmap, Offsets, TimeWindow, busy_bitmap, fill_intervals, gap_minutes
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import RescheduledEvent
+from src.types.schedule_objective import ScheduleObjective
+from src.types.user import User
+
+# One row per candidate schedule with the terms of `ScheduleObjective`, in order of priority.
+ObjectiveTerms = npt.NDArray[np.int64]
+
+
+def movable_events(window: TimeWindow, user: User, events: Sequence[CalendarEvent]) -> list[CalendarEvent]:
+    """Get the events that may be rescheduled: the user's own events that fit entirely inside the window.
+
+    Events running past the user's local midnight are left alone, since every move has to stay inside a single day.
+    """
+    tz = ZoneInfo(user.timezone)
+    return [
+        event
+        for event in events
+        if event.owner == user.id
+        and window.start <= event.start_time < event.end_time <= window.end
+        and event.start_time.astimezone(tz).date() == (event.end_time - MINUTE).astimezone(tz).date()
+    ]
+
+
+def objectives(terms: ObjectiveTerms) -> list[ScheduleObjective]:
+    """Turn rows of objective terms into `ScheduleObjective`s."""
+    return [
+        ScheduleObjective(gap_minutes=gap, moved_events=moved, start_minutes=start_minutes)
+        for gap, moved, start_minutes in terms.tolist()
+    ]
+
+
+class DayScorer:
+    """A day's events reduced to minute offsets, so candidate schedules can be scored in bulk.
+
+    A candidate schedule gives a start (and optionally an end) offset to every movable event. Everything else on
+    the calendar only contributes to `fixed_busy`. The solver, the validator and the benchmarks all score
+    schedules here, so their objectives can be compared directly.
+
+    The window can also span several days, in which case the gaps of every day are summed.
+    """
+
+    def __init__(
+        self: Self,
+        window: TimeWindow,
+        events: Sequence[CalendarEvent],
+        fixed_busy: Bitmap,
+        day_starts: Offsets | None = None,
+    ) -> None:
+        """Initialize the scorer.
+
+        Args:
+            window: The day (or days) being scored.
+            events: The movable events.
+            fixed_busy: The minutes the user is busy with events that cannot be moved.
+            day_starts: The first slot of every day in the window. Defaults to a single day.
+
+        """
+        self.window = window
+        self.events = list(events)
+        self.fixed_busy = fixed_busy
+        self.day_starts = np.zeros(1, dtype=np.int64) if day_starts is None else day_starts
+        # The day of every slot, so events and candidate starts can be matched to their day.
+        self.day_index = np.searchsorted(self.day_starts, np.arange(window.minutes), side="right") - 1
+        self.original_starts, self.original_ends = window.event_offsets(self.events)
+        self._columns = {event.id: column for column, event in enumerate(self.events)}
+
+    @classmethod
+    def for_day(cls, date: datetime, user: User, users_calendar: Calendar, *, days: int = 1) -> Self:
+        """Build the scorer for the user's local day containing `date`, or for `days` days starting with it."""
+        window = TimeWindow.for_days(date.astimezone(ZoneInfo(user.timezone)), days)
+        users_events = users_calendar.get_events_between(window.start, window.end)
+        events = movable_events(window, user, users_events)
+        ids = {event.id for event in events}
+        fixed = [event for event in users_events if event.id not in ids]
+        return cls(window, events, busy_bitmap(fixed, window), window.day_starts(user.timezone))
+
+    @property
+    def size(self: Self) -> int:
+        """The number of movable events."""
+        return len(self.events)
+
+    def score(self: Self, starts: Offsets, ends: Offsets | None = None) -> ObjectiveTerms:
+        """Score candidate schedules in one pass.
+
+        Args:
+            starts: A (schedules x events) array of start offsets, or a single schedule.
+            ends: End offsets in the same shape as `starts`. Defaults to keeping every event's duration.
+
+        Returns:
+            A (schedules x 3) array of objective terms.
+
+        """
+        starts = np.atleast_2d(starts)
+        ends = starts + (self.original_ends - self.original_starts) if ends is None else np.atleast_2d(ends)
+        count = starts.shape[0]
+        rows = np.repeat(np.arange(count, dtype=np.int64), self.size)
+        busy = fill_intervals(rows, starts.ravel(), ends.ravel(), (count, self.window.minutes)) | self.fixed_busy
+        moved = (starts != self.original_starts).sum(axis=1)
+        return np.column_stack((gap_minutes(busy, self.day_starts), moved, starts.sum(axis=1))).astype(np.int64)
+
+    def gap_reduction_bound(self: Self) -> int:
+        """Get an upper bound on the gap minutes that moving the movable events could close, without solving anything.
+
+        However the events move, each day still spans at least its fixed events, and every minute of a movable event
+        fills at most one minute of that span. So the gaps between the fixed events, less the minutes of the
+        movable events, can never be closed.
+        """
+        current = int(self.score(self.original_starts)[0, 0])
+        fixed_gaps = int(gap_minutes(self.fixed_busy, self.day_starts)[0])
+        movable_minutes = int((self.original_ends - self.original_starts).sum())
+        return current - max(0, fixed_gaps - movable_minutes)
+
+    def schedules_for(self: Self, proposal_sets: Sequence[Sequence[RescheduledEvent]]) -> tuple[Offsets, Offsets]:
+        """Get the (schedules x events) start and end offsets after applying each set of proposals.
+
+        Proposals for events that are not movable on this day are ignored, the validator reports those.
+        """
+        starts = np.tile(self.original_starts, (len(proposal_sets), 1))
+        ends = np.tile(self.original_ends, (len(proposal_sets), 1))
+        for row, proposals in enumerate(proposal_sets):
+            known = [proposal for proposal in proposals if proposal.original_event.id in self._columns]
+            columns = [self._columns[proposal.original_event.id] for proposal in known]
+            starts[row, columns], ends[row, columns] = proposal_offsets(self.window, known)
+        return starts, ends
+
+    def score_rescheduled_events(self: Self, proposal_sets: Sequence[Sequence[RescheduledEvent]]) -> list[ScheduleObjective]:
+        """Score the schedule each set of proposals leads to."""
+        return objectives(self.score(*self.schedules_for(proposal_sets)))
+
+
+def proposal_offsets(window: TimeWindow, proposals: Sequence[RescheduledEvent]) -> tuple[Offsets, Offsets]:
+    """Get the slots each proposal's new time covers, rounded the same way as the events themselves."""
+    return window.interval_offsets(
+        [proposal.new_start_time for proposal in proposals],
+        [proposal.new_end_time for proposal in proposals],
+    )
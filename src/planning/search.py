@@ -0,0 +1,136 @@
+import time
+from collections.abc import Sequence
+from datetime import datetime
+
+import numpy as np
+
+from src.planning.free_busy import Bitmap, Offsets, intervals
+from src.planning.solver import CompactionProblem, Schedule, compact, improve, rescheduling_alternatives
+from src.types.calendar import Calendar
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.rescheduling_alternative import ReschedulingAlternative
+from src.types.schedule_objective import ScheduleObjective
+from src.types.user import User
+
+
+def placed_occupancy(problem: CompactionProblem, starts: Offsets, placed: Sequence[int]) -> Bitmap:
+    """Get the minutes the user is busy with the fixed events and the movable events placed so far."""
+    busy = problem.fixed_busy.copy()
+    for i in placed:
+        busy[starts[i] : starts[i] + problem.durations[i]] = True
+    return busy
+
+
+def candidate_slots(problem: CompactionProblem, i: int, feasible: Offsets, context: Bitmap) -> Offsets:
+    """Pick the feasible starts of event `i` worth branching on.
+
+    A compact schedule only ever puts an event where it already is, right after something else or right
+    before something else, so those starts (plus the earliest feasible one) are the only candidates.
+    """
+    if feasible.size == 0:
+        return feasible
+    runs = intervals(context)
+    wanted = np.concatenate(([problem.original_starts[i], feasible[0]], runs[:, 1], runs[:, 0] - problem.durations[i]))
+    return np.intersect1d(wanted, feasible)
+
+
+def beam_search(problem: CompactionProblem, width: int, deadline: float) -> tuple[Schedule | None, bool]:
+    """Place the movable events one at a time in order of their current start, keeping the `width` best partial schedules.
+
+    Partial schedules are scored as if the events not placed yet stayed where they are, which is exactly
+    the schedule that results if the search stops moving events at that point.
+
+    Returns:
+        The best complete schedule (or None if the deadline passed or every branch hit a dead end), and
+        whether the beam ever had to drop partial schedules. If it did not, a wider beam cannot do better.
+
+    """
+    order = np.argsort(problem.original_starts, kind="stable").tolist()
+    beam = problem.original_starts[np.newaxis, :].copy()
+    truncated = False
+
+    for depth, i in enumerate(order):
+        children: list[Offsets] = []
+        for starts in beam:
+            if time.monotonic() > deadline:
+                return None, truncated
+            feasible = problem.feasible_starts(i, placed_occupancy(problem, starts, order[:depth]))
+            for start in candidate_slots(problem, i, feasible, problem.occupancy(starts, skip=i)).tolist():
+                child = starts.copy()
+                child[i] = start
+                children.append(child)
+        if not children:
+            return None, truncated
+
+        candidates = np.unique(np.stack(children), axis=0)
+        terms = problem.score(candidates)
+        # lexsort sorts by the last key first, so pass the terms in reverse order of priority.
+        ranked = np.lexsort(terms.T[::-1])
+        truncated = truncated or ranked.size > width
+        beam = candidates[ranked[:width]]
+
+    best = improve(problem, beam[0], deadline=deadline)
+    return Schedule(starts=best.tolist(), objective=problem.objective(best)), truncated
+
+
+def search(
+    problem: CompactionProblem,
+    budget_seconds: float,
+    initial_width: int = 4,
+    visited: list[Offsets] | None = None,
+) -> Schedule:
+    """Search for a compact schedule until the wall-clock budget runs out.
+
+    Starts from the `compact` schedule, which also stops at the deadline, so a result is available however
+    small the budget. Then runs beam searches of doubling width and keeps the best schedule found. Stops early
+    once a beam search never had to drop a partial schedule, since a wider beam would explore the same schedules.
+
+    Args:
+        problem: The day to compact.
+        budget_seconds: How long to search for. Interactive runs want a fraction of a second, batch runs can
+            afford much more.
+        initial_width: The width of the first beam search.
+        visited: Collects the schedules `compact` passes through and every schedule the beam searches find, if given.
+
+    """
+    deadline = time.monotonic() + budget_seconds
+    best = compact(problem, visited=visited, deadline=deadline)
+    width = initial_width
+    while problem.size > 0 and time.monotonic() < deadline:
+        found, truncated = beam_search(problem, width, deadline)
+        if found is not None and visited is not None:
+            visited.append(np.asarray(found.starts, dtype=np.int64))
+        if found is not None and found.objective.key() < best.objective.key():
+            best = found
+        if not truncated:
+            break
+        width *= 2
+    return best
+
+
+def search_rescheduling_proposals(  # noqa: PLR0913 - The rescheduling inputs plus the budget and the horizon
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    budget_seconds: float,
+    *,
+    days: int = 1,
+    allow_cross_day_moves: bool = False,
+) -> tuple[list[PendingRescheduledEvent], ScheduleObjective, list[ReschedulingAlternative]]:
+    """Generate rescheduling proposals with an anytime search instead of an LLM.
+
+    Takes the same inputs as `solve_rescheduling_proposals` plus a wall-clock budget, and also returns the
+    objective of the schedule the proposals lead to and alternatives from the schedules the search went through.
+    """
+    problem = CompactionProblem.build(
+        date,
+        user,
+        users_calendar,
+        other_invitees,
+        days=days,
+        allow_cross_day_moves=allow_cross_day_moves,
+    )
+    visited: list[Offsets] = []
+    schedule = search(problem, budget_seconds, visited=visited)
+    return problem.to_pending_rescheduled_events(schedule), schedule.objective, rescheduling_alternatives(problem, visited)
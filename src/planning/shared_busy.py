@@ -0,0 +1,139 @@
+from collections.abc import Mapping, Sequence
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel, ConfigDict
+
+from src.planning.free_busy import Availability, TimeWindow, busy_counts, working_hours_matrix
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent
+from src.types.user import User, UserId
+
+# Counts are stored as 16-bit integers, which is plenty for overlapping events and keeps the block small.
+COUNT_DTYPE = np.uint16
+
+
+class SharedBusyCountsHandle(BaseModel):
+    """Everything another process needs to attach to a `SharedBusyCounts`. Small enough to send with every task."""
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    window: TimeWindow
+    user_ids: list[UserId]
+
+
+class SharedBusyCounts:
+    """How many events every user has in every minute of a window, as a dense (users x minutes) array in shared memory.
+
+    The process that publishes the counts reads every calendar once. Worker processes attach to the same memory
+    by name and read it in place, so adding workers does not add copies of the calendars or the bitmaps.
+
+    Counts are stored rather than busy flags so a problem can take its own movable events back out, which
+    assumes an event is on the calendar of every attendee it is taken out for.
+    """
+
+    def __init__(self: Self, handle: SharedBusyCountsHandle, shared_memory: SharedMemory, *, owner: bool) -> None:
+        """Wrap a shared memory block holding the counts described by `handle`.
+
+        Args:
+            handle: The name, window and rows of the block.
+            shared_memory: The block itself.
+            owner: Whether this process published the block and has to unlink it when done.
+
+        """
+        self.handle = handle
+        self._shared_memory = shared_memory
+        self._owner = owner
+        self._rows = {user_id: row for row, user_id in enumerate(handle.user_ids)}
+
+    @classmethod
+    def publish(cls, window: TimeWindow, calendars: Mapping[UserId, Calendar]) -> Self:
+        """Count the events of every calendar over the window into a new shared memory block.
+
+        Raises:
+            ValueError: If some minute has more overlapping events than the counts can hold.
+
+        """
+        counts = busy_counts(list(calendars.values()), window)
+        if counts.size > 0 and counts.max() > np.iinfo(COUNT_DTYPE).max:
+            msg = f"Some calendars have more than {np.iinfo(COUNT_DTYPE).max} overlapping events"
+            raise ValueError(msg)
+        # Shared memory blocks cannot be empty.
+        shared_memory = SharedMemory(create=True, size=max(1, counts.size * np.dtype(COUNT_DTYPE).itemsize))
+        shared = cls(
+            SharedBusyCountsHandle(name=shared_memory.name, window=window, user_ids=list(calendars)),
+            shared_memory,
+            owner=True,
+        )
+        shared.counts[:] = counts
+        return shared
+
+    @classmethod
+    def attach(cls, handle: SharedBusyCountsHandle) -> Self:
+        """Attach to counts published by another process, without copying them."""
+        # Only the publisher tracks the block, otherwise the first worker to exit would unlink it.
+        return cls(handle, SharedMemory(name=handle.name, track=False), owner=False)
+
+    @property
+    def counts(self: Self) -> npt.NDArray[np.uint16]:
+        """The (users x minutes) counts, as a view of the shared memory."""
+        shape = (len(self.handle.user_ids), self.handle.window.minutes)
+        return np.ndarray(shape, dtype=COUNT_DTYPE, buffer=self._shared_memory.buf)
+
+    def availability(
+        self: Self,
+        window: TimeWindow,
+        users: Sequence[User],
+        ignored_events: Sequence[tuple[CalendarEvent, Sequence[UserId]]] = (),
+    ) -> Availability:
+        """Get the availability of some users over part of the shared window.
+
+        Only the rows and minutes asked for are copied out of shared memory. Users without a row are left out,
+        and are treated as always available.
+
+        Args:
+            window: The window to get the availability for. Has to lie inside the shared window.
+            users: The users to get the availability of.
+            ignored_events: Events that do not make anyone busy, each with the users whose calendars they are on.
+
+        Raises:
+            ValueError: If the window is not inside the shared window.
+
+        """
+        offset = self.handle.window.offset(window.start)
+        if offset < 0 or offset + window.minutes > self.handle.window.minutes:
+            msg = f"Window starting at {window.start.isoformat()} is not inside the shared window"
+            raise ValueError(msg)
+
+        known = [user for user in users if user.id in self._rows]
+        counts = self.counts[[self._rows[user.id] for user in known], offset : offset + window.minutes].astype(np.int32)
+        rows = {user.id: row for row, user in enumerate(known)}
+        for event, holders in ignored_events:
+            starts, ends = window.event_offsets([event])
+            for holder in holders:
+                if holder in rows:
+                    counts[rows[holder], starts[0] : ends[0]] -= 1
+        return Availability(window, [user.id for user in known], counts > 0, working_hours_matrix(known, window))
+
+    def close(self: Self) -> None:
+        """Detach from the shared memory, and free it if this process published it."""
+        self._shared_memory.close()
+        if self._owner:
+            self._shared_memory.unlink()
+
+    def __enter__(self: Self) -> Self:
+        """Use the counts until the end of the `with` block."""
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the counts at the end of the `with` block."""
+        self.close()
@@ -0,0 +1,459 @@
+import time
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Self
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel
+
+from src.planning.free_busy import Availability, Bitmap, BitmapMatrix, Offsets, TimeWindow, fitting_starts, intervals
+from src.planning.scoring import DayScorer, movable_events, objectives
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.rescheduling_alternative import ReschedulingAlternative, ReschedulingAlternativeName
+from src.types.schedule_objective import ScheduleObjective
+from src.types.user import User
+from src.utilities.timestamp_formatting import format_time_human_friendly
+
+
+class Schedule(BaseModel):
+    """A start offset for every movable event of a `CompactionProblem`, and how good that is."""
+
+    starts: list[int]
+    objective: ScheduleObjective
+
+
+class CompactionProblem(DayScorer):
+    """One day (or several) of a user's calendar reduced to minute offsets and bitmaps.
+
+    Movable events are the user's own events that fit entirely inside a day of the window. Everything else on
+    the user's calendar is fixed and only contributes to `fixed_busy`. Events never move across midnight, and
+    only move to another day of the window when `allowed` lets them.
+    """
+
+    def __init__(
+        self: Self,
+        window: TimeWindow,
+        user: User,
+        events: Sequence[CalendarEvent],
+        fixed_busy: Bitmap,
+        allowed: BitmapMatrix,
+    ) -> None:
+        """Initialize the problem.
+
+        Args:
+            window: The day (or days) being compacted.
+            user: The user whose calendar is being compacted.
+            events: The movable events.
+            fixed_busy: The minutes the user is busy with events that cannot be moved.
+            allowed: One row per movable event, marking the minutes every attendee is free and working.
+
+        """
+        super().__init__(window, events, fixed_busy, window.day_starts(user.timezone))
+        self.user = user
+        self.allowed = allowed
+        self.durations = self.original_ends - self.original_starts
+        self.invitee_counts = np.array([len(event.invitees) for event in self.events], dtype=np.int64)
+
+    @classmethod
+    def build(  # noqa: PLR0913 - The rescheduling inputs plus the horizon
+        cls,
+        date: datetime,
+        user: User,
+        users_calendar: Calendar,
+        other_invitees: Sequence[tuple[User, Calendar]],
+        *,
+        days: int = 1,
+        allow_cross_day_moves: bool = False,
+    ) -> Self:
+        """Build the problem for the user's local day containing `date`, or for `days` days starting with it.
+
+        Every calendar is read once for the whole window. Unless `allow_cross_day_moves` is set, events can only
+        move within their own day.
+        """
+        window = TimeWindow.for_days(date.astimezone(ZoneInfo(user.timezone)), days)
+        movable = movable_events(window, user, users_calendar.get_events_between(window.start, window.end))
+        availability = Availability.build(
+            window,
+            [(user, users_calendar), *other_invitees],
+            ignored_event_ids={event.id for event in movable},
+        )
+        return cls.from_availability(user, movable, availability, allow_cross_day_moves=allow_cross_day_moves)
+
+    @classmethod
+    def from_availability(
+        cls,
+        user: User,
+        movable: Sequence[CalendarEvent],
+        availability: Availability,
+        *,
+        allow_cross_day_moves: bool = False,
+    ) -> Self:
+        """Build the problem from availability that is already known, e.g. read from a `SharedBusyCounts`.
+
+        Args:
+            user: The user whose calendar is being compacted.
+            movable: The events that may be rescheduled.
+            availability: The user and every attendee of the movable events over the problem's window, with the
+                movable events themselves left out.
+            allow_cross_day_moves: Whether events may move to another day of the window.
+
+        """
+        window = availability.window
+        day_index = window.day_index(user.timezone)
+        starts, _ = window.event_offsets(movable)
+        allowed = np.zeros((len(movable), window.minutes), dtype=np.bool_)
+        for row, event in enumerate(movable):
+            allowed[row] = availability.free([event.owner, *(invitee.id for invitee in event.invitees)])
+            if not allow_cross_day_moves:
+                allowed[row] &= day_index == day_index[starts[row]]
+        return cls(window, user, movable, availability.busy[availability.rows([user.id])[0]], allowed)
+
+    def occupancy(self: Self, starts: Offsets, skip: int | None = None) -> Bitmap:
+        """Get the minutes the user is busy when the movable events start at `starts`, optionally leaving one out."""
+        busy = self.fixed_busy.copy()
+        for i, (start, duration) in enumerate(zip(starts.tolist(), self.durations.tolist(), strict=True)):
+            if i != skip:
+                busy[start : start + duration] = True
+        return busy
+
+    def objective(self: Self, starts: Offsets) -> ScheduleObjective:
+        """Score the schedule where the movable events start at `starts`."""
+        return objectives(self.score(starts))[0]
+
+    def disrupted_invitees(self: Self, starts: Offsets) -> npt.NDArray[np.int64]:
+        """Get how many invitees have an event moved in each schedule, counting an invitee once per moved event."""
+        return ((np.atleast_2d(starts) != self.original_starts) * self.invitee_counts).sum(axis=1)
+
+    def feasible_starts(self: Self, i: int, occupied: Bitmap) -> Offsets:
+        """Get every start offset where event `i` fits without conflicts, inside every attendee's working hours.
+
+        Starts that would run the event past midnight are left out.
+        """
+        duration = int(self.durations[i])
+        starts = fitting_starts(self.allowed[i] & ~occupied, duration)
+        return starts[self.day_index[starts] == self.day_index[starts + duration - 1]]
+
+    def candidate_objectives(self: Self, starts: Offsets, i: int) -> tuple[Offsets, npt.NDArray[np.int64]]:
+        """Score every feasible start of event `i` with the other events left where they are.
+
+        Gives the same terms as `score`, but only has to look at the first and last busy minute of each day since
+        a single event moves into free time, which keeps each round of `improve` linear in the number of candidates.
+
+        Returns:
+            The candidate starts and a (candidates x 3) array of their objective terms.
+
+        """
+        occupied = self.occupancy(starts, skip=i)
+        candidates = self.feasible_starts(i, occupied)
+        duration = int(self.durations[i])
+        busy = np.flatnonzero(occupied)
+
+        # The busy minutes, first busy minute and last busy minute of every day. Days with nothing on them start
+        # out with a span that any candidate replaces, so they need no special case.
+        days = self.day_starts.size
+        busy_days = self.day_index[busy]
+        counts = np.bincount(busy_days, minlength=days)
+        first = np.full(days, self.window.minutes, dtype=np.int64)
+        last = np.full(days, -1, dtype=np.int64)
+        np.minimum.at(first, busy_days, busy)
+        np.maximum.at(last, busy_days, busy)
+        day_gaps = np.where(counts > 0, last - first + 1 - counts, 0)
+
+        # Only the day the event moves into changes.
+        day = self.day_index[candidates]
+        span = np.maximum(last[day], candidates + duration - 1) - np.minimum(first[day], candidates) + 1
+        gaps = day_gaps.sum() - day_gaps[day] + span - (counts[day] + duration)
+
+        others_moved = int((starts != self.original_starts).sum() - (starts[i] != self.original_starts[i]))
+        moved = others_moved + (candidates != self.original_starts[i])
+        start_minutes = int(starts.sum() - starts[i]) + candidates
+        return candidates, np.column_stack((gaps, moved, start_minutes)).astype(np.int64)
+
+    def to_pending_rescheduled_events(self: Self, schedule: Schedule) -> list[PendingRescheduledEvent]:
+        """Turn every moved event of the schedule into a rescheduling proposal."""
+        before = self.objective(self.original_starts)
+        proposals: list[PendingRescheduledEvent] = []
+        for event, original, start in zip(self.events, self.original_starts.tolist(), schedule.starts, strict=True):
+            if start == original:
+                continue
+            # Shift by whole minutes so seconds and the exact duration are preserved.
+            new_start_time = (event.start_time.astimezone(UTC) + timedelta(minutes=start - original)).astimezone(
+                ZoneInfo(self.user.timezone),
+            )
+            new_end_time = new_start_time + (event.end_time - event.start_time)
+            proposals.append(
+                PendingRescheduledEvent(
+                    original_event=event,
+                    new_start_time=new_start_time,
+                    new_end_time=new_end_time,
+                    explanation=explain_move(event, new_start_time, new_end_time, before, schedule.objective),
+                ),
+            )
+        return proposals
+
+
+def explain_move(
+    event: CalendarEvent,
+    new_start_time: datetime,
+    new_end_time: datetime,
+    before: ScheduleObjective,
+    after: ScheduleObjective,
+) -> str:
+    """Describe a solver move in the same voice as the LLM's explanations."""
+    return (
+        f"Moving {event.title} to {format_time_human_friendly(new_start_time)} - "
+        f"{format_time_human_friendly(new_end_time)}{new_end_time.strftime('%p')} keeps every attendee inside their "
+        f"working hours without conflicts, and cuts the unscheduled time between events from {before.gap_minutes} "
+        f"to {after.gap_minutes} minutes."
+    )
+
+
+def pack(problem: CompactionProblem, anchors: Offsets) -> Offsets | None:
+    """Place the movable events back to back, in their current order, from the first feasible start after their day's anchor.
+
+    Args:
+        problem: The problem to pack.
+        anchors: The slot to start packing from on every day of the window.
+
+    Returns:
+        The packed starts, or None if some event has no feasible start left after the events placed before it.
+
+    """
+    starts = problem.original_starts.copy()
+    occupied = problem.fixed_busy.copy()
+    cursor = 0
+    for i in np.argsort(problem.original_starts, kind="stable").tolist():
+        cursor = max(cursor, int(anchors[problem.day_index[problem.original_starts[i]]]))
+        candidates = problem.feasible_starts(i, occupied)
+        j = int(np.searchsorted(candidates, cursor))
+        if j == candidates.size:
+            return None
+        starts[i] = candidates[j]
+        cursor = int(starts[i] + problem.durations[i])
+        occupied[starts[i] : cursor] = True
+    return starts
+
+
+def best_packing(problem: CompactionProblem, start: Offsets, deadline: float | None = None) -> Offsets | None:
+    """Get the best back-to-back packing anchored at the starts and ends of the busy runs of the `start` schedule.
+
+    The anchor of every day is picked in turn, keeping the anchors already picked for earlier days, so a
+    horizon of several days costs one round of packings per day instead of one per combination of anchors.
+    Every packing is complete, so once the `time.monotonic()` deadline passes, if given, the best one so far
+    is returned.
+    """
+    busy = intervals(problem.occupancy(start))
+    candidates = np.unique(np.concatenate((start, busy.ravel())))
+    candidates = candidates[candidates < problem.window.minutes]
+    anchors = problem.day_starts.copy()
+    best: Offsets | None = None
+    for day in range(problem.day_starts.size):
+        packed: list[tuple[Offsets, int]] = []
+        for anchor in candidates[problem.day_index[candidates] == day].tolist():
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            trial = anchors.copy()
+            trial[day] = anchor
+            if (starts := pack(problem, trial)) is not None:
+                packed.append((starts, anchor))
+        if packed:
+            best, anchors[day] = min(packed, key=lambda packing: problem.objective(packing[0]).key())
+    return best
+
+
+def improve(
+    problem: CompactionProblem,
+    starts: Offsets,
+    visited: list[Offsets] | None = None,
+    deadline: float | None = None,
+) -> Offsets:
+    """Repeatedly make the single move that improves the objective the most, until no single move helps.
+
+    Each round scores every feasible start of every event in one vectorized pass per event.
+
+    Args:
+        problem: The day to compact.
+        starts: The schedule to start from.
+        visited: Collects the schedule after every move, if given. The early ones close most of the gaps
+            with only a few moves, which makes them good alternatives.
+        deadline: A `time.monotonic()` time to stop at, if given. Every move keeps the schedule feasible, so
+            stopping makes the best move found so far and returns.
+
+    """
+    starts = starts.copy()
+    current = problem.objective(starts).key()
+    out_of_time = False
+
+    while not out_of_time:
+        best: tuple[tuple[int, int, int], int, int] | None = None
+        for i in range(problem.size):
+            if deadline is not None and time.monotonic() > deadline:
+                out_of_time = True
+                break
+            candidates, terms = problem.candidate_objectives(starts, i)
+            if candidates.size == 0:
+                continue
+            # lexsort sorts by the last key first, so pass the terms in reverse order of priority.
+            j = int(np.lexsort(terms.T[::-1])[0])
+            key = (int(terms[j, 0]), int(terms[j, 1]), int(terms[j, 2]))
+            if key < current and (best is None or key < best[0]):
+                best = (key, i, int(candidates[j]))
+
+        if best is None:
+            break
+        current, i, start = best
+        starts[i] = start
+        if visited is not None:
+            visited.append(starts.copy())
+
+    return starts
+
+
+def compact(
+    problem: CompactionProblem,
+    start: Offsets | None = None,
+    visited: list[Offsets] | None = None,
+    deadline: float | None = None,
+) -> Schedule:
+    """Compact the day, starting from both the current schedule and the best back-to-back packing.
+
+    Single moves get stuck when closing a gap needs several events to move at once, so the best packed
+    schedule anchored at an event boundary is tried as a second starting point. Including the current schedule
+    means the result is never worse than leaving the day alone.
+
+    Args:
+        problem: The day to compact.
+        start: A feasible schedule to start from instead of the current one, for when some events can no
+            longer stay where they are.
+        visited: Collects every schedule the solve passes through, if given.
+        deadline: A `time.monotonic()` time to stop packing and improving the seeds at, if given.
+
+    """
+    start = problem.original_starts if start is None else start
+    seeds = [start]
+    if (packed := best_packing(problem, start, deadline)) is not None:
+        seeds.append(packed)
+
+    if visited is not None:
+        visited.extend(seeds)
+    best = min(
+        (improve(problem, seed, visited, deadline) for seed in seeds),
+        key=lambda starts: problem.objective(starts).key(),
+    )
+    return Schedule(starts=best.tolist(), objective=problem.objective(best))
+
+
+# How each alternative ranks schedules: its own criterion first, then the others to break ties. The criteria are
+# gap minutes, moved events and disrupted invitees.
+ALTERNATIVE_CRITERIA: dict[ReschedulingAlternativeName, tuple[int, int, int]] = {
+    "most_gap_saved": (0, 1, 2),
+    "fewest_moves": (1, 0, 2),
+    "least_invitee_disruption": (2, 0, 1),
+}
+
+
+def pareto_front(criteria: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+    """Mark the rows no other row dominates, i.e. is at least as good on every criterion and better on one (lower is better)."""
+    at_least_as_good = (criteria[np.newaxis, :, :] <= criteria[:, np.newaxis, :]).all(axis=2)
+    better = (criteria[np.newaxis, :, :] < criteria[:, np.newaxis, :]).any(axis=2)
+    return ~(at_least_as_good & better).any(axis=1)
+
+
+def rescheduling_alternatives(problem: CompactionProblem, schedules: Sequence[Offsets]) -> list[ReschedulingAlternative]:
+    """Pick the best schedule by each criterion from the Pareto front of the given schedules.
+
+    Schedules that close no gaps are left out, since the user can always keep the day as it is. A schedule
+    that is best by several criteria is only offered once, under the first of them.
+
+    Args:
+        problem: The day the schedules are for.
+        schedules: Every schedule worth offering, e.g. the ones `compact` passed through.
+
+    Returns:
+        At most one alternative per criterion, in the order of `ALTERNATIVE_CRITERIA`.
+
+    """
+    if not schedules:
+        return []
+    candidates = np.unique(np.stack(schedules), axis=0)
+    terms = problem.score(candidates)
+    criteria = np.column_stack((terms[:, 0], terms[:, 1], problem.disrupted_invitees(candidates)))
+    useful = criteria[:, 0] < problem.objective(problem.original_starts).gap_minutes
+    candidates, terms, criteria = candidates[useful], terms[useful], criteria[useful]
+    front = pareto_front(criteria)
+    candidates, terms, criteria = candidates[front], terms[front], criteria[front]
+    if candidates.size == 0:
+        return []
+
+    picked: dict[int, ReschedulingAlternativeName] = {}
+    for name, order in ALTERNATIVE_CRITERIA.items():
+        # lexsort sorts by the last key first, so pass the criteria in reverse order of priority.
+        picked.setdefault(int(np.lexsort(criteria[:, order].T[::-1])[0]), name)
+    alternatives: list[ReschedulingAlternative] = []
+    for row, name in picked.items():
+        schedule = Schedule(starts=candidates[row].tolist(), objective=objectives(terms[row : row + 1])[0])
+        alternatives.append(
+            ReschedulingAlternative(
+                name=name,
+                pending_rescheduling_proposals=problem.to_pending_rescheduled_events(schedule),
+                objective=schedule.objective,
+                disrupted_invitees=int(criteria[row, 2]),
+            ),
+        )
+    return alternatives
+
+
+def solve_rescheduling_proposals(  # noqa: PLR0913 - The rescheduling inputs plus the horizon
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    *,
+    days: int = 1,
+    allow_cross_day_moves: bool = False,
+) -> list[PendingRescheduledEvent]:
+    """Generate rescheduling proposals with the compaction solver instead of an LLM.
+
+    Has the same inputs and output as `generate_rescheduling_proposals`, without any network calls. With `days`
+    set, the whole horizon is compacted together from a single read of every calendar.
+    """
+    problem = CompactionProblem.build(
+        date,
+        user,
+        users_calendar,
+        other_invitees,
+        days=days,
+        allow_cross_day_moves=allow_cross_day_moves,
+    )
+    return problem.to_pending_rescheduled_events(compact(problem))
+
+
+def solve_rescheduling_alternatives(  # noqa: PLR0913 - The rescheduling inputs plus the horizon
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    *,
+    days: int = 1,
+    allow_cross_day_moves: bool = False,
+) -> tuple[list[PendingRescheduledEvent], list[ReschedulingAlternative]]:
+    """Generate rescheduling proposals with the compaction solver, plus alternatives to them from the same solve.
+
+    Takes the same inputs as `solve_rescheduling_proposals`. The alternatives come from the schedules the solver
+    passed through on its way to the proposals, so offering them costs no extra solving.
+    """
+    problem = CompactionProblem.build(
+        date,
+        user,
+        users_calendar,
+        other_invitees,
+        days=days,
+        allow_cross_day_moves=allow_cross_day_moves,
+    )
+    visited: list[Offsets] = []
+    schedule = compact(problem, visited=visited)
+    return problem.to_pending_rescheduled_events(schedule), rescheduling_alternatives(problem, visited)
@@ -0,0 +1,178 @@
+from collections.abc import Collection, Sequence
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.planning.free_busy import MINUTE, Availability, TimeWindow
+from src.planning.scoring import proposal_offsets
+from src.types.calendar import Calendar
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+from src.types.proposal_violation import ProposalViolation, ProposalViolationKind
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.user import User, UserId
+
+
+def violation_for(event: CalendarEvent, kind: ProposalViolationKind, message: str) -> ProposalViolation:
+    """Describe a violation of the event's proposal, starting with the event so the message stands on its own."""
+    return ProposalViolation(event_id=event.id, kind=kind, message=f"{event.title} (event ID {event.id!s}) {message}.")
+
+
+def day_violation(
+    proposal: PendingRescheduledEvent,
+    window: TimeWindow,
+    tz: ZoneInfo,
+    *,
+    allow_cross_day_moves: bool,
+) -> ProposalViolation | None:
+    """Check that a proposal stays on the event's own day, or on a single day of the window if moves across days are allowed."""
+    event = proposal.original_event
+    start, end = proposal.new_start_time.astimezone(tz), proposal.new_end_time.astimezone(tz)
+    if allow_cross_day_moves:
+        if window.start <= start and end <= window.end and start.date() == (end - MINUTE).date():
+            return None
+        first, last = window.start.astimezone(tz), (window.end - MINUTE).astimezone(tz)
+        return violation_for(
+            event,
+            "different_day",
+            f"must stay on a single day between {first.strftime('%Y-%m-%d')} and {last.strftime('%Y-%m-%d')}",
+        )
+
+    day = event.start_time.astimezone(tz)
+    if start.date() == day.date() and end <= TimeWindow.for_day(day).end:
+        return None
+    return violation_for(event, "different_day", f"must stay on {day.strftime('%Y-%m-%d')}")
+
+
+def validate_rescheduling_proposals(  # noqa: PLR0913 - The rescheduling inputs plus the proposals and the horizon
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    proposals: Sequence[PendingRescheduledEvent],
+    *,
+    days: int = 1,
+    allow_cross_day_moves: bool = False,
+    pending_event_ids: Collection[CalendarEventId] = (),
+) -> list[ProposalViolation]:
+    """Check rescheduling proposals against the rules the rescheduling agent is given.
+
+    Every proposal is checked against the user's unchanged events, the calendars of the event's attendees and
+    the proposals before it, so a set of proposals with no violations can be applied as a whole. Like the solver,
+    every attendee's working hours are enforced, for the attendees among the user and the invitees.
+
+    Args:
+        date: The day being rescheduled, or the first of them.
+        user: The user whose calendar is being rescheduled.
+        users_calendar: The user's calendar, before any of the proposals are applied.
+        other_invitees: Each invitee with their calendar.
+        proposals: The proposals to check.
+        days: The number of days being rescheduled.
+        allow_cross_day_moves: Whether events may move to another day of the horizon. Either way, events have
+            to start and end on the same day.
+        pending_event_ids: Events that may still get a proposal, e.g. while proposals are streamed in.
+            Conflicts with them are not reported, since they may still move out of the way.
+
+    Returns:
+        Every violation found, in the order of the proposals. Empty if the proposals are valid.
+
+    """
+    tz = ZoneInfo(user.timezone)
+    window = TimeWindow.for_days(date.astimezone(tz), days)
+    availability = Availability.build(
+        window,
+        [(user, users_calendar), *other_invitees],
+        ignored_event_ids={proposal.original_event.id for proposal in proposals} | set(pending_event_ids),
+    )
+    users_by_id: dict[UserId, User] = {user.id: user, **{invitee.id: invitee for invitee, _ in other_invitees}}
+    # Minutes already taken by earlier proposals, so two moved events cannot land on top of each other.
+    claimed = np.zeros(window.minutes, dtype=np.bool_)
+    seen: set[CalendarEventId] = set()
+    violations: list[ProposalViolation] = []
+
+    for proposal in proposals:
+        event = proposal.original_event
+
+        if event.owner != user.id:
+            violations.append(violation_for(event, "not_owned", f"is not owned by {user.given_name} and cannot be rescheduled"))
+            continue
+        if event.id in seen:
+            violations.append(violation_for(event, "duplicate", "has more than one rescheduling proposal"))
+            continue
+        seen.add(event.id)
+
+        if proposal.new_end_time - proposal.new_start_time != event.end_time - event.start_time:
+            proposed_minutes = (proposal.new_end_time - proposal.new_start_time) / MINUTE
+            violations.append(
+                violation_for(
+                    event,
+                    "duration_changed",
+                    f"must keep its original duration of {event.duration():g} minutes, not {proposed_minutes:g} minutes",
+                ),
+            )
+        if violation := day_violation(proposal, window, tz, allow_cross_day_moves=allow_cross_day_moves):
+            violations.append(violation)
+            continue
+
+        starts, ends = proposal_offsets(window, [proposal])
+        start, end = int(starts[0]), int(ends[0])
+        if start >= end:
+            continue
+
+        attendees = [user.id, event.owner, *(invitee.id for invitee in event.invitees)]
+        not_working = [
+            users_by_id[user_id]
+            for user_id, row in zip(availability.user_ids, availability.working_hours, strict=True)
+            if user_id in attendees and not row[start:end].all()
+        ]
+        if not_working:
+            hours = ", ".join(
+                f"{attendee.given_name} ({attendee.preffered_working_hours[0]}:00 - "
+                f"{attendee.preffered_working_hours[1]}:00 {attendee.timezone})"
+                for attendee in not_working
+            )
+            violations.append(violation_for(event, "outside_working_hours", f"must be within the working hours of {hours}"))
+
+        busy_attendees = [
+            users_by_id[user_id].given_name
+            for user_id, row in zip(availability.user_ids, availability.busy, strict=True)
+            if user_id in attendees and row[start:end].any()
+        ]
+        if busy_attendees:
+            names = ", ".join(busy_attendees)
+            violations.append(violation_for(event, "conflict", f"conflicts with other events on the calendars of {names}"))
+        if claimed[start:end].any():
+            violations.append(violation_for(event, "conflict", "conflicts with another rescheduled event"))
+        claimed[start:end] = True
+
+    return violations
+
+
+def drop_invalid_proposals(  # noqa: PLR0913 - The same inputs as `validate_rescheduling_proposals`
+    date: datetime,
+    user: User,
+    users_calendar: Calendar,
+    other_invitees: Sequence[tuple[User, Calendar]],
+    proposals: Sequence[PendingRescheduledEvent],
+    *,
+    days: int = 1,
+    allow_cross_day_moves: bool = False,
+) -> list[PendingRescheduledEvent]:
+    """Drop proposals with violations until the remaining proposals are valid together.
+
+    Dropping a proposal leaves its event at its original time, which can conflict with another proposal that
+    was valid before, so this repeats until nothing else is dropped.
+    """
+    remaining = list(proposals)
+    while violations := validate_rescheduling_proposals(
+        date,
+        user,
+        users_calendar,
+        other_invitees,
+        remaining,
+        days=days,
+        allow_cross_day_moves=allow_cross_day_moves,
+    ):
+        invalid = {violation.event_id for violation in violations}
+        remaining = [proposal for proposal in remaining if proposal.original_event.id not in invalid]
+    return remaining
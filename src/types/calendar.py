@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from datetime import datetime
-from typing import NewType, Self
+from typing import ClassVar, NewType, Self
 from uuid import UUID
 
 from src.types.calendar_event import CalendarEvent, CalendarEventId
@@ -11,6 +11,18 @@ from src.types.user import UserId
 CalendarId = NewType("CalendarId", UUID)
 
 
+class EventTimeChange(BrandedBaseModel):
+    event_id: CalendarEventId
+    new_start_time: datetime
+    new_end_time: datetime
+
+
+class EventTimeChangeResult(BrandedBaseModel):
+    event_id: CalendarEventId
+    success: bool
+    error: str | None = None
+
+
 class Calendar(BrandedBaseModel, ABC):
     id: CalendarId
     name: str
@@ -19,6 +31,16 @@ class Calendar(BrandedBaseModel, ABC):
     updated_at: datetime
     deleted_at: datetime | None = None
 
+    # Called with the id of every event whose time changes on any calendar, e.g. to drop results computed from
+    # its old time. Implementations of `change_event_time` and `change_event_times` MUST call
+    # `notify_event_time_changed` for every event they move.
+    event_time_change_listeners: ClassVar[list[Callable[[CalendarEventId], None]]] = []
+
+    def notify_event_time_changed(self: Self, event_id: CalendarEventId) -> None:
+        """Tell every listener that the time of an event has changed."""
+        for listener in self.event_time_change_listeners:
+            listener(event_id)
+
     @abstractmethod
     def get_events_on(self: Self, date: datetime) -> Sequence[CalendarEvent]:
         """Get all events on the given date.
@@ -31,6 +53,39 @@ class Calendar(BrandedBaseModel, ABC):
 
         """
 
+    @abstractmethod
+    def get_events_between(self: Self, start: datetime, end: datetime) -> Sequence[CalendarEvent]:
+        """Get all events overlapping the half-open interval [start, end).
+
+        Events that start before `start` or end after `end` are included as long as part of them falls
+        inside the window, e.g. an event running across midnight is returned for both days.
+
+        Args:
+            start: The inclusive start of the window.
+            end: The exclusive end of the window.
+
+        Returns:
+            A list of overlapping events, sorted by start time.
+
+        Raises:
+            ValueError: If `end` is before `start`.
+
+        """
+
     @abstractmethod
     async def change_event_time(self: Self, event_id: CalendarEventId, new_start_time: datetime, new_end_time: datetime) -> None:
         """Change the time of an event."""
+
+    @abstractmethod
+    async def change_event_times(self: Self, changes: Sequence[EventTimeChange]) -> list[EventTimeChangeResult]:
+        """Change the times of several events in a single call.
+
+        A change that cannot be applied does not prevent the others from being applied.
+
+        Args:
+            changes: The event time changes to apply.
+
+        Returns:
+            One result per change, in the same order, saying whether it was applied.
+
+        """
@@ -0,0 +1,17 @@
+from typing import Self
+
+from pydantic import Field
+
+from src.types.higher_order import BrandedBaseModel
+
+
+class PromptTokenUsage(BrandedBaseModel):
+    """How many prompt tokens the calls of one source sent, and how many of them the provider had cached."""
+
+    calls: int = Field(default=0, description="The number of model calls that reported their token usage.")
+    input_tokens: int = Field(default=0, description="The prompt tokens of every call, cached or not.")
+    cached_input_tokens: int = Field(default=0, description="The prompt tokens read from the provider's prompt cache.")
+
+    def cached_share(self: Self) -> float:
+        """Get the share of prompt tokens read from the cache, or 0 before any call."""
+        return self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
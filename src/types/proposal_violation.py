@@ -0,0 +1,22 @@
+from typing import Literal
+
+from pydantic import Field
+
+from src.types.calendar_event import CalendarEventId
+from src.types.higher_order import BrandedBaseModel
+
+ProposalViolationKind = Literal[
+    "unknown_event",
+    "not_owned",
+    "duplicate",
+    "duration_changed",
+    "different_day",
+    "outside_working_hours",
+    "conflict",
+]
+
+
+class ProposalViolation(BrandedBaseModel):
+    event_id: CalendarEventId = Field(description="The event whose rescheduling proposal breaks a rule.")
+    kind: ProposalViolationKind = Field(description="Which rule the proposal breaks.")
+    message: str = Field(description="A human readable description of the violation, suitable for re-prompting.")
@@ -11,7 +11,10 @@ class RescheduledEvent(BrandedBaseModel, ABC):
     original_event: CalendarEvent = Field(description="The event pending rescheduling.")
     new_start_time: datetime = Field(description="The new start time for the event.")
     new_end_time: datetime = Field(description="The new end time for the event.")
-    explanation: str = Field(description="A detailed explanation of the rescheduling proposal.")
+    explanation: str | None = Field(
+        default=None,
+        description="A detailed explanation of the rescheduling proposal. None until it is first asked for.",
+    )
 
 
 class PendingRescheduledEvent(RescheduledEvent):
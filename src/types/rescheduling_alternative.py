@@ -0,0 +1,18 @@
+from typing import Literal
+
+from pydantic import Field
+
+from src.types.higher_order import BrandedBaseModel
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.schedule_objective import ScheduleObjective
+
+ReschedulingAlternativeName = Literal["most_gap_saved", "fewest_moves", "least_invitee_disruption"]
+
+
+class ReschedulingAlternative(BrandedBaseModel):
+    """A plan the user can pick instead of the proposed one, the best of the solve by a single criterion."""
+
+    name: ReschedulingAlternativeName = Field(description="The criterion the plan is best by, used to pick it.")
+    pending_rescheduling_proposals: list[PendingRescheduledEvent]
+    objective: ScheduleObjective
+    disrupted_invitees: int = Field(description="The number of invitees with an event moved, counted once per moved event.")
@@ -2,15 +2,20 @@ from typing import Literal, NotRequired, TypedDict
 
 from pydantic import BaseModel, Field
 
+from src.graph.nodes.confirm_rescheduling_proposals.types import ConfirmReschedulingProposalsResponse
+from src.graph.nodes.estimate_rescheduling_gain.types import EstimateReschedulingGainResponse
+from src.graph.nodes.explain_rescheduling_proposals.types import ExplainReschedulingProposalsResponse
 from src.graph.nodes.get_rescheduling_proposals.types import GetReschedulingProposalsResponse
 from src.graph.nodes.load_calendar.types import LoadCalendarResponse
 from src.graph.nodes.load_invitees.types import LoadInviteesResponse
+from src.graph.nodes.replan_rescheduling_proposals.types import ReplanReschedulingProposalsResponse
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.types import (
     AnalyzeMessageResponse,
     InvokeSendReschedulingProposalResponse,
     ReceiveMessageResponse,
     SendMessageResponse,
 )
+from src.graph.nodes.update_calendar.types import UpdateCalendarResponse
 from src.types.loading import LoadingIndicator
 
 
@@ -58,11 +63,14 @@ GraphUpdate = (
     | dict[Literal["$.load_calendar"], LoadCalendarResponse]
     | dict[Literal["$.summarize_calendar"], None]
     | dict[Literal["$.load_invitees"], LoadInviteesResponse]
+    | dict[Literal["$.estimate_rescheduling_gain"], EstimateReschedulingGainResponse]
     | dict[Literal["$.before_rescheduling_proposals"], None]
     | dict[Literal["$.get_rescheduling_proposals"], GetReschedulingProposalsResponse]
-    | dict[Literal["$.confirm_rescheduling_proposals"], None]
+    | dict[Literal["$.explain_rescheduling_proposals"], ExplainReschedulingProposalsResponse]
+    | dict[Literal["$.confirm_rescheduling_proposals"], ConfirmReschedulingProposalsResponse]
     | dict[Literal["$.invoke_send_rescheduling_proposal_to_invitee"], InvokeSendReschedulingProposalResponse]
-    | dict[Literal["$.update_calendar"], None]
+    | dict[Literal["$.replan_rescheduling_proposals"], ReplanReschedulingProposalsResponse]
+    | dict[Literal["$.update_calendar"], UpdateCalendarResponse]
     | dict[Literal["$.load_calendar_after_update"], LoadCalendarResponse]
     | dict[Literal["$.conclusion"], None]
 )
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Self
+
+from pydantic import BaseModel
+
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.user import UserId
+
+
+class ReschedulingResultsStore(ABC, BaseModel):
+    @abstractmethod
+    def save(self: Self, user_id: UserId, date: datetime, proposals: Sequence[PendingRescheduledEvent]) -> None:
+        """Save the rescheduling proposals planned for a user's day, replacing any saved earlier.
+
+        Args:
+            user_id: The ID of the user the proposals are for.
+            date: The day the proposals are for.
+            proposals: The proposals. Empty if the day has nothing to gain.
+
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self: Self, user_id: UserId, date: datetime) -> list[PendingRescheduledEvent] | None:
+        """Get the rescheduling proposals planned for a user's day.
+
+        Args:
+            user_id: The ID of the user the proposals are for.
+            date: The day the proposals are for.
+
+        Returns:
+            The proposals, or None if the day has not been planned.
+
+        """
+        raise NotImplementedError
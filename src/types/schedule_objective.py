@@ -0,0 +1,17 @@
+from typing import Self
+
+from pydantic import Field
+
+from src.types.higher_order import BrandedBaseModel
+
+
+class ScheduleObjective(BrandedBaseModel):
+    """How good a day's schedule is, compared term by term in order of priority (lower is better)."""
+
+    gap_minutes: int = Field(description="Unscheduled minutes between the user's first and last event.")
+    moved_events: int = Field(description="The number of events moved away from their original time.")
+    start_minutes: int = Field(description="The sum of every event's start, in minutes after the start of the day.")
+
+    def key(self: Self) -> tuple[int, int, int]:
+        """Get the terms in order of priority, for comparing objectives."""
+        return (self.gap_minutes, self.moved_events, self.start_minutes)
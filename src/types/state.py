@@ -1,15 +1,25 @@
 from datetime import datetime
 
+from pydantic import Field
+
+from src.graph.nodes.estimate_rescheduling_gain.types import EstimateReschedulingGainResponse
 from src.graph.nodes.get_rescheduling_proposals.types import GetReschedulingProposalsResponse
 from src.graph.nodes.load_calendar.types import LoadCalendarResponse
 from src.graph.nodes.load_invitees.types import LoadInviteesResponse
 from src.graph.nodes.load_user.types import LoadUserResponse
+from src.graph.nodes.replan_rescheduling_proposals.types import ReplanReschedulingProposalsResponse
 from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.types import InvokeSendReschedulingProposalResponse
+from src.graph.nodes.update_calendar.types import UpdateCalendarResponse
 from src.types.higher_order import BrandedBaseModel
 
 
 class InitialState(BrandedBaseModel):
     date: datetime
+    days: int = Field(
+        default=1,
+        ge=1,  # Greater than or equal to 1
+        description="How many days to condense, starting with `date`. The whole range is planned together.",
+    )
 
 
 class StateWithUser(InitialState, LoadUserResponse):
@@ -24,9 +34,21 @@ class StateWithInvitees(StateWithCalendar, LoadInviteesResponse):
     pass
 
 
-class StateWithPendingReschedulingProposals(StateWithInvitees, GetReschedulingProposalsResponse):
+class StateWithReschedulingGain(StateWithInvitees, EstimateReschedulingGainResponse):
+    pass
+
+
+class StateWithPendingReschedulingProposals(StateWithReschedulingGain, GetReschedulingProposalsResponse):
     pass
 
 
 class StateAfterSendingReschedulingProposals(StateWithPendingReschedulingProposals, InvokeSendReschedulingProposalResponse):
     pass
+
+
+class StateAfterReplanning(StateAfterSendingReschedulingProposals, ReplanReschedulingProposalsResponse):
+    pass
+
+
+class StateAfterUpdatingCalendar(StateAfterSendingReschedulingProposals, UpdateCalendarResponse):
+    pass
@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Self
+
+
+class TTLCache[K, V]:
+    """A bounded in-memory cache that evicts the least recently used entry when full, and expires entries after a TTL.
+
+    Not thread-safe, which is fine for the event loop.
+    """
+
+    def __init__(self: Self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: The most entries to keep. 0 disables the cache.
+            ttl_seconds: How long an entry stays valid after it was set.
+            clock: Returns the current time in seconds, replaceable in tests.
+
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self: Self, key: K) -> V | None:
+        """Get the value of a key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self: Self, key: K, value: V) -> None:
+        """Set the value of a key, evicting the least recently used entry if the cache is full."""
+        if self.max_entries == 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self: Self, key: K) -> V | None:
+        """Remove a key, returning its value if it was there and had not expired."""
+        value = self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    def items(self: Self) -> Iterator[tuple[K, V]]:
+        """Iterate over the entries that have not expired, from least to most recently used."""
+        now = self._clock()
+        return ((key, value) for key, (expires_at, value) in list(self._entries.items()) if now < expires_at)
+
+    def __len__(self: Self) -> int:
+        """Get the number of entries, including expired ones that have not been evicted yet."""
+        return len(self._entries)
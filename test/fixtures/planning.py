@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.user.mock_user_provider import me
+from src.types.calendar import CalendarId
+from src.types.calendar_event import CalendarEvent, CalendarEventId, CalendarEventInvitee
+from src.types.user import User, UserId
+
+# Planning tests build their own events and calendars, since other tests move the shared mock events around.
+
+NEW_YORK = ZoneInfo(me.timezone)
+DATE = datetime(2025, 8, 11, tzinfo=NEW_YORK)
+
+
+def at(hour: int, minute: int = 0) -> datetime:
+    return DATE.replace(hour=hour, minute=minute)
+
+
+def make_event(
+    event_id: int,
+    start_time: datetime,
+    minutes: int = 60,
+    owner: UserId = me.id,
+    invitees: tuple[User, ...] = (),
+) -> CalendarEvent:
+    return CalendarEvent(
+        id=CalendarEventId(event_id),
+        title=f"Event {event_id}",
+        owner=owner,
+        invitees=[CalendarEventInvitee(id=invitee.id) for invitee in invitees],
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=minutes),
+        created_at=start_time,
+        updated_at=start_time,
+    )
+
+
+def make_calendar(owner: User, events: list[CalendarEvent]) -> MockCalendar:
+    return MockCalendar(
+        id=CalendarId(uuid4()),
+        name=f"{owner.given_name}'s Calendar",
+        owner=owner.id,
+        events=events,
+        created_at=DATE,
+        updated_at=DATE,
+    )
@@ -0,0 +1,83 @@
+"""Unit tests for writing the explanations of rescheduling proposals when they are first asked for."""
+
+from uuid import uuid4
+
+import pytest
+
+from src.agents import explanation
+from src.agents.explanation import (
+    EventExplanation,
+    ExplanationKey,
+    Explanations,
+    explain_rescheduling_proposals,
+    serialize_move,
+)
+from src.domains.user.mock_user_provider import adams_user, me
+from src.planning.scoring import DayScorer
+from src.planning.solver import solve_rescheduling_proposals
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.schedule_objective import ScheduleObjective
+from src.types.user import UserId
+from src.utilities.ttl_cache import TTLCache
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+@pytest.mark.asyncio
+async def test_explain_rescheduling_proposals_writes_missing_explanations_once(monkeypatch: pytest.MonkeyPatch):
+    """Test that only moves without an explanation are sent to the model, and that asking again hits the cache."""
+    calendar = make_calendar(me, [make_event(1, at(9)), make_event(2, at(12), invitees=(adams_user,)), make_event(3, at(15))])
+    solved = solve_rescheduling_proposals(DATE, me, calendar, [])
+    proposals = [solved[0].model_copy(update={"explanation": None}), solved[1]]
+    before, after = DayScorer.for_day(DATE, me, calendar).score_rescheduled_events([[], proposals])
+    prompts: list[str] = []
+
+    async def write_explanations(prompt_str: str) -> Explanations:
+        prompts.append(prompt_str)
+        return Explanations(events=[EventExplanation(event_id=proposals[0].original_event.id, explanation="Closer to lunch.")])
+
+    monkeypatch.setattr(explanation, "write_explanations", write_explanations)
+    monkeypatch.setattr(explanation, "explanation_cache", TTLCache[ExplanationKey, str](max_entries=16, ttl_seconds=60))
+
+    explained = await explain_rescheduling_proposals(me, proposals, before, after)
+    explained_again = await explain_rescheduling_proposals(me, proposals, before, after)
+
+    assert len(prompts) == 1
+    assert "Adam" in prompts[0]
+    assert proposals[1].original_event.title not in prompts[0]
+    assert [proposal.explanation for proposal in explained] == ["Closer to lunch.", solved[1].explanation]
+    assert explained_again == explained
+    assert [proposal.model_copy(update={"explanation": None}) for proposal in explained] == [
+        proposal.model_copy(update={"explanation": None}) for proposal in proposals
+    ]
+
+
+@pytest.mark.asyncio
+async def test_explain_rescheduling_proposals_writes_the_same_move_again_for_another_plan(monkeypatch: pytest.MonkeyPatch):
+    """Test that the same move in a plan that cuts a different amount of time is not explained with the old totals."""
+    event = make_event(1, at(15))
+    proposal = PendingRescheduledEvent(original_event=event, new_start_time=at(10), new_end_time=at(11))
+    before = ScheduleObjective(gap_minutes=300, moved_events=0, start_minutes=1440)
+    prompts: list[str] = []
+
+    async def write_explanations(prompt_str: str) -> Explanations:
+        prompts.append(prompt_str)
+        return Explanations(events=[EventExplanation(event_id=event.id, explanation=f"Explanation {len(prompts)}.")])
+
+    monkeypatch.setattr(explanation, "write_explanations", write_explanations)
+    monkeypatch.setattr(explanation, "explanation_cache", TTLCache[ExplanationKey, str](max_entries=16, ttl_seconds=60))
+
+    first = await explain_rescheduling_proposals(me, [proposal], before, before.model_copy(update={"gap_minutes": 0}))
+    replanned = await explain_rescheduling_proposals(me, [proposal], before, before.model_copy(update={"gap_minutes": 60}))
+
+    assert len(prompts) == 2
+    assert "from 300 to 60 minutes" in prompts[1]
+    assert [proposal.explanation for proposal in first + replanned] == ["Explanation 1.", "Explanation 2."]
+
+
+def test_serialize_move_names_unknown_invitees_by_their_id():
+    """Test that an invitee the user provider does not know is shown by ID, rather than failing the whole prompt."""
+    stranger = adams_user.model_copy(update={"id": UserId(uuid4())})
+    event = make_event(1, at(9), invitees=(adams_user, stranger))
+    proposal = PendingRescheduledEvent(original_event=event, new_start_time=at(10), new_end_time=at(11))
+
+    assert f"(invitees: {adams_user.given_name}, {stranger.id!s})" in serialize_move(proposal)
@@ -0,0 +1,63 @@
+"""Unit tests for the narration of the guide."""
+
+from datetime import timedelta
+
+import httpx
+import pytest
+from pydantic import SecretStr
+
+from src.agents import guide
+from src.agents.helpers.response_cache import CachedChatOpenAI, ResponseCache
+from src.config.main import config
+from src.domains.user.mock_user_provider import adams_user, me
+from src.graph.nodes.conclusion.main import conclusion
+from src.graph.nodes.introduction.main import introduction
+from src.types.state import StateWithReschedulingGain, StateWithUser
+from test.fixtures.planning import DATE, make_calendar
+
+
+@pytest.mark.asyncio
+async def test_fixed_narration_is_shared_by_every_user_and_date(monkeypatch: pytest.MonkeyPatch):
+    """Test that a second user on another day gets the narration of the steps that do not look at the calendar from the cache."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": "Welcome!"}, "finish_reason": "stop"},
+                ],
+            },
+        )
+
+    llm = CachedChatOpenAI(
+        response_cache=ResponseCache(max_entries=16, ttl_seconds=60),
+        model="gpt-4o-mini",
+        api_key=SecretStr("x"),
+        base_url="https://api.example.com/v1",
+        http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(guide, "unstructured_llm", llm)
+    monkeypatch.setattr(config, "include_llm_messages", True)
+
+    for user, date in ((me, DATE), (adams_user, DATE + timedelta(days=1))):
+        await introduction(StateWithUser(date=date, user=user))
+        await conclusion(
+            StateWithReschedulingGain(
+                date=date,
+                user=user,
+                calendar=make_calendar(user, []),
+                invitees=[],
+                invitee_calendars={},
+                achievable_gap_reduction_minutes=0,
+                nothing_to_do=True,
+            ),
+        )
+
+    assert len(requests) == 2
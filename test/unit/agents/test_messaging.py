@@ -0,0 +1,85 @@
+"""Unit tests for deciding whether invitees accepted rescheduling proposals."""
+
+from typing import Literal
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage
+
+from src.agents import messaging
+from src.agents.messaging import (
+    ReschedulingProposalResolution,
+    ReschedulingProposalResolutionOutput,
+    determine_rescheduling_proposal_resolution,
+    resolve_rescheduling_proposal,
+)
+from src.config.main import config
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent, RejectedRescheduledEvent
+from test.fixtures import planning
+
+
+class RecordingAgent:
+    """Stands in for a messaging model, recording its prompts and giving the same answer to each."""
+
+    def __init__(self, answer: AIMessage | ReschedulingProposalResolutionOutput) -> None:
+        """Initialize with the answer to give."""
+        self.answer = answer
+        self.prompts: list[str | list[BaseMessage]] = []
+
+    async def ainvoke(self, prompt: str | list[BaseMessage]) -> AIMessage | ReschedulingProposalResolutionOutput:
+        """Record the prompt and give the answer."""
+        self.prompts.append(prompt)
+        return self.answer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reasoning_mode", ["single_call", "two_call"])
+async def test_determine_rescheduling_proposal_resolution_skips_the_free_text_call_in_a_single_call(
+    monkeypatch: pytest.MonkeyPatch,
+    reasoning_mode: Literal["single_call", "two_call"],
+):
+    """Test that only the 'two_call' reasoning mode has the structured model format a free-text answer."""
+    event = planning.make_event(1, planning.at(9))
+    proposal = PendingRescheduledEvent(original_event=event, new_start_time=planning.at(10), new_end_time=planning.at(11))
+    reasoning = RecordingAgent(AIMessage(content="They said yes."))
+    formatting = RecordingAgent(
+        ReschedulingProposalResolutionOutput(resolution=ReschedulingProposalResolution.ACCEPTED, reason="They said yes."),
+    )
+    monkeypatch.setattr(config, "llm_reasoning_mode", reasoning_mode)
+    monkeypatch.setattr(messaging, "unstructured_llm", reasoning)
+    monkeypatch.setattr(messaging, "structured_llm", formatting)
+
+    resolution = await determine_rescheduling_proposal_resolution(proposal, "Can we move Event 1 to 10am?", "Sure!")
+
+    assert isinstance(resolution, AcceptedRescheduledEvent)
+    if reasoning_mode == "two_call":
+        assert len(reasoning.prompts) == 1
+        assert "Sure!" in str(reasoning.prompts[0])
+        assert formatting.prompts == ["They said yes."]
+    else:
+        assert reasoning.prompts == []
+        assert len(formatting.prompts) == 1
+        assert "Sure!" in str(formatting.prompts[0])
+
+
+@pytest.mark.asyncio
+async def test_resolve_rescheduling_proposal_only_asks_the_model_about_unclear_responses(monkeypatch: pytest.MonkeyPatch):
+    """Test that clear responses are resolved locally, and the others by the messaging agent."""
+    event = planning.make_event(1, planning.at(9))
+    proposal = PendingRescheduledEvent(original_event=event, new_start_time=planning.at(10), new_end_time=planning.at(11))
+    asked: list[str] = []
+
+    async def determine(
+        rescheduling_proposal: PendingRescheduledEvent,
+        _message: str,
+        response: str,
+    ) -> AcceptedRescheduledEvent:
+        asked.append(response)
+        return AcceptedRescheduledEvent(**rescheduling_proposal.model_dump())
+
+    monkeypatch.setattr(messaging, "determine_rescheduling_proposal_resolution", determine)
+
+    assert isinstance(await resolve_rescheduling_proposal(proposal, "Can we move it?", "Yes!"), AcceptedRescheduledEvent)
+    assert isinstance(await resolve_rescheduling_proposal(proposal, "Can we move it?", "\U0001f44e"), RejectedRescheduledEvent)
+    assert asked == []
+    assert isinstance(await resolve_rescheduling_proposal(proposal, "Can we move it?", "Only after 2?"), AcceptedRescheduledEvent)
+    assert asked == ["Only after 2?"]
@@ -0,0 +1,47 @@
+"""Unit tests for the shared clients of the models."""
+
+import httpx
+import pytest
+from langchain_openai import ChatOpenAI
+
+from src.agents.helpers.models import LLMClientRegistry, get_llm, llm_clients
+from src.callbacks.add_source_to_messages import AddSourceToMessagesCallback
+
+
+def sources(llm: ChatOpenAI) -> list[str]:
+    assert isinstance(llm.callbacks, list)
+    return [callback.source for callback in llm.callbacks if isinstance(callback, AddSourceToMessagesCallback)]
+
+
+def test_get_llm_shares_one_client_per_endpoint_and_keeps_each_source():
+    """Test that models of different sources share their HTTP clients, but each tags its own messages."""
+    guide, messaging = get_llm(source="guide.public"), get_llm(source="messaging.private", model="gpt-5")
+
+    assert guide.http_async_client is messaging.http_async_client
+    assert guide.http_client is messaging.http_client
+    assert guide.http_async_client is llm_clients.async_client(str(guide.openai_api_base))
+    assert sources(guide) == ["guide.public"]
+    assert sources(messaging) == ["messaging.private"]
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_connections_to_every_endpoint_in_use():
+    """Test that pre-warming sends the requested number of requests to each endpoint, and ignores failures."""
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        if request.url.host == "down.example.com":
+            msg = "Connection refused"
+            raise httpx.ConnectError(msg, request=request)
+        return httpx.Response(401)
+
+    registry = LLMClientRegistry(max_keepalive_connections=4, keepalive_seconds=60, transport=httpx.MockTransport(handler))
+    registry.async_client("https://api.example.com/v1")
+    registry.async_client("https://down.example.com/v1")
+    assert registry.async_client("https://api.example.com/v1") is registry.async_client("https://api.example.com/v1")
+
+    await registry.prewarm(connections=2)
+    await registry.aclose()
+
+    assert sorted(hosts) == ["api.example.com", "api.example.com", "down.example.com", "down.example.com"]
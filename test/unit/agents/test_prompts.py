@@ -0,0 +1,41 @@
+"""Unit tests for the static prefixes of the prompts."""
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from src.agents import explanation, guide, messaging, rescheduling
+from src.agents.helpers.prompts import cacheable_prompt
+from src.domains.user.mock_user_provider import adams_user, me, pauls_user, sallys_user
+
+
+def test_static_prefixes_do_not_mention_any_user():
+    """Test that no static prefix mentions a user, so every prefix is byte-identical across users and calls."""
+    prefixes = [
+        guide.STATIC_PREFIX,
+        rescheduling.STATIC_PREFIX,
+        rescheduling.FORMATTING_STATIC_PREFIX,
+        messaging.STATIC_PREFIX,
+        explanation.STATIC_PREFIX,
+    ]
+
+    for user in (me, adams_user, sallys_user, pauls_user):
+        for prefix in prefixes:
+            assert user.given_name not in prefix
+            assert str(user.id) not in prefix
+            assert user.timezone not in prefix
+
+
+def test_rescheduling_agent_localizes_times_in_both_reasoning_modes():
+    """Test that the rule to localize times is also sent in the 'single_call' mode, which skips the formatting call."""
+    rule = "- You MUST localize all times to the user's timezone.\n"
+
+    assert rule in rescheduling.STATIC_PREFIX
+    assert rule in rescheduling.FORMATTING_STATIC_PREFIX
+
+
+def test_cacheable_prompt_puts_the_static_prefix_first():
+    """Test that the static prefix is sent first, in a message of its own."""
+    prompt = cacheable_prompt("static", "dynamic")
+
+    assert isinstance(prompt[0], SystemMessage)
+    assert isinstance(prompt[1], HumanMessage)
+    assert [message.content for message in prompt] == ["static", "dynamic"]
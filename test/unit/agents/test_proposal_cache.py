@@ -0,0 +1,93 @@
+"""Unit tests for caching rescheduling proposals by the fingerprint of their inputs."""
+
+from pathlib import Path
+
+import pytest
+
+from src.agents.helpers.proposal_cache import ProposalCache, fingerprint_rescheduling_inputs
+from src.domains.user.mock_user_provider import adams_user, me
+from src.types.calendar_event import CalendarEventId
+from src.types.rescheduled_event import PendingRescheduledEvent
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+class Clock:
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+def test_fingerprint_only_changes_with_the_inputs():
+    """Test that the fingerprint is stable for equal inputs and changes with events, working hours and models."""
+    mine = make_event(1, at(9), invitees=(adams_user,))
+    adams = make_event(2, at(13), owner=adams_user.id)
+    other_invitees = [(adams_user, make_calendar(adams_user, [mine, adams]))]
+
+    fingerprint, event_ids = fingerprint_rescheduling_inputs(DATE, me, make_calendar(me, [mine]), other_invitees, ["m"])
+
+    assert event_ids == [mine.id, adams.id]
+    assert fingerprint == fingerprint_rescheduling_inputs(DATE, me, make_calendar(me, [mine]), other_invitees, ["m"])[0]
+    moved = make_event(1, at(10), invitees=(adams_user,))
+    assert fingerprint != fingerprint_rescheduling_inputs(DATE, me, make_calendar(me, [moved]), other_invitees, ["m"])[0]
+    early_bird = me.model_copy(update={"preffered_working_hours": (7, 15)})
+    assert fingerprint != fingerprint_rescheduling_inputs(DATE, early_bird, make_calendar(me, [mine]), other_invitees, ["m"])[0]
+    assert fingerprint != fingerprint_rescheduling_inputs(DATE, me, make_calendar(me, [mine]), other_invitees, ["n"])[0]
+
+
+def test_disk_tier_survives_a_new_cache_until_it_expires(tmp_path: Path):
+    """Test that proposals saved by one cache are read by another with the same directory, until the TTL passes."""
+    event = make_event(1, at(9))
+    proposals = [PendingRescheduledEvent(original_event=event, new_start_time=at(10), new_end_time=at(11), explanation="Test.")]
+    clock = Clock()
+    ProposalCache(max_entries=1, ttl_seconds=60, directory=tmp_path, clock=clock).set("key", [event.id], proposals)
+
+    cache = ProposalCache(max_entries=1, ttl_seconds=60, directory=tmp_path, clock=clock)
+    assert cache.get("key") == proposals
+    clock.now = 60
+    assert cache.get("key") is None
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
+
+
+def test_invalidate_event_drops_entries_in_both_tiers(tmp_path: Path):
+    """Test that only the entries generated from a changed event are dropped, from memory and from disk."""
+    first, second = make_event(1, at(9)), make_event(2, at(13))
+    cache = ProposalCache(max_entries=4, ttl_seconds=60, directory=tmp_path)
+    cache.set("first", [first.id], [])
+    cache.set("both", [first.id, second.id], [])
+    cache.set("second", [second.id], [])
+
+    cache.invalidate_event(first.id)
+
+    assert (cache.get("first"), cache.get("both"), cache.get("second")) == (None, None, [])
+    assert sorted(path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*") if path.is_file()) == [
+        "events/2/second",
+        "second.json",
+    ]
+
+
+def test_invalidate_event_does_not_read_the_entries_of_other_events(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that invalidating an event only reads its own entries, including ones another cache wrote to disk."""
+    ProposalCache(max_entries=0, ttl_seconds=60, directory=tmp_path).set("first", [CalendarEventId(1)], [])
+    for i in range(2, 10):
+        ProposalCache(max_entries=0, ttl_seconds=60, directory=tmp_path).set(f"other {i}", [CalendarEventId(i)], [])
+    read: list[str] = []
+    read_bytes = Path.read_bytes
+
+    def recording_read_bytes(path: Path) -> bytes:
+        read.append(path.name)
+        return read_bytes(path)
+
+    cache = ProposalCache(max_entries=4, ttl_seconds=60, directory=tmp_path)
+    assert cache.get("first") == []
+    monkeypatch.setattr(Path, "read_bytes", recording_read_bytes)
+
+    cache.invalidate_event(CalendarEventId(1))
+
+    assert read == ["first.json"]
+    assert cache.get("first") is None
+    assert not (tmp_path / "first.json").exists()
+    assert len(list(tmp_path.glob("*.json"))) == 8
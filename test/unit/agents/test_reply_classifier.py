@@ -0,0 +1,41 @@
+"""Unit tests for the local classifier of invitee replies."""
+
+from src.agents.helpers.reply_classifier import classify_reply
+from src.config.main import config
+from src.utilities.sentiment import NEGATIVE_RESPONSES, POSITIVE_RESPONSES
+
+
+def test_classify_reply_resolves_every_canned_reply():
+    """Test that every canned reply of the mock messaging platform is resolved correctly, and with confidence."""
+    for reply in POSITIVE_RESPONSES:
+        assert classify_reply(reply).accepted, reply
+        assert classify_reply(reply).confidence >= config.messaging_reply_classifier_min_confidence, reply
+    for reply in NEGATIVE_RESPONSES:
+        assert not classify_reply(reply).accepted, reply
+        assert classify_reply(reply).confidence >= config.messaging_reply_classifier_min_confidence, reply
+
+
+def test_classify_reply_reads_phrases_before_their_words():
+    """Test that phrases win over the words in them, and that emoji modifiers and curly apostrophes are ignored."""
+    assert classify_reply("No problem!").accepted
+    assert not classify_reply("No can do.").accepted
+    assert classify_reply("I\u2019m in \U0001f44d\U0001f3fd").confidence == 1
+    assert classify_reply("✔️ works").accepted
+    # Only a negation in the same clause turns a rejection around.
+    assert classify_reply("No, sorry.").confidence == 1
+
+
+def test_classify_reply_is_unsure_of_mixed_hedged_or_unknown_replies():
+    """Test that replies mixing meanings, negating a rejection, hedging or asking questions are left to the model."""
+    for reply in (
+        "Not sure yet.",
+        "Sure, but only if we keep it short.",
+        "Can we do 3pm instead?",
+        "Maybe later?",
+        "",
+        "I'm not busy",
+        "Not busy then.",
+        "No, I'm not busy then.",
+        "I'm not booked",
+    ):
+        assert classify_reply(reply).confidence < config.messaging_reply_classifier_min_confidence, reply
@@ -0,0 +1,373 @@
+"""Unit tests for applying rescheduling proposals to calendars."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta
+from typing import Literal, Self, override
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+from pydantic import Field
+
+from src.agents import rescheduling
+from src.agents.helpers.proposal_cache import ProposalCache
+from src.agents.rescheduling import apply_rescheduling_proposals, generate_rescheduling_proposals
+from src.config.main import config
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.user.mock_user_provider import (
+    adams_user,
+    adams_user_id,
+    me,
+    my_user_id,
+    pauls_user_id,
+    sallys_user,
+    sallys_user_id,
+)
+from src.planning.validation import validate_rescheduling_proposals
+from src.types.calendar import Calendar, CalendarId, EventTimeChange, EventTimeChangeResult
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+from src.types.proposal_violation import ProposalViolation
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent
+from src.types.user import UserId
+from test.fixtures import planning
+
+
+class ConcurrencyTracker:
+    def __init__(self) -> None:
+        """Initialize the tracker with nothing in flight."""
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+tracker = ConcurrencyTracker()
+
+
+class SlowCalendar(MockCalendar):
+    """A MockCalendar whose batch writes take a while, recording the size of each batch."""
+
+    batch_sizes: list[int] = Field(default_factory=list)
+
+    @override
+    async def change_event_times(self: Self, changes: Sequence[EventTimeChange]) -> list[EventTimeChangeResult]:
+        self.batch_sizes.append(len(changes))
+        tracker.in_flight += 1
+        tracker.max_in_flight = max(tracker.max_in_flight, tracker.in_flight)
+        await asyncio.sleep(0.01)
+        tracker.in_flight -= 1
+        return await super().change_event_times(changes)
+
+
+class BrokenCalendar(MockCalendar):
+    @override
+    async def change_event_times(self: Self, changes: Sequence[EventTimeChange]) -> list[EventTimeChangeResult]:
+        msg = "Provider unavailable"
+        raise ConnectionError(msg)
+
+
+class ShortCalendar(MockCalendar):
+    """A MockCalendar whose batch writes drop the result of the last change."""
+
+    @override
+    async def change_event_times(self: Self, changes: Sequence[EventTimeChange]) -> list[EventTimeChangeResult]:
+        return (await super().change_event_times(changes))[:-1]
+
+
+def make_calendar(calendar_type: type[MockCalendar], owner: UserId) -> MockCalendar:
+    return calendar_type(
+        id=CalendarId(uuid4()),
+        name="Test Calendar",
+        owner=owner,
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+
+
+def make_proposal(calendar: MockCalendar, event_id: int) -> AcceptedRescheduledEvent:
+    start_time = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)) + timedelta(hours=event_id % 8)
+    event = CalendarEvent(
+        id=CalendarEventId(event_id),
+        title=f"Event {event_id}",
+        owner=calendar.owner,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=1),
+        created_at=start_time,
+        updated_at=start_time,
+    )
+    calendar.add_event(event)
+    return AcceptedRescheduledEvent(
+        original_event=event.model_copy(),
+        new_start_time=start_time + timedelta(minutes=30),
+        new_end_time=start_time + timedelta(minutes=90),
+        explanation="Test Explanation",
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_tracker() -> None:
+    tracker.in_flight = 0
+    tracker.max_in_flight = 0
+
+
+@pytest.fixture(autouse=True)
+def empty_proposal_cache(monkeypatch: pytest.MonkeyPatch) -> ProposalCache:
+    """Give every test its own proposal cache, since several tests generate proposals from the same inputs."""
+    cache = ProposalCache(max_entries=16, ttl_seconds=60)
+    monkeypatch.setattr(rescheduling, "proposal_cache", cache)
+    monkeypatch.setattr(Calendar, "event_time_change_listeners", [cache.invalidate_event])
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_apply_rescheduling_proposals_batches_per_calendar():
+    """Test that each calendar receives a single batched write."""
+    calendar = make_calendar(SlowCalendar, my_user_id)
+    proposals = [make_proposal(calendar, event_id) for event_id in range(2000, 2003)]
+
+    results = await apply_rescheduling_proposals(proposals, {my_user_id: calendar})
+
+    assert isinstance(calendar, SlowCalendar)
+    assert calendar.batch_sizes == [3]
+    assert [result.success for result in results] == [True, True, True]
+    assert [event.start_time for event in calendar.get_events_on(proposals[0].new_start_time)] == [
+        proposal.new_start_time for proposal in proposals
+    ]
+
+
+@pytest.mark.asyncio
+async def test_apply_rescheduling_proposals_bounds_concurrency():
+    """Test that no more than max_concurrency calendars are written at once."""
+    owners = [my_user_id, adams_user_id, sallys_user_id, pauls_user_id]
+    calendars = {owner: make_calendar(SlowCalendar, owner) for owner in owners}
+    proposals = [make_proposal(calendars[owner], 2100 + i) for i, owner in enumerate(owners)]
+
+    results = await apply_rescheduling_proposals(proposals, calendars, max_concurrency=2)
+
+    assert all(result.success for result in results)
+    assert tracker.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_apply_rescheduling_proposals_reports_failures_per_event():
+    """Test that failures are reported per event, in proposal order, without stopping other writes."""
+    working_calendar = make_calendar(MockCalendar, my_user_id)
+    broken_calendar = make_calendar(BrokenCalendar, adams_user_id)
+    missing_owner_calendar = make_calendar(MockCalendar, sallys_user_id)
+    proposals = [
+        make_proposal(broken_calendar, 2200),
+        make_proposal(working_calendar, 2201),
+        make_proposal(missing_owner_calendar, 2202),
+    ]
+
+    results = await apply_rescheduling_proposals(
+        proposals,
+        {my_user_id: working_calendar, adams_user_id: broken_calendar},
+    )
+
+    assert [result.event_id for result in results] == [CalendarEventId(2200), CalendarEventId(2201), CalendarEventId(2202)]
+    assert [result.success for result in results] == [False, True, False]
+    assert results[0].error == "Provider unavailable"
+    assert results[2].error == f"No calendar found for owner {sallys_user_id}"
+
+
+@pytest.mark.asyncio
+async def test_apply_rescheduling_proposals_fails_the_events_of_a_calendar_with_missing_results():
+    """Test that a calendar returning too few results fails its own events, without stopping other writes."""
+    working_calendar = make_calendar(MockCalendar, my_user_id)
+    short_calendar = make_calendar(ShortCalendar, adams_user_id)
+    proposals = [
+        make_proposal(short_calendar, 2300),
+        make_proposal(working_calendar, 2301),
+        make_proposal(short_calendar, 2302),
+    ]
+
+    results = await apply_rescheduling_proposals(
+        proposals,
+        {my_user_id: working_calendar, adams_user_id: short_calendar},
+    )
+
+    assert [result.event_id for result in results] == [CalendarEventId(2300), CalendarEventId(2301), CalendarEventId(2302)]
+    assert [result.success for result in results] == [False, True, False]
+    assert results[0].error == f"Expected 2 results from the calendar of {adams_user_id}, got 1"
+
+
+class ScriptedAgent:
+    """Stands in for the rescheduling agent, returning one scripted response per call and recording the prompts."""
+
+    def __init__(self, responses: list[list[PendingRescheduledEvent]]) -> None:
+        """Initialize with the responses to return, in order."""
+        self.responses = responses
+        self.prompts: list[str] = []
+
+    async def __call__(self, prompt_str: str, *_: object) -> tuple[list[PendingRescheduledEvent], list[ProposalViolation]]:
+        """Return the next scripted response."""
+        self.prompts.append(prompt_str)
+        return self.responses[len(self.prompts) - 1], []
+
+
+def make_pending_proposal(event: CalendarEvent, start_time: datetime) -> PendingRescheduledEvent:
+    return PendingRescheduledEvent(
+        original_event=event,
+        new_start_time=start_time,
+        new_end_time=start_time + (event.end_time - event.start_time),
+        explanation="Test Explanation",
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_rescheduling_proposals_repairs_invalid_proposals(monkeypatch: pytest.MonkeyPatch):
+    """Test that violations are sent back to the agent, and a corrected response is returned."""
+    first, second = planning.make_event(1, planning.at(9)), planning.make_event(2, planning.at(13))
+    calendar = planning.make_calendar(me, [first, second])
+    invalid = [make_pending_proposal(second, planning.at(9, 30))]
+    valid = [make_pending_proposal(second, planning.at(10))]
+    agent = ScriptedAgent([invalid, valid])
+    monkeypatch.setattr(rescheduling, "propose_rescheduled_events", agent)
+
+    proposals = await generate_rescheduling_proposals(planning.DATE, me, calendar, [])
+
+    assert proposals == valid
+    assert len(agent.prompts) == 2
+    assert "conflicts with other events" not in agent.prompts[0]
+    assert "conflicts with other events" in agent.prompts[1]
+
+
+@pytest.mark.asyncio
+async def test_generate_rescheduling_proposals_drops_invalid_proposals(monkeypatch: pytest.MonkeyPatch):
+    """Test that the agent is re-prompted a bounded number of times, then only valid proposals are kept."""
+    first, second = planning.make_event(1, planning.at(9)), planning.make_event(2, planning.at(13))
+    calendar = planning.make_calendar(me, [first, second])
+    response = [make_pending_proposal(first, planning.at(18)), make_pending_proposal(second, planning.at(10))]
+    agent = ScriptedAgent([response] * (config.rescheduling_max_repair_attempts + 1))
+    monkeypatch.setattr(rescheduling, "propose_rescheduled_events", agent)
+
+    proposals = await generate_rescheduling_proposals(planning.DATE, me, calendar, [])
+
+    assert proposals == [response[1]]
+    assert len(agent.prompts) == config.rescheduling_max_repair_attempts + 1
+
+
+@pytest.mark.asyncio
+async def test_generate_rescheduling_proposals_reuses_proposals_until_an_event_moves(monkeypatch: pytest.MonkeyPatch):
+    """Test that unchanged inputs are answered from the cache, and only actually moving an input event asks again."""
+    first, second = planning.make_event(1, planning.at(9)), planning.make_event(2, planning.at(13))
+    calendar = planning.make_calendar(me, [first, second])
+    response = [make_pending_proposal(second, planning.at(10))]
+    agent = ScriptedAgent([response, []])
+    monkeypatch.setattr(rescheduling, "propose_rescheduled_events", agent)
+
+    assert await generate_rescheduling_proposals(planning.DATE, me, calendar, []) == response
+    assert await generate_rescheduling_proposals(planning.DATE, me, calendar, []) == response
+    assert len(agent.prompts) == 1
+
+    # Writing an event back to the times it already has, as the demo graph does on every run, moves nothing.
+    await calendar.change_event_time(second.id, second.start_time, second.end_time)
+    assert await generate_rescheduling_proposals(planning.DATE, me, calendar, []) == response
+    assert len(agent.prompts) == 1
+
+    await calendar.change_event_time(second.id, planning.at(10), planning.at(11))
+    assert await generate_rescheduling_proposals(planning.DATE, me, calendar, []) == []
+    assert len(agent.prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_rescheduling_proposals_tells_the_agent_everyones_working_hours(monkeypatch: pytest.MonkeyPatch):
+    """Test that the prompt gives the user's own working hours, and each invitee's in the user's timezone."""
+    early_bird = me.model_copy(update={"preffered_working_hours": (7, 15)})
+    meeting = planning.make_event(1, planning.at(9), invitees=(sallys_user,))
+    agent = ScriptedAgent([[]])
+    monkeypatch.setattr(rescheduling, "propose_rescheduled_events", agent)
+
+    await generate_rescheduling_proposals(
+        planning.DATE,
+        early_bird,
+        planning.make_calendar(early_bird, [meeting]),
+        [(sallys_user, planning.make_calendar(sallys_user, [meeting]))],
+    )
+
+    assert "- The user's work hours are from 07:00 to 15:00 in their local timezone.\n" in agent.prompts[0]
+    # Sally works from 11:00 to 19:00 in Los Angeles.
+    assert f"{sallys_user.given_name} works from 14:00 to 22:00.\n" in agent.prompts[0]
+
+
+class StreamingAgent:
+    """Stands in for both rescheduling models, streaming a scripted JSON response in small chunks."""
+
+    def __init__(self, response: str) -> None:
+        """Initialize with the JSON text to stream."""
+        self.chunks = [response[i : i + 8] for i in range(0, len(response), 8)]
+        self.streamed = 0
+        self.closed = False
+        self.invoked = False
+
+    async def ainvoke(self, _prompt: object) -> AIMessage:
+        """Return the reasoning of the first call, which is not used by the stream."""
+        self.invoked = True
+        return AIMessage(content="Move Event 2 to 10am.")
+
+    async def astream(self, _prompt: object) -> AsyncIterator[AIMessageChunk]:
+        """Stream the response, recording how much of it was read."""
+        try:
+            for chunk in self.chunks:
+                self.streamed += 1
+                yield AIMessageChunk(content=chunk)
+        finally:
+            self.closed = True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reasoning_mode", ["single_call", "two_call"])
+async def test_propose_rescheduled_events_stops_streaming_at_the_first_hard_violation(
+    monkeypatch: pytest.MonkeyPatch,
+    reasoning_mode: Literal["single_call", "two_call"],
+):
+    """Test that a proposal conflicting with an invitee's own event stops the response before the rest is read.
+
+    Only the 'two_call' reasoning mode asks for a free-text answer before the streamed one.
+    """
+    first = planning.make_event(1, planning.at(9))
+    second = planning.make_event(2, planning.at(13), invitees=(adams_user,))
+    third = planning.make_event(3, planning.at(15))
+    calendar = planning.make_calendar(me, [first, second, third])
+    adams_calendar = planning.make_calendar(adams_user, [second, planning.make_event(4, planning.at(10), owner=adams_user.id)])
+    moves = [(second, planning.at(10)), (third, planning.at(11)), (first, planning.at(12))]
+    agent = StreamingAgent(
+        json.dumps(
+            {
+                "events": [
+                    {
+                        "event_id": event.id,
+                        "new_start_time": start.isoformat(),
+                        "new_end_time": (start + timedelta(hours=1)).isoformat(),
+                    }
+                    for event, start in moves
+                ],
+            },
+        ),
+    )
+    monkeypatch.setattr(config, "llm_reasoning_mode", reasoning_mode)
+    monkeypatch.setattr(rescheduling, "unstructured_llm", agent)
+    monkeypatch.setattr(rescheduling, "streaming_structured_llm", agent)
+    monkeypatch.setattr(rescheduling, "single_call_structured_llm", agent)
+
+    proposals, violations = await rescheduling.propose_rescheduled_events(
+        "prompt",
+        "context",
+        [first, second, third],
+        lambda proposals, pending_event_ids: validate_rescheduling_proposals(
+            planning.DATE,
+            me,
+            calendar,
+            [(adams_user, adams_calendar)],
+            proposals,
+            pending_event_ids=pending_event_ids,
+        ),
+    )
+
+    assert [proposal.original_event.id for proposal in proposals] == [second.id]
+    assert [violation.kind for violation in violations] == ["conflict"]
+    assert agent.closed
+    assert agent.streamed < len(agent.chunks)
+    assert agent.invoked == (reasoning_mode == "two_call")
@@ -0,0 +1,82 @@
+"""Unit tests for the cache of model responses."""
+
+import json
+from pathlib import Path
+from typing import cast
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
+from pydantic import SecretStr
+
+from src.agents.helpers.response_cache import CachedChatOpenAI, ResponseCache, response_key
+from src.callbacks.add_source_to_messages import AddSourceToMessagesCallback
+
+
+def test_response_cache_keeps_responses_on_disk_until_they_expire(tmp_path: Path):
+    """Test that responses are shared through the disk tier, and dropped from both tiers once expired."""
+    now = 1000.0
+    path = tmp_path / "responses.sqlite3"
+    writer = ResponseCache(max_entries=16, ttl_seconds=60, path=path, clock=lambda: now)
+    reader = ResponseCache(max_entries=16, ttl_seconds=60, path=path, clock=lambda: now)
+
+    writer.set("key", "Hello **Adam**!")
+
+    assert reader.get("key") == "Hello **Adam**!"
+    assert reader.get("missing") is None
+    now += 60
+    assert writer.get("key") is None
+    assert reader.get("key") is None
+
+
+def test_response_key_ignores_layout_but_not_content():
+    """Test that prompts differing only in whitespace share a key, unlike other models or other prompts."""
+    prompt = [SystemMessage(content="RULES:\n- Be brief.\n"), HumanMessage(content="- You are speaking with Adam.\n")]
+    relaid = [SystemMessage(content="RULES:\n-  Be brief."), HumanMessage(content="- You are speaking with Adam.")]
+
+    assert response_key("gpt-4o-mini", prompt) == response_key("gpt-4o-mini", relaid)
+    assert response_key("gpt-4o-mini", prompt) != response_key("gpt-5", prompt)
+    assert response_key("gpt-4o-mini", prompt) != response_key("gpt-4o-mini", [*prompt[:1], HumanMessage(content="Sally")])
+
+
+@pytest.mark.asyncio
+async def test_cached_model_replays_responses_as_chunks_tagged_with_their_source():
+    """Test that a prompt seen before is streamed back from the cache, word by word, without calling the API."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        chunks = [
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }
+            for token in ("Hello ", "**Adam**, ", "welcome!")
+        ]
+        body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    llm = CachedChatOpenAI(
+        response_cache=ResponseCache(max_entries=16, ttl_seconds=60),
+        model="gpt-4o-mini",
+        api_key=SecretStr("x"),
+        base_url="https://api.example.com/v1",
+        http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        callbacks=[AddSourceToMessagesCallback(source="guide.public")],
+    )
+    prompt = [SystemMessage(content="Greet the user."), HumanMessage(content="- You are speaking with Adam.")]
+
+    streamed = [chunk async for chunk in llm.astream(prompt)]
+    replayed = [chunk async for chunk in llm.astream(prompt)]
+
+    assert len(requests) == 1
+    assert "".join(chunk.text() for chunk in replayed) == "Hello **Adam**, welcome!"
+    assert "".join(chunk.text() for chunk in streamed) == "Hello **Adam**, welcome!"
+    assert [chunk.text() for chunk in replayed if chunk.text()] == ["Hello ", "**Adam**, ", "welcome!"]
+    assert all(isinstance(chunk, AIMessageChunk) for chunk in replayed)
+    assert all(cast("str", chunk.additional_kwargs["source"]) == "guide.public" for chunk in replayed if chunk.text())
+    assert (await llm.ainvoke(prompt)).text() == "Hello **Adam**, welcome!"
+    assert len(requests) == 1
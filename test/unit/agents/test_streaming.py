@@ -0,0 +1,30 @@
+"""Unit tests for reading the items of a streamed JSON list."""
+
+from collections.abc import AsyncIterator
+
+import pytest
+
+from src.agents.helpers.streaming import stream_list_items
+
+
+@pytest.mark.asyncio
+async def test_stream_list_items_yields_each_item_once_the_next_one_starts():
+    """Test that items are yielded as soon as they are complete, never cut off, and all of them by the end."""
+    text = '{"events": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]}'
+    received: list[str] = []
+    seen_when_yielded: list[int] = []
+
+    async def chunks() -> AsyncIterator[str]:
+        for i in range(0, len(text), 5):
+            received.append(text[i : i + 5])
+            yield text[i : i + 5]
+
+    items: list[object] = []
+    async for item in stream_list_items(chunks(), "events"):
+        items.append(item)
+        seen_when_yielded.append(len("".join(received)))
+
+    assert items == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]
+    # The first two items are yielded before the whole text has been received.
+    assert seen_when_yielded[0] <= text.index('{"id": 2') + 5
+    assert seen_when_yielded[1] <= text.index('{"id": 3') + 5
@@ -0,0 +1,46 @@
+"""Unit tests for RecordPromptTokenUsageCallback."""
+
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation, LLMResult
+
+from src.callbacks.record_prompt_token_usage import RecordPromptTokenUsageCallback, prompt_token_usage
+
+
+def test_on_llm_end_adds_prompt_and_cached_tokens_per_source():
+    """Test that the prompt tokens of every call are added up per source, with the cached ones counted apart."""
+    prompt_token_usage.pop("test_source", None)
+    callback = RecordPromptTokenUsageCallback("test_source")
+
+    def result(input_tokens: int, cache_read: int) -> LLMResult:
+        message = AIMessage(
+            content="test",
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": 1,
+                "total_tokens": input_tokens + 1,
+                "input_token_details": {"cache_read": cache_read},
+            },
+        )
+        return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+    callback.on_llm_end(result(2000, 0), run_id=uuid4())
+    callback.on_llm_end(result(2000, 1536), run_id=uuid4())
+
+    usage = prompt_token_usage["test_source"]
+    assert (usage.calls, usage.input_tokens, usage.cached_input_tokens) == (2, 4000, 1536)
+    assert usage.cached_share() == 1536 / 4000
+
+
+def test_on_llm_end_without_usage_records_nothing():
+    """Test that responses without token usage, or that are not chat messages, are not counted as calls."""
+    prompt_token_usage.pop("test_source", None)
+    callback = RecordPromptTokenUsageCallback("test_source")
+
+    callback.on_llm_end(
+        LLMResult(generations=[[ChatGeneration(message=AIMessage(content="test"))], [Generation(text="test")]]),
+        run_id=uuid4(),
+    )
+
+    assert "test_source" not in prompt_token_usage
@@ -0,0 +1,205 @@
+"""Unit tests for EventIndex class."""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.domains.calendar.event_index import EventIndex
+from src.domains.user.mock_user_provider import me, my_user_id, sallys_user
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+
+
+def make_event(event_id: int, start_time: datetime, minutes: int = 60) -> CalendarEvent:
+    return CalendarEvent(
+        id=CalendarEventId(event_id),
+        title=f"Event {event_id}",
+        owner=my_user_id,
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=minutes),
+        created_at=start_time,
+        updated_at=start_time,
+    )
+
+
+@pytest.fixture
+def index() -> EventIndex:
+    """Create an empty EventIndex instance for testing."""
+    return EventIndex()
+
+
+def test_get_by_id(index: EventIndex):
+    """Test looking up an event by its id."""
+    event = make_event(1, datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)))
+    index.add(event)
+
+    assert index.get(CalendarEventId(1)) is event
+    assert index.get(CalendarEventId(2)) is None
+
+
+def test_get_by_id_keeps_first_duplicate(index: EventIndex):
+    """Test that duplicate ids resolve to the first event added."""
+    first = make_event(1, datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)))
+    second = make_event(1, datetime(2025, 8, 11, 10, tzinfo=ZoneInfo(me.timezone)))
+    index.add(first)
+    index.add(second)
+
+    assert index.get(CalendarEventId(1)) is first
+    assert index.on(first.start_time.date()) == [first, second]
+
+
+def test_on_sorts_by_utc_start_time(index: EventIndex):
+    """Test that events on a day are ordered by their UTC start time, not insertion order or wall clock."""
+    # 10:00 in Los Angeles is 13:00 in New York, so it sorts after 12:00 in New York.
+    los_angeles = make_event(1, datetime(2025, 8, 11, 10, tzinfo=ZoneInfo(sallys_user.timezone)))
+    new_york_noon = make_event(2, datetime(2025, 8, 11, 12, tzinfo=ZoneInfo(me.timezone)))
+    new_york_morning = make_event(3, datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)))
+    for event in (los_angeles, new_york_noon, new_york_morning):
+        index.add(event)
+
+    assert index.on(datetime(2025, 8, 11).date()) == [new_york_morning, new_york_noon, los_angeles]
+
+
+def test_on_returns_a_copy(index: EventIndex):
+    """Test that mutating the returned list does not affect the index."""
+    event = make_event(1, datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)))
+    index.add(event)
+
+    index.on(event.start_time.date()).clear()
+
+    assert index.on(event.start_time.date()) == [event]
+
+
+def test_reindex_moves_event_between_days(index: EventIndex):
+    """Test that a moved event is found under its new day only."""
+    event = make_event(1, datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)))
+    index.add(event)
+
+    event.start_time = datetime(2025, 8, 12, 9, tzinfo=ZoneInfo(me.timezone))
+    event.end_time = event.start_time + timedelta(hours=1)
+    index.reindex(event)
+
+    assert index.on(datetime(2025, 8, 11).date()) == []
+    assert index.on(datetime(2025, 8, 12).date()) == [event]
+
+
+def test_reindex_keeps_day_sorted(index: EventIndex):
+    """Test that moving an event within a day keeps the bucket sorted."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    events = [make_event(i, start + timedelta(hours=i)) for i in range(5)]
+    for event in events:
+        index.add(event)
+
+    events[0].start_time = start + timedelta(hours=10)
+    index.reindex(events[0])
+
+    assert index.on(start.date()) == [*events[1:], events[0]]
+
+
+def test_reindex_ignores_unknown_events(index: EventIndex):
+    """Test that reindexing an event that was never added is a no-op."""
+    event = make_event(1, datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone)))
+
+    index.reindex(event)
+
+    assert event not in index
+    assert index.on(event.start_time.date()) == []
+
+
+def test_between_returns_events_overlapping_the_window(index: EventIndex):
+    """Test that events spanning either boundary of the window are returned."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    before = make_event(1, start - timedelta(hours=2))  # 07:00-08:00, entirely before
+    across_start = make_event(2, start - timedelta(minutes=30))  # 08:30-09:30
+    inside = make_event(3, start + timedelta(hours=1))  # 10:00-11:00
+    across_end = make_event(4, start + timedelta(hours=2, minutes=30))  # 11:30-12:30
+    after = make_event(5, start + timedelta(hours=3))  # 12:00-13:00, starts at the exclusive end
+    for event in (after, inside, before, across_end, across_start):
+        index.add(event)
+
+    assert index.between(start, start + timedelta(hours=3)) == [across_start, inside, across_end]
+
+
+def test_between_includes_events_crossing_midnight(index: EventIndex):
+    """Test that an event running past midnight is returned for the following day."""
+    late = make_event(1, datetime(2025, 8, 11, 23, tzinfo=ZoneInfo(me.timezone)), minutes=120)
+    index.add(late)
+
+    next_day = datetime(2025, 8, 12, tzinfo=ZoneInfo(me.timezone))
+    assert index.between(next_day, next_day + timedelta(days=1)) == [late]
+    assert index.on(next_day.date()) == []
+
+
+def test_between_finds_long_events_that_started_well_before_the_window(index: EventIndex):
+    """Test that a long event is found even when short events sit between it and the window."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    offsite = make_event(1, start, minutes=3 * 24 * 60)
+    short = make_event(2, start + timedelta(days=1))
+    index.add(offsite)
+    index.add(short)
+
+    window_start = start + timedelta(days=2)
+    assert index.between(window_start, window_start + timedelta(hours=1)) == [offsite]
+
+
+def test_between_only_scans_events_near_the_window(index: EventIndex, monkeypatch: pytest.MonkeyPatch):
+    """Test that neither a multi-day event nor a long event that was shortened widens every range query."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    offsite = make_event(1, start, minutes=3 * 24 * 60)
+    workshop = make_event(2, start, minutes=20 * 60)
+    for event in (offsite, workshop, *(make_event(3 + i, start + timedelta(hours=i)) for i in range(500))):
+        index.add(event)
+    workshop.end_time = workshop.start_time + timedelta(hours=1)
+    index.reindex(workshop)
+    scanned: list[CalendarEvent] = []
+    indexed_timestamp = EventIndex._indexed_timestamp  # noqa: SLF001  # pyright: ignore reportPrivateUsage
+
+    def recording_indexed_timestamp(self: EventIndex, event: CalendarEvent) -> float:
+        scanned.append(event)
+        return indexed_timestamp(self, event)
+
+    monkeypatch.setattr(EventIndex, "_indexed_timestamp", recording_indexed_timestamp)
+
+    window_start = start + timedelta(days=2)
+    assert index.between(window_start, window_start + timedelta(hours=1)) == [offsite, index.get(CalendarEventId(3 + 48))]
+    # The bisections over 500 events, plus the few events near the window.
+    assert len(scanned) < 50
+
+
+def test_between_excludes_events_ending_at_the_window_start(index: EventIndex):
+    """Test that back-to-back events do not overlap a window starting where they end."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    index.add(make_event(1, start - timedelta(hours=1)))
+
+    assert index.between(start, start + timedelta(hours=1)) == []
+
+
+def test_between_includes_zero_length_events_at_the_window_start(index: EventIndex):
+    """Test that a zero-length event at the inclusive start is returned."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    reminder = make_event(1, start, minutes=0)
+    index.add(reminder)
+
+    assert index.between(start, start + timedelta(hours=1)) == [reminder]
+
+
+def test_between_follows_reindexed_events(index: EventIndex):
+    """Test that range queries see an event at its new time after it is moved."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+    event = make_event(1, start)
+    index.add(event)
+
+    event.start_time = start + timedelta(days=1)
+    event.end_time = event.start_time + timedelta(hours=1)
+    index.reindex(event)
+
+    assert index.between(start, start + timedelta(hours=1)) == []
+    assert index.between(event.start_time, event.end_time) == [event]
+
+
+def test_between_rejects_inverted_windows(index: EventIndex):
+    """Test that an end before the start raises ValueError."""
+    start = datetime(2025, 8, 11, 9, tzinfo=ZoneInfo(me.timezone))
+
+    with pytest.raises(ValueError, match="is before start"):
+        index.between(start, start - timedelta(hours=1))
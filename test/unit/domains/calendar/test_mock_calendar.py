@@ -1,5 +1,7 @@
 """Unit tests for MockCalendar class."""
 
+import gc
+import pickle
 from datetime import datetime
 from uuid import uuid4
 from zoneinfo import ZoneInfo
@@ -9,7 +11,7 @@ import pytest
 from src.domains.calendar.mock_calendar import MockCalendar
 from src.domains.calendar.mock_events import adams_event, my_first_event, my_second_event, sallys_event
 from src.domains.user.mock_user_provider import me, my_user_id, sallys_user, sallys_user_id
-from src.types.calendar import CalendarId
+from src.types.calendar import CalendarId, EventTimeChange
 from src.types.calendar_event import CalendarEvent, CalendarEventId
 
 
@@ -192,16 +194,26 @@ async def test_change_event_time_multiple_events(calendar: MockCalendar):
 
 @pytest.mark.asyncio
 async def test_change_event_time_updates_timestamp(calendar: MockCalendar):
-    """Test that changing event time updates the updated_at timestamp."""
-    calendar.add_event(my_first_event)
-    original_updated_at = my_first_event.updated_at
+    """Test that changing event time updates the updated_at timestamp, and keeping it does not."""
+    # A copy at fixed times, since other tests move the shared event and may already have moved it to the new time.
+    event = my_first_event.model_copy(
+        update={
+            "start_time": datetime(2025, 8, 11, 9, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+            "end_time": datetime(2025, 8, 11, 10, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        },
+    )
+    calendar.add_event(event)
+    original_updated_at = event.updated_at
+
+    await calendar.change_event_time(event.id, event.start_time, event.end_time)
+    assert event.updated_at == original_updated_at
 
     new_start_time = datetime(2025, 8, 12, 10, 0, 0, tzinfo=ZoneInfo(me.timezone))
     new_end_time = datetime(2025, 8, 12, 11, 0, 0, tzinfo=ZoneInfo(me.timezone))
 
-    await calendar.change_event_time(my_first_event.id, new_start_time, new_end_time)
+    await calendar.change_event_time(event.id, new_start_time, new_end_time)
 
-    updated_event = next(event for event in calendar.events if event.id == my_first_event.id)
+    updated_event = next(each for each in calendar.events if each.id == event.id)
     assert updated_event.updated_at > original_updated_at
 
 
@@ -239,3 +251,131 @@ async def test_change_event_time_different_owner_timezone():
     updated_event = next(event for event in calendar.events if event.id == sallys_test_event.id)
     # The updated_at should be in Sally's timezone
     assert updated_event.updated_at.tzinfo == ZoneInfo(sallys_user.timezone)
+
+
+@pytest.mark.asyncio
+async def test_change_event_time_reindexes_calendars_sharing_the_event(calendar: MockCalendar):
+    """Test that moving a shared event updates every calendar it is on."""
+    other_calendar = MockCalendar(
+        id=CalendarId(uuid4()),
+        name="Other Calendar",
+        owner=sallys_user_id,
+        created_at=datetime.now(tz=ZoneInfo(sallys_user.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(sallys_user.timezone)),
+    )
+    shared_event = CalendarEvent(
+        id=CalendarEventId(1000),
+        title="Shared Event",
+        owner=my_user_id,
+        start_time=datetime(2025, 8, 11, 9, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        end_time=datetime(2025, 8, 11, 10, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+    calendar.add_event(shared_event)
+    other_calendar.add_event(shared_event)
+
+    new_start_time = datetime(2025, 8, 12, 10, 0, 0, tzinfo=ZoneInfo(me.timezone))
+    new_end_time = datetime(2025, 8, 12, 11, 0, 0, tzinfo=ZoneInfo(me.timezone))
+    await calendar.change_event_time(shared_event.id, new_start_time, new_end_time)
+
+    for each_calendar in (calendar, other_calendar):
+        assert each_calendar.get_events_on(datetime(2025, 8, 11, tzinfo=ZoneInfo(me.timezone))) == []
+        assert each_calendar.get_events_on(new_start_time) == [shared_event]
+
+
+def test_get_events_on_indexes_events_passed_to_constructor():
+    """Test that events given at construction time are indexed like added ones."""
+    event = CalendarEvent(
+        id=CalendarEventId(1001),
+        title="Constructor Event",
+        owner=my_user_id,
+        start_time=datetime(2025, 8, 11, 9, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        end_time=datetime(2025, 8, 11, 10, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+    calendar = MockCalendar(
+        id=CalendarId(uuid4()),
+        name="Test Calendar",
+        owner=my_user_id,
+        events=[event],
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+
+    assert calendar.get_events_on(event.start_time) == [event]
+
+
+def test_unpickled_calendar_is_reindexed(calendar: MockCalendar):
+    """Test that a calendar sent to another process can still look up and move its events."""
+    calendar.add_event(my_first_event)
+
+    copy = pickle.loads(pickle.dumps(calendar))  # noqa: S301 - Round-tripping a calendar this test just built
+
+    assert copy.get_events_on(my_first_event.start_time) == [my_first_event]
+    assert copy.get_events_between(my_first_event.start_time, my_first_event.end_time) == [my_first_event]
+
+
+@pytest.mark.asyncio
+async def test_change_event_times_reports_each_change(calendar: MockCalendar):
+    """Test that a batch applies valid changes and reports unknown events as failures."""
+    event = CalendarEvent(
+        id=CalendarEventId(1002),
+        title="Batch Event",
+        owner=my_user_id,
+        start_time=datetime(2025, 8, 11, 9, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        end_time=datetime(2025, 8, 11, 10, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+    calendar.add_event(event)
+
+    new_start_time = datetime(2025, 8, 11, 11, 0, 0, tzinfo=ZoneInfo(me.timezone))
+    new_end_time = datetime(2025, 8, 11, 12, 0, 0, tzinfo=ZoneInfo(me.timezone))
+    results = await calendar.change_event_times(
+        [
+            EventTimeChange(event_id=CalendarEventId(999), new_start_time=new_start_time, new_end_time=new_end_time),
+            EventTimeChange(event_id=event.id, new_start_time=new_start_time, new_end_time=new_end_time),
+        ],
+    )
+
+    assert [result.event_id for result in results] == [CalendarEventId(999), event.id]
+    assert [result.success for result in results] == [False, True]
+    assert results[0].error == "Event with id 999 not found"
+    assert event.start_time == new_start_time
+    assert event.end_time == new_end_time
+
+
+def test_collected_calendars_leave_the_shared_event_registry():
+    """Test that an event is dropped from the registry of shared events once no calendar with it is left."""
+    event = CalendarEvent(
+        id=CalendarEventId(1003),
+        title="Short-lived Event",
+        owner=my_user_id,
+        start_time=datetime(2025, 8, 11, 9, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        end_time=datetime(2025, 8, 11, 10, 0, 0, tzinfo=ZoneInfo(me.timezone)),
+        created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+    )
+    calendars = [
+        MockCalendar(
+            id=CalendarId(uuid4()),
+            name="Test Calendar",
+            owner=my_user_id,
+            events=[event],
+            created_at=datetime.now(tz=ZoneInfo(me.timezone)),
+            updated_at=datetime.now(tz=ZoneInfo(me.timezone)),
+        )
+        for _ in range(2)
+    ]
+    # The registry is what this test checks.
+    registry = MockCalendar._calendars_by_event_id  # noqa: SLF001  # pyright: ignore reportPrivateUsage
+
+    calendars.pop()
+    gc.collect()
+    assert list(registry[event.id].values()) == calendars
+
+    calendars.pop()
+    gc.collect()
+    assert event.id not in registry
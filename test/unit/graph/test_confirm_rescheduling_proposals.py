@@ -0,0 +1,64 @@
+"""Unit tests for explaining rescheduling proposals before asking the user to confirm them."""
+
+from typing import TYPE_CHECKING
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, StateGraph
+from langgraph.types import Command
+
+from src.agents import explanation
+from src.agents.explanation import EventExplanation, ExplanationKey, Explanations
+from src.domains.user.mock_user_provider import me
+from src.graph.nodes.confirm_rescheduling_proposals.main import confirm_rescheduling_proposals
+from src.graph.nodes.explain_rescheduling_proposals.main import explain_rescheduling_proposals
+from src.types.rescheduled_event import PendingRescheduledEvent
+from src.types.state import StateWithPendingReschedulingProposals
+from src.utilities.ttl_cache import TTLCache
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
+
+@pytest.mark.asyncio
+async def test_explanations_are_not_written_again_when_the_confirmation_resumes(monkeypatch: pytest.MonkeyPatch):
+    """Test that resuming after the confirmation interrupt calls no model, even without the in-process cache."""
+    event = make_event(1, at(15))
+    calendar = make_calendar(me, [make_event(2, at(9)), event])
+    proposal = PendingRescheduledEvent(original_event=event, new_start_time=at(10), new_end_time=at(11))
+    prompts: list[str] = []
+
+    async def write_explanations(prompt_str: str) -> Explanations:
+        prompts.append(prompt_str)
+        return Explanations(events=[EventExplanation(event_id=event.id, explanation="Right after your 9am.")])
+
+    monkeypatch.setattr(explanation, "write_explanations", write_explanations)
+    monkeypatch.setattr(explanation, "explanation_cache", TTLCache[ExplanationKey, str](max_entries=16, ttl_seconds=60))
+
+    graph = StateGraph(StateWithPendingReschedulingProposals)
+    graph.add_node("explain_rescheduling_proposals", explain_rescheduling_proposals)
+    graph.add_node("confirm_rescheduling_proposals", confirm_rescheduling_proposals)
+    graph.set_entry_point("explain_rescheduling_proposals")
+    graph.add_edge("explain_rescheduling_proposals", "confirm_rescheduling_proposals")
+    graph.add_edge("confirm_rescheduling_proposals", END)
+    compiled = graph.compile(checkpointer=InMemorySaver())
+    thread: RunnableConfig = {"configurable": {"thread_id": "1"}}
+
+    state = StateWithPendingReschedulingProposals(
+        date=DATE,
+        user=me,
+        calendar=calendar,
+        invitees=[],
+        invitee_calendars={},
+        achievable_gap_reduction_minutes=300,
+        pending_rescheduling_proposals=[proposal],
+    )
+    interrupted = await compiled.ainvoke(state, thread)
+    # As if the reply reached another process, which has none of the explanations cached.
+    explanation.explanation_cache = TTLCache[ExplanationKey, str](max_entries=16, ttl_seconds=60)
+    confirmed = await compiled.ainvoke(Command(resume="CONFIRMED"), thread)
+
+    assert "Right after your 9am." in interrupted["__interrupt__"][0].value
+    assert len(prompts) == 1
+    assert [proposal.explanation for proposal in confirmed["pending_rescheduling_proposals"]] == ["Right after your 9am."]
@@ -0,0 +1,51 @@
+"""Unit tests for deciding which invitees are asked about which rescheduling proposals."""
+
+from datetime import timedelta
+
+from src.domains.user.mock_user_provider import adams_user, me, sallys_user
+from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.main import sends_to_invitees
+from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.send_message.main import describe_rescheduling_proposals
+from src.graph.nodes.send_rescheduling_proposal_to_invitee_subgraph.types import InitialState
+from src.types.rescheduled_event import PendingRescheduledEvent
+from test.fixtures.planning import at, make_event
+
+
+def test_sends_to_invitees_only_asks_attendees():
+    """Test that invitees are only asked about the events they attend, and not at all if they attend none."""
+    with_adam = make_event(1, at(9), invitees=(adams_user,))
+    with_nobody = make_event(2, at(13))
+    proposals = [
+        PendingRescheduledEvent(original_event=event, new_start_time=at(10), new_end_time=at(11), explanation="Test.")
+        for event in (with_adam, with_nobody)
+    ]
+
+    sends = sends_to_invitees(me, [adams_user, sallys_user], proposals)
+
+    assert len(sends) == 1
+    assert sends[0].node == "invoke_send_rescheduling_proposal_to_invitee"
+    assert isinstance(sends[0].arg, InitialState)
+    assert sends[0].arg.invitee == adams_user
+    assert sends[0].arg.pending_rescheduling_proposals == proposals[:1]
+
+
+def test_describe_rescheduling_proposals_batches_every_move():
+    """Test that every move goes into one message, naming the days when the moves span several."""
+    first, second = make_event(1, at(9)), make_event(2, at(13) + timedelta(days=1))
+    same_day = [
+        PendingRescheduledEvent(original_event=first, new_start_time=at(10), new_end_time=at(11), explanation="Test."),
+        PendingRescheduledEvent(original_event=second, new_start_time=at(14), new_end_time=at(15), explanation="Test."),
+    ]
+    tomorrow = at(14) + timedelta(days=1)
+    across_days = [
+        same_day[0],
+        PendingRescheduledEvent(
+            original_event=second,
+            new_start_time=tomorrow,
+            new_end_time=tomorrow + timedelta(hours=1),
+            explanation="Test.",
+        ),
+    ]
+
+    assert describe_rescheduling_proposals(same_day[:1]) == "Event 1 to 10 - 11AM"
+    assert describe_rescheduling_proposals(same_day) == "Event 1 to 10 - 11AM and Event 2 to 2 - 3PM"
+    assert describe_rescheduling_proposals(across_days) == "Event 1 to 10 - 11AM on Monday and Event 2 to 2 - 3PM on Tuesday"
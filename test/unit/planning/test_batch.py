@@ -0,0 +1,60 @@
+"""Unit tests for the batch planner."""
+
+from datetime import timedelta
+
+from src.domains.results.mock_results_store import MockReschedulingResultsStore
+from src.domains.user.mock_user_provider import MockUserProvider, adams_user, me, pauls_user, sallys_user
+from src.planning.batch import load_planning_batch, plan_batch
+from src.planning.joint import solve_jointly
+from src.planning.solver import solve_rescheduling_proposals
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+def test_load_planning_batch_reads_the_users_and_their_invitees():
+    """Test that a batch has the planned users and the invitees of their events, around the planned days only."""
+    meeting = make_event(1, at(9), invitees=(adams_user,))
+    next_week = make_event(2, at(9) + timedelta(days=7), invitees=(sallys_user,))
+    calendars = {
+        me.id: make_calendar(me, [meeting, next_week]),
+        adams_user.id: make_calendar(adams_user, [meeting]),
+        sallys_user.id: make_calendar(sallys_user, [next_week]),
+    }
+
+    batch = load_planning_batch([me, pauls_user], [DATE], calendars, MockUserProvider())
+
+    # Paul has no calendar, and Sally is only invited to an event outside the planned days.
+    assert batch.users == {me.id: me, adams_user.id: adams_user}
+    assert batch.calendars[me.id].get_events_between(DATE, DATE + timedelta(days=14)) == [meeting]
+
+
+def test_plan_batch_saves_the_solver_proposals_of_every_day():
+    """Test that the worker processes produce the same proposals as solving each day directly."""
+    tomorrow = DATE + timedelta(days=1)
+    my_events = [make_event(1, at(9)), make_event(2, at(13)), make_event(3, tomorrow + timedelta(hours=10))]
+    adams_events = [make_event(4, at(10), owner=adams_user.id), make_event(5, at(14), owner=adams_user.id)]
+    calendars = {me.id: make_calendar(me, my_events), adams_user.id: make_calendar(adams_user, adams_events)}
+    store = MockReschedulingResultsStore()
+
+    planned = plan_batch([me, adams_user], [DATE, tomorrow], calendars, MockUserProvider(), store, workers=2)
+
+    assert planned == 4
+    for user in (me, adams_user):
+        for date in (DATE, tomorrow):
+            assert store.get(user.id, date) == solve_rescheduling_proposals(date, user, calendars[user.id], [])
+    assert store.get(me.id, DATE)
+    assert store.get(sallys_user.id, DATE) is None
+
+
+def test_plan_batch_plans_users_with_shared_events_together():
+    """Test that users sharing a meeting get proposals that leave it in one place for both of them."""
+    shared = make_event(1, at(13), invitees=(adams_user,))
+    my_events = [make_event(2, at(9)), shared]
+    adams_events = [make_event(3, at(10), owner=adams_user.id), make_event(4, at(16), owner=adams_user.id), shared]
+    calendars = {me.id: make_calendar(me, my_events), adams_user.id: make_calendar(adams_user, adams_events)}
+    store = MockReschedulingResultsStore()
+
+    plan_batch([me, adams_user], [DATE], calendars, MockUserProvider(), store, workers=1)
+
+    plans = {user.id: store.get(user.id, DATE) or [] for user in (me, adams_user)}
+    assert plans == solve_jointly(DATE, [(me, calendars[me.id]), (adams_user, calendars[adams_user.id])], [])
+    assert plans[adams_user.id]
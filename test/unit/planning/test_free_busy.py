@@ -0,0 +1,186 @@
+"""Unit tests for the free/busy bitmaps."""
+
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from src.domains.calendar.mock_calendar import MockCalendar
+from src.domains.user.mock_user_provider import adams_user, me, my_user_id, sallys_user
+from src.planning.free_busy import (
+    Availability,
+    TimeWindow,
+    busy_bitmap,
+    busy_matrix,
+    gap_minutes,
+    intervals,
+    working_hours_mask,
+)
+from src.types.calendar import CalendarId
+from src.types.calendar_event import CalendarEvent, CalendarEventId
+from src.types.user import UserId
+
+NEW_YORK = ZoneInfo(me.timezone)
+
+
+def make_event(event_id: int, start_time: datetime, minutes: int = 60) -> CalendarEvent:
+    return CalendarEvent(
+        id=CalendarEventId(event_id),
+        title=f"Event {event_id}",
+        owner=my_user_id,
+        start_time=start_time,
+        end_time=start_time + timedelta(minutes=minutes),
+        created_at=start_time,
+        updated_at=start_time,
+    )
+
+
+def make_calendar(owner: UserId, events: list[CalendarEvent]) -> MockCalendar:
+    return MockCalendar(
+        id=CalendarId(uuid4()),
+        name="Test Calendar",
+        owner=owner,
+        events=events,
+        created_at=datetime.now(tz=NEW_YORK),
+        updated_at=datetime.now(tz=NEW_YORK),
+    )
+
+
+@pytest.fixture
+def window() -> TimeWindow:
+    """Create a window covering 2025-08-11 in New York."""
+    return TimeWindow.for_day(datetime(2025, 8, 11, 15, tzinfo=NEW_YORK))
+
+
+def test_window_for_day_starts_at_local_midnight_in_utc(window: TimeWindow):
+    """Test that a day window starts at local midnight and is stored in UTC."""
+    assert window.start == datetime(2025, 8, 11, 4, tzinfo=UTC)
+    assert window.minutes == 24 * 60
+    assert window.end == datetime(2025, 8, 12, 4, tzinfo=UTC)
+
+
+def test_window_for_day_handles_daylight_saving_transitions():
+    """Test that the day clocks spring forward is 23 hours long."""
+    window = TimeWindow.for_day(datetime(2025, 3, 9, 12, tzinfo=NEW_YORK))
+
+    assert window.minutes == 23 * 60
+
+
+def test_window_for_days_starts_every_local_day_at_midnight():
+    """Test that a range across the end of daylight saving time has a 25 hour day in the middle."""
+    window = TimeWindow.for_days(datetime(2025, 11, 1, 12, tzinfo=NEW_YORK), 3)
+
+    assert window.minutes == (24 + 25 + 24) * 60
+    assert window.day_starts(me.timezone).tolist() == [0, 24 * 60, (24 + 25) * 60]
+    assert window.day_index(me.timezone)[[0, 24 * 60 - 1, 24 * 60, window.minutes - 1]].tolist() == [0, 0, 1, 2]
+
+
+def test_window_offsets_round_trip(window: TimeWindow):
+    """Test converting between times and slots."""
+    nine_am = datetime(2025, 8, 11, 9, tzinfo=NEW_YORK)
+
+    assert window.offset(nine_am) == 9 * 60
+    assert window.time_at(9 * 60, me.timezone) == nine_am
+
+
+def test_busy_bitmap_marks_event_minutes(window: TimeWindow):
+    """Test that busy minutes match the events, with partial minutes rounded outwards."""
+    events = [
+        make_event(1, datetime(2025, 8, 11, 9, tzinfo=NEW_YORK)),
+        make_event(2, datetime(2025, 8, 11, 13, 0, 30, tzinfo=NEW_YORK), minutes=1),
+    ]
+
+    busy = busy_bitmap(events, window)
+
+    assert busy.shape == (24 * 60,)
+    assert busy.sum() == 60 + 2
+    assert busy[9 * 60 : 10 * 60].all()
+    assert busy[13 * 60 : 13 * 60 + 2].all()
+
+
+def test_busy_bitmap_clips_events_outside_the_window(window: TimeWindow):
+    """Test that events spilling over midnight only mark minutes inside the window."""
+    late = make_event(1, datetime(2025, 8, 11, 23, tzinfo=NEW_YORK), minutes=120)
+
+    assert busy_bitmap([late], window).sum() == 60
+
+
+def test_busy_matrix_has_one_row_per_calendar(window: TimeWindow):
+    """Test that each calendar gets its own row and ignored events are skipped."""
+    moving = make_event(1, datetime(2025, 8, 11, 9, tzinfo=NEW_YORK))
+    staying = make_event(2, datetime(2025, 8, 11, 11, tzinfo=NEW_YORK))
+    calendars = [make_calendar(my_user_id, [moving, staying]), make_calendar(adams_user.id, [])]
+
+    matrix = busy_matrix(calendars, window, ignored_event_ids={moving.id})
+
+    assert matrix.shape == (2, 24 * 60)
+    assert np.array_equal(intervals(matrix[0]), [[11 * 60, 12 * 60]])
+    assert not matrix[1].any()
+
+
+def test_working_hours_mask_uses_the_users_timezone(window: TimeWindow):
+    """Test that Sally's 11-19 Los Angeles hours are 14-22 in a New York window."""
+    mask = working_hours_mask(sallys_user, window)
+
+    assert np.array_equal(intervals(mask), [[14 * 60, 22 * 60]])
+
+
+def test_gap_minutes_counts_free_time_between_events(window: TimeWindow):
+    """Test gap totals for a single bitmap and per row of a matrix."""
+    events = [
+        make_event(1, datetime(2025, 8, 11, 9, tzinfo=NEW_YORK)),
+        make_event(2, datetime(2025, 8, 11, 13, tzinfo=NEW_YORK)),
+    ]
+    busy = busy_bitmap(events, window)
+    compact = busy_bitmap(events[:1], window)
+    empty = np.zeros(window.minutes, dtype=np.bool_)
+
+    assert gap_minutes(busy).tolist() == [180]
+    assert gap_minutes(np.stack([busy, compact, empty])).tolist() == [180, 0, 0]
+
+
+def test_gap_minutes_does_not_count_nights_as_gaps():
+    """Test that gaps are measured per day when the bitmap spans several days."""
+    window = TimeWindow.for_days(datetime(2025, 8, 11, tzinfo=NEW_YORK), 2)
+    events = [
+        make_event(1, datetime(2025, 8, 11, 9, tzinfo=NEW_YORK)),
+        make_event(2, datetime(2025, 8, 11, 11, tzinfo=NEW_YORK)),
+        make_event(3, datetime(2025, 8, 12, 9, tzinfo=NEW_YORK)),
+    ]
+    busy = busy_bitmap(events, window)
+
+    assert gap_minutes(busy, window.day_starts(me.timezone)).tolist() == [60]
+    assert gap_minutes(busy).tolist() == [(25 - 3) * 60]
+
+
+def test_intervals_of_empty_bitmap():
+    """Test that a bitmap with nothing set has no runs."""
+    assert intervals(np.zeros(10, dtype=np.bool_)).shape == (0, 2)
+
+
+def test_availability_free_intersects_working_hours_and_busy_time(window: TimeWindow):
+    """Test that free time is where every user is both working and not busy."""
+    my_meeting = make_event(1, datetime(2025, 8, 11, 14, tzinfo=NEW_YORK))
+    adams_meeting = make_event(2, datetime(2025, 8, 11, 16, tzinfo=NEW_YORK))
+    availability = Availability.build(
+        window,
+        [
+            (me, make_calendar(me.id, [my_meeting])),
+            (adams_user, make_calendar(adams_user.id, [adams_meeting])),
+            (sallys_user, make_calendar(sallys_user.id, [])),
+        ],
+    )
+
+    free = availability.free([me.id, adams_user.id, sallys_user.id])
+
+    # Sally starts at 14:00 New York time and everyone stops at 17:00.
+    assert np.array_equal(intervals(free), [[15 * 60, 16 * 60]])
+
+
+def test_availability_treats_unknown_users_as_available(window: TimeWindow):
+    """Test that users without a calendar do not restrict free time."""
+    availability = Availability.build(window, [(me, make_calendar(me.id, []))])
+
+    assert np.array_equal(availability.free([me.id, UserId(uuid4())]), availability.free([me.id]))
@@ -0,0 +1,54 @@
+"""Unit tests for planning several users' calendars jointly."""
+
+from src.domains.user.mock_user_provider import adams_user, me, pauls_user, sallys_user
+from src.planning.joint import JointCompactionProblem, solve_jointly, user_components
+from src.planning.scoring import DayScorer
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+def test_user_components_connects_users_through_shared_events():
+    """Test that users sharing an event, directly or through a common invitee, end up in the same group."""
+    events = [
+        make_event(1, at(9), invitees=(adams_user,)),
+        make_event(2, at(10), owner=sallys_user.id, invitees=(pauls_user,)),
+        make_event(3, at(11), owner=adams_user.id, invitees=(pauls_user,)),
+    ]
+
+    assert user_components([me.id, sallys_user.id], events) == [[me.id, sallys_user.id]]
+    assert user_components([me.id, sallys_user.id], events[:2]) == [[me.id], [sallys_user.id]]
+
+
+def test_solve_jointly_moves_shared_events_once_for_everyone():
+    """Test that both users' days are compacted around a shared meeting that moves for both of them at once."""
+    shared = make_event(1, at(13), invitees=(adams_user,))
+    my_calendar = make_calendar(me, [make_event(2, at(9)), shared])
+    adams_calendar = make_calendar(
+        adams_user,
+        [make_event(3, at(10), owner=adams_user.id), make_event(4, at(16), owner=adams_user.id), shared],
+    )
+
+    plans = solve_jointly(DATE, [(me, my_calendar), (adams_user, adams_calendar)], [])
+
+    for user, calendar in ((me, my_calendar), (adams_user, adams_calendar)):
+        proposals = [proposal for plan in plans.values() for proposal in plan]
+        assert DayScorer.for_day(DATE, user, calendar).score_rescheduled_events([proposals])[0].gap_minutes == 0
+    # Adam's events move around the shared meeting rather than the meeting moving twice.
+    assert [proposal.original_event.id for proposal in plans[adams_user.id]] == [3, 4]
+
+
+def test_joint_problem_never_double_books_an_attendee():
+    """Test that events owned by different users never end up overlapping for an invitee they share."""
+    mine = make_event(1, at(9), invitees=(sallys_user,))
+    adams = make_event(2, at(15), owner=adams_user.id, invitees=(sallys_user,))
+    problem = JointCompactionProblem.build(
+        DATE,
+        [(me, make_calendar(me, [mine, make_event(3, at(12))])), (adams_user, make_calendar(adams_user, [adams]))],
+        [(sallys_user, make_calendar(sallys_user, [mine, adams]))],
+    )
+
+    starts = problem.solve()
+
+    # Sally is busy for both hour-long events, so they cannot overlap.
+    sallys_row = [user.id for user in problem.users].index(sallys_user.id)
+    assert problem.row_busy(starts, sallys_row).sum() == 2 * 60
+    assert problem.objective(starts).key() <= problem.objective(problem.original_starts).key()
@@ -0,0 +1,85 @@
+"""Unit tests for replanning after invitees reject rescheduling proposals."""
+
+from datetime import datetime, timedelta
+
+from src.domains.user.mock_user_provider import adams_user, me
+from src.planning.replanning import replan_rejected_proposals, resolve_rescheduling_proposals
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import AcceptedRescheduledEvent, PendingRescheduledEvent, RejectedRescheduledEvent
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+def propose(event: CalendarEvent, start_time: datetime) -> PendingRescheduledEvent:
+    return PendingRescheduledEvent(
+        original_event=event,
+        new_start_time=start_time,
+        new_end_time=start_time + (event.end_time - event.start_time),
+        explanation="Test proposal.",
+    )
+
+
+def accept(proposal: PendingRescheduledEvent) -> AcceptedRescheduledEvent:
+    return AcceptedRescheduledEvent(**proposal.model_dump())
+
+
+def reject(proposal: PendingRescheduledEvent) -> RejectedRescheduledEvent:
+    return RejectedRescheduledEvent(**proposal.model_dump())
+
+
+def test_resolve_only_counts_rejections_of_the_exact_move():
+    """Test that a replanned move is not rejected by a rejection of the event's earlier move."""
+    first, second = make_event(1, at(9)), make_event(2, at(13))
+    rejected_earlier = propose(second, at(10))
+    plan = [propose(first, at(12)), propose(second, at(11))]
+
+    accepted, rejected = resolve_rescheduling_proposals(plan, [reject(rejected_earlier)])
+    assert [proposal.original_event.id for proposal in accepted] == [first.id, second.id]
+    assert rejected == []
+
+    accepted, rejected = resolve_rescheduling_proposals(plan, [reject(rejected_earlier), reject(plan[1])])
+    assert [proposal.original_event.id for proposal in accepted] == [first.id]
+    assert [proposal.original_event.id for proposal in rejected] == [second.id]
+
+
+def test_replan_keeps_accepted_moves_and_avoids_rejected_slots():
+    """Test that only the rejected event moves, around the accepted move and away from the rejected slot."""
+    first = make_event(1, at(9), invitees=(adams_user,))
+    second = make_event(2, at(12), invitees=(adams_user,))
+    third = make_event(3, at(15), invitees=(adams_user,))
+    calendar = make_calendar(me, [first, second, third])
+    other_invitees = [(adams_user, make_calendar(adams_user, [first, second, third]))]
+    accepted = propose(third, at(13))
+    rejected = propose(first, at(11))
+
+    replanned = replan_rejected_proposals(
+        DATE,
+        me,
+        calendar,
+        other_invitees,
+        accepted_rescheduling_proposals=[accept(accepted)],
+        rejected_rescheduling_proposals=[reject(rejected)],
+    )
+
+    assert [(proposal.original_event.id, proposal.new_start_time) for proposal in replanned] == [(first.id, at(14))]
+
+
+def test_replan_moves_events_whose_slot_was_taken():
+    """Test that a rejected event whose original slot went to an accepted move is moved somewhere free."""
+    first, second = make_event(1, at(9)), make_event(2, at(11), minutes=30)
+    calendar = make_calendar(me, [first, second])
+    # The second event was accepted into the first event's slot, but the first event's move was rejected.
+    accepted = propose(second, at(9))
+    rejected = propose(first, at(11))
+
+    replanned = replan_rejected_proposals(
+        DATE,
+        me,
+        calendar,
+        other_invitees=[],
+        accepted_rescheduling_proposals=[accept(accepted)],
+        rejected_rescheduling_proposals=[reject(rejected)],
+    )
+
+    assert [(proposal.original_event.id, proposal.new_start_time) for proposal in replanned] == [
+        (first.id, at(9) + timedelta(minutes=30)),
+    ]
@@ -0,0 +1,71 @@
+"""Unit tests for scoring candidate schedules."""
+
+from datetime import timedelta
+
+import numpy as np
+
+from src.domains.user.mock_user_provider import adams_user, me
+from src.planning.scoring import DayScorer
+from src.planning.solver import CompactionProblem
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import PendingRescheduledEvent
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+def propose(event: CalendarEvent, hour: int, minutes: int = 60) -> PendingRescheduledEvent:
+    return PendingRescheduledEvent(
+        original_event=event,
+        new_start_time=at(hour),
+        new_end_time=at(hour) + timedelta(minutes=minutes),
+        explanation="Test proposal.",
+    )
+
+
+def test_score_rescheduled_events():
+    """Test the objective of several sets of proposals, with events owned by others staying fixed."""
+    first, second, third = make_event(1, at(9)), make_event(2, at(11)), make_event(3, at(15))
+    adams_event = make_event(4, at(13), owner=adams_user.id)
+    scorer = DayScorer.for_day(DATE, me, make_calendar(me, [first, second, third, adams_event]))
+
+    nothing, one_move, two_moves, unknown = scorer.score_rescheduled_events(
+        [
+            [],
+            [propose(third, 14)],
+            [propose(second, 10), propose(third, 11), propose(first, 12, minutes=30)],
+            [propose(adams_event, 9)],
+        ],
+    )
+
+    assert (nothing.gap_minutes, nothing.moved_events) == (180, 0)
+    assert (one_move.gap_minutes, one_move.moved_events) == (120, 1)
+    assert (two_moves.gap_minutes, two_moves.moved_events) == (30, 3)
+    assert unknown == nothing
+
+
+def test_scorer_matches_the_solver():
+    """Test that scoring thousands of schedules in one call matches scoring them one by one."""
+    events = [make_event(i, at(9 + 2 * i), minutes=45) for i in range(4)]
+    problem = CompactionProblem.build(DATE, me, make_calendar(me, events), [])
+    rng = np.random.default_rng(0)
+    schedules = rng.integers(8 * 60, 17 * 60, size=(2_000, problem.size))
+
+    terms = problem.score(schedules)
+
+    assert terms.shape == (2_000, 3)
+    for row in (0, 999, 1_999):
+        assert tuple(terms[row]) == problem.objective(schedules[row]).key()
+
+
+def test_gap_reduction_bound_only_counts_gaps_movable_events_can_fill():
+    """Test that gaps between fixed events are only closable up to the minutes of the movable events."""
+    adams_events = [make_event(1, at(9), owner=adams_user.id), make_event(2, at(14), owner=adams_user.id)]
+    mine = make_event(3, at(16), minutes=30)
+
+    # The 4 hour gap between Adam's events stays at least 3.5 hours, and the 1 hour gap before mine can close.
+    scorer = DayScorer.for_day(DATE, me, make_calendar(me, [*adams_events, mine]))
+    assert scorer.gap_reduction_bound() == (240 + 60) - (240 - 30)
+
+    # Nothing can move, so nothing can be gained.
+    assert DayScorer.for_day(DATE, me, make_calendar(me, adams_events)).gap_reduction_bound() == 0
+    # A single event has no gaps around it.
+    assert DayScorer.for_day(DATE, me, make_calendar(me, [mine])).gap_reduction_bound() == 0
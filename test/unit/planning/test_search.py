@@ -0,0 +1,111 @@
+"""Unit tests for the anytime rescheduling search."""
+
+import random
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from src.domains.user.mock_user_provider import adams_user, me
+from src.planning.search import search, search_rescheduling_proposals
+from src.planning.solver import CompactionProblem, compact
+from src.planning.validation import validate_rescheduling_proposals
+from src.types.calendar_event import CalendarEvent
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+if TYPE_CHECKING:
+    from src.planning.free_busy import Offsets
+
+
+def make_busy_day(seed: int) -> tuple[list[CalendarEvent], list[CalendarEvent]]:
+    """Generate a day of non-overlapping movable events with Adam, and a few of Adam's own events."""
+    rng = random.Random(seed)
+    events: list[CalendarEvent] = []
+    free_from = 9 * 60
+    for quarter in sorted(rng.sample(range(9 * 4, 16 * 4), 14)):
+        minute = quarter * 15
+        if minute >= free_from:
+            duration = rng.choice([15, 30, 45, 60])
+            events.append(make_event(len(events) + 1, at(minute // 60, minute % 60), minutes=duration, invitees=(adams_user,)))
+            free_from = minute + duration
+    adams_events = [make_event(100 + i, at(rng.randint(9, 16)), minutes=30, owner=adams_user.id) for i in range(3)]
+    return events, adams_events
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_search_is_never_worse_than_compact(seed: int):
+    """Test that the search keeps the compact schedule as a floor and only returns valid proposals."""
+    events, adams_events = make_busy_day(seed)
+    calendar = make_calendar(me, events)
+    other_invitees = [(adams_user, make_calendar(adams_user, [*events, *adams_events]))]
+    problem = CompactionProblem.build(DATE, me, calendar, other_invitees)
+
+    proposals, objective, _ = search_rescheduling_proposals(DATE, me, calendar, other_invitees, budget_seconds=0.2)
+
+    assert objective.key() <= compact(problem).objective.key()
+    assert validate_rescheduling_proposals(DATE, me, calendar, other_invitees, proposals) == []
+
+
+def test_search_respects_the_budget_over_many_days():
+    """Test that packing a horizon of several days, which alone takes over a second, also stops at the budget."""
+    events: list[CalendarEvent] = []
+    adams_events: list[CalendarEvent] = []
+    for day in range(14):
+        days_events, days_adams_events = make_busy_day(day)
+        for event in days_events + days_adams_events:
+            moved = event.model_copy(
+                update={
+                    "id": event.id + 1000 * day,
+                    "start_time": event.start_time + timedelta(days=day),
+                    "end_time": event.end_time + timedelta(days=day),
+                },
+            )
+            (events if event in days_events else adams_events).append(moved)
+    other_invitees = [(adams_user, make_calendar(adams_user, [*events, *adams_events]))]
+    problem = CompactionProblem.build(DATE, me, make_calendar(me, events), other_invitees, days=14)
+
+    start = time.monotonic()
+    schedule = search(problem, budget_seconds=0.05)
+
+    assert time.monotonic() - start < 0.5
+    assert schedule.objective.key() <= problem.objective(problem.original_starts).key()
+
+
+def test_compact_stops_improving_at_the_deadline():
+    """Test that a passed deadline leaves the seeds as they are, and no deadline compacts the day fully."""
+    events, adams_events = make_busy_day(0)
+    other_invitees = [(adams_user, make_calendar(adams_user, [*events, *adams_events]))]
+    problem = CompactionProblem.build(DATE, me, make_calendar(me, events), other_invitees)
+    visited: list[Offsets] = []
+
+    out_of_time = compact(problem, visited=visited, deadline=time.monotonic())
+
+    assert len(visited) <= 2
+    assert out_of_time.objective.key() <= problem.objective(problem.original_starts).key()
+    assert compact(problem).objective.key() < out_of_time.objective.key()
+
+
+def test_search_escapes_where_single_moves_get_stuck():
+    """Test that the beam search finds schedules single moves cannot reach.
+
+    Adam is busy from 11:00 to 13:30, and closing the gaps around that takes several events moving together.
+    """
+    events, adams_events = make_busy_day(4)
+    other_invitees = [(adams_user, make_calendar(adams_user, [*events, *adams_events]))]
+    problem = CompactionProblem.build(DATE, me, make_calendar(me, events), other_invitees)
+
+    assert search(problem, budget_seconds=0.2).objective.key() < compact(problem).objective.key()
+
+
+def test_search_respects_the_budget():
+    """Test that the search returns close to the wall-clock budget, and a schedule no worse than the day without one."""
+    events, adams_events = make_busy_day(0)
+    other_invitees = [(adams_user, make_calendar(adams_user, [*events, *adams_events]))]
+    problem = CompactionProblem.build(DATE, me, make_calendar(me, events), other_invitees)
+
+    start = time.monotonic()
+    search(problem, budget_seconds=0.1)
+
+    assert time.monotonic() - start < 0.5
+    assert search(problem, budget_seconds=0).objective.key() <= problem.objective(problem.original_starts).key()
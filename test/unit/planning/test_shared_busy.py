@@ -0,0 +1,48 @@
+"""Unit tests for the shared-memory busy counts."""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from src.domains.user.mock_user_provider import adams_user, me, sallys_user
+from src.planning.free_busy import Availability, TimeWindow
+from src.planning.shared_busy import SharedBusyCounts
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+def test_availability_matches_building_it_from_the_calendars():
+    """Test that availability read from the shared counts, with the moved event taken out, matches the calendars."""
+    meeting = make_event(1, at(9), invitees=(adams_user,))
+    overlapping = make_event(2, at(9, 30), owner=adams_user.id)
+    calendars = {me.id: make_calendar(me, [meeting]), adams_user.id: make_calendar(adams_user, [meeting, overlapping])}
+    day = TimeWindow.for_day(DATE)
+
+    with SharedBusyCounts.publish(TimeWindow.for_days(DATE - timedelta(days=1), 3), calendars) as shared:
+        availability = shared.availability(day, [me, adams_user, sallys_user], [(meeting, [me.id, adams_user.id])])
+
+    expected = Availability.build(day, [(me, calendars[me.id]), (adams_user, calendars[adams_user.id])], {meeting.id})
+    assert availability.user_ids == [me.id, adams_user.id]
+    assert np.array_equal(availability.busy, expected.busy)
+    assert np.array_equal(availability.working_hours, expected.working_hours)
+
+
+def test_attached_counts_share_memory_with_the_publisher():
+    """Test that another handle on the block reads the published counts in place rather than a copy."""
+    calendars = {me.id: make_calendar(me, [make_event(1, at(9))])}
+
+    with SharedBusyCounts.publish(TimeWindow.for_day(DATE), calendars) as shared:
+        attached = SharedBusyCounts.attach(shared.handle)
+        shared.counts[0, 0] = 7
+        assert attached.counts[0, 0] == 7
+        assert attached.counts[0, 9 * 60] == 1
+        attached.close()
+
+
+def test_availability_outside_the_shared_window_is_rejected():
+    """Test that asking for minutes that were never published fails loudly."""
+    with (
+        SharedBusyCounts.publish(TimeWindow.for_day(DATE), {me.id: make_calendar(me, [])}) as shared,
+        pytest.raises(ValueError, match="not inside"),
+    ):
+        shared.availability(TimeWindow.for_day(DATE + timedelta(days=1)), [me])
@@ -0,0 +1,162 @@
+"""Unit tests for the compaction solver."""
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from src.domains.user.mock_user_provider import adams_user, me, sallys_user
+from src.planning.solver import (
+    CompactionProblem,
+    compact,
+    pareto_front,
+    solve_rescheduling_alternatives,
+    solve_rescheduling_proposals,
+)
+from src.types.calendar_event import CalendarEvent
+from test.fixtures.planning import DATE, NEW_YORK, at, make_calendar, make_event
+
+if TYPE_CHECKING:
+    from src.types.calendar import Calendar
+    from src.types.user import User
+
+
+def test_solver_matches_the_mock_scenario():
+    """Test the scenario from the mock calendars: only 15:00-17:00 fits Sally's hours and her customer call."""
+    brainstorming = make_event(1, at(9), invitees=(adams_user, sallys_user))
+    sprint_review = make_event(2, at(13), invitees=(adams_user, sallys_user))
+    adams_meeting = make_event(3, at(10), minutes=120, owner=adams_user.id)
+    sallys_call = make_event(4, datetime(2025, 8, 11, 11, tzinfo=ZoneInfo(sallys_user.timezone)), owner=sallys_user.id)
+    other_invitees: list[tuple[User, Calendar]] = [
+        (adams_user, make_calendar(adams_user, [adams_meeting, brainstorming, sprint_review])),
+        (sallys_user, make_calendar(sallys_user, [brainstorming, sprint_review, sallys_call])),
+    ]
+
+    proposals = solve_rescheduling_proposals(DATE, me, make_calendar(me, [brainstorming, sprint_review]), other_invitees)
+
+    assert [(p.original_event.id, p.new_start_time, p.new_end_time) for p in proposals] == [
+        (brainstorming.id, at(15), at(16)),
+        (sprint_review.id, at(16), at(17)),
+    ]
+    assert all(p.new_start_time.tzinfo == NEW_YORK for p in proposals)
+    assert proposals[0].explanation is not None
+    assert "from 180 to 0 minutes" in proposals[0].explanation
+
+
+def test_solver_moves_as_few_events_as_possible():
+    """Test that closing a gap moves one event rather than both."""
+    calendar = make_calendar(me, [make_event(1, at(9)), make_event(2, at(11))])
+
+    proposals = solve_rescheduling_proposals(DATE, me, calendar, [])
+
+    assert len(proposals) == 1
+    assert proposals[0].new_end_time - proposals[0].new_start_time == timedelta(hours=1)
+    # Either event can move, but the day must end up back to back.
+    assert {proposals[0].new_start_time} <= {at(10)}
+
+
+def test_solver_keeps_fixed_events_in_place():
+    """Test that events owned by someone else are never moved but still block time."""
+    fixed = make_event(1, at(10), owner=adams_user.id)
+    mine = make_event(2, at(14))
+    calendar = make_calendar(me, [fixed, mine])
+
+    proposals = solve_rescheduling_proposals(DATE, me, calendar, [])
+
+    assert [(p.original_event.id, p.new_start_time) for p in proposals] in ([(mine.id, at(11))], [(mine.id, at(9))])
+
+
+def test_solver_respects_invitee_conflicts():
+    """Test that a move never lands on an invitee's other events."""
+    mine = make_event(1, at(9), invitees=(adams_user,))
+    other = make_event(2, at(13))
+    adams_busy = make_event(3, at(10), minutes=180, owner=adams_user.id)
+    adams_calendar = make_calendar(adams_user, [mine, adams_busy])
+
+    proposals = solve_rescheduling_proposals(DATE, me, make_calendar(me, [mine, other]), [(adams_user, adams_calendar)])
+
+    # Adam is busy 10-13, so the only way to close the gap is to move the Sprint Review back to 10.
+    assert [(p.original_event.id, p.new_start_time) for p in proposals] == [(other.id, at(10))]
+
+
+@pytest.mark.parametrize(
+    "events",
+    [
+        [],
+        [make_event(1, at(9))],
+        [make_event(1, at(9)), make_event(2, at(10)), make_event(3, at(11), minutes=30)],
+    ],
+)
+def test_solver_leaves_compact_days_alone(events: list[CalendarEvent]):
+    """Test that days with nothing to gain produce no proposals."""
+    assert solve_rescheduling_proposals(DATE, me, make_calendar(me, events), []) == []
+
+
+def test_compact_never_makes_the_objective_worse():
+    """Test that the solver's objective is never worse than the current schedule."""
+    calendar = make_calendar(me, [make_event(i, at(9 + 2 * i), minutes=45) for i in range(4)])
+    problem = CompactionProblem.build(DATE, me, calendar, [])
+
+    schedule = compact(problem)
+
+    assert schedule.objective.key() < problem.objective(problem.original_starts).key()
+    assert schedule.objective.gap_minutes == 0
+
+
+def test_solver_compacts_every_day_of_a_range():
+    """Test that a range is solved in one go, with every event staying on its own day by default."""
+    tomorrow = DATE + timedelta(days=1)
+    events = [make_event(1, at(9)), make_event(2, at(11)), make_event(3, tomorrow + timedelta(hours=9), minutes=30)]
+    events.append(make_event(4, tomorrow + timedelta(hours=14), minutes=30))
+
+    proposals = solve_rescheduling_proposals(DATE, me, make_calendar(me, events), [], days=2)
+
+    assert sorted(p.new_start_time.date() for p in proposals) == [DATE.date(), tomorrow.date()]
+    assert all(p.new_start_time.date() == p.original_event.start_time.date() for p in proposals)
+    problem = CompactionProblem.build(DATE, me, make_calendar(me, events), [], days=2)
+    assert problem.score_rescheduled_events([proposals])[0].gap_minutes == 0
+
+
+def test_solver_only_moves_events_across_days_when_allowed():
+    """Test that an event that cannot be compacted on its own day moves to another day when allowed."""
+    tomorrow = DATE + timedelta(days=1)
+    stuck = make_event(1, at(9), invitees=(adams_user,))
+    others = [make_event(2, at(16), invitees=(adams_user,)), make_event(3, tomorrow + timedelta(hours=9))]
+    adams_busy = make_event(4, at(10), minutes=6 * 60, owner=adams_user.id)
+    calendar = make_calendar(me, [stuck, *others])
+    other_invitees: list[tuple[User, Calendar]] = [(adams_user, make_calendar(adams_user, [stuck, *others, adams_busy]))]
+
+    assert solve_rescheduling_proposals(DATE, me, calendar, other_invitees, days=2) == []
+
+    proposals = solve_rescheduling_proposals(DATE, me, calendar, other_invitees, days=2, allow_cross_day_moves=True)
+
+    assert len(proposals) == 1
+    assert proposals[0].new_start_time.date() == tomorrow.date()
+
+
+def test_pareto_front_drops_dominated_schedules():
+    """Test that only schedules no other schedule beats on every criterion are kept, ties included."""
+    criteria = np.array([[0, 2, 1], [60, 1, 0], [60, 2, 0], [0, 2, 1], [30, 1, 1]], dtype=np.int64)
+
+    assert pareto_front(criteria).tolist() == [True, True, False, True, True]
+
+
+def test_solver_offers_alternatives_from_the_same_solve():
+    """Test that a plan closing fewer gaps with fewer moves and no invitees disrupted is offered next to the proposals."""
+    events = [
+        make_event(1, at(9), invitees=(adams_user, sallys_user)),
+        make_event(2, at(11)),
+        make_event(3, at(14), invitees=(adams_user,)),
+        make_event(4, at(16)),
+    ]
+
+    proposals, alternatives = solve_rescheduling_alternatives(DATE, me, make_calendar(me, events), [])
+
+    assert [alternative.name for alternative in alternatives] == ["most_gap_saved", "fewest_moves"]
+    most_gap_saved, fewest_moves = alternatives
+    assert most_gap_saved.pending_rescheduling_proposals == proposals
+    assert (most_gap_saved.objective.gap_minutes, most_gap_saved.disrupted_invitees) == (0, 1)
+    assert [(p.original_event.id, p.new_start_time) for p in fewest_moves.pending_rescheduling_proposals] == [(4, at(10))]
+    assert (fewest_moves.objective.gap_minutes, fewest_moves.disrupted_invitees) == (120, 0)
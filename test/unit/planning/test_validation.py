@@ -0,0 +1,138 @@
+"""Unit tests for the rescheduling proposal validator."""
+
+from datetime import datetime, timedelta
+
+from src.domains.user.mock_user_provider import adams_user, me, sallys_user
+from src.planning.validation import drop_invalid_proposals, validate_rescheduling_proposals
+from src.types.calendar_event import CalendarEvent
+from src.types.rescheduled_event import PendingRescheduledEvent
+from test.fixtures.planning import DATE, at, make_calendar, make_event
+
+
+def propose(event: CalendarEvent, start_time: datetime, minutes: int | None = None) -> PendingRescheduledEvent:
+    duration = event.end_time - event.start_time if minutes is None else timedelta(minutes=minutes)
+    return PendingRescheduledEvent(
+        original_event=event,
+        new_start_time=start_time,
+        new_end_time=start_time + duration,
+        explanation="Test proposal.",
+    )
+
+
+def test_valid_proposals_have_no_violations():
+    """Test that a move into free time inside working hours is accepted, including into another moved event's old slot."""
+    first, second = make_event(1, at(9)), make_event(2, at(13))
+    calendar = make_calendar(me, [first, second])
+
+    proposals = [propose(second, at(10)), propose(first, at(13))]
+
+    assert validate_rescheduling_proposals(DATE, me, calendar, [], proposals) == []
+
+
+def test_conflicts_with_unchanged_events():
+    """Test that a move onto one of the user's unchanged events is a conflict."""
+    first, second = make_event(1, at(9)), make_event(2, at(13))
+    calendar = make_calendar(me, [first, second])
+
+    violations = validate_rescheduling_proposals(DATE, me, calendar, [], [propose(second, at(9, 30))])
+
+    assert [(violation.event_id, violation.kind) for violation in violations] == [(second.id, "conflict")]
+    assert me.given_name in violations[0].message
+
+
+def test_conflicts_with_invitee_calendars():
+    """Test that a move onto an attendee's other event is a conflict, while non-attendees are ignored."""
+    meeting = make_event(1, at(13), invitees=(adams_user,))
+    adams_calendar = make_calendar(adams_user, [meeting, make_event(2, at(10), owner=adams_user.id)])
+    sallys_calendar = make_calendar(sallys_user, [make_event(3, at(11), owner=sallys_user.id)])
+    other_invitees = [(adams_user, adams_calendar), (sallys_user, sallys_calendar)]
+    calendar = make_calendar(me, [meeting])
+
+    conflicting = validate_rescheduling_proposals(DATE, me, calendar, other_invitees, [propose(meeting, at(10))])
+    not_attending = validate_rescheduling_proposals(DATE, me, calendar, other_invitees, [propose(meeting, at(11))])
+
+    assert [violation.kind for violation in conflicting] == ["conflict"]
+    assert adams_user.given_name in conflicting[0].message
+    assert not_attending == []
+
+
+def test_rule_violations():
+    """Test the working hours, duration, same day and ownership rules."""
+    event = make_event(1, at(13))
+    not_owned = make_event(2, at(15), owner=adams_user.id)
+    calendar = make_calendar(me, [event, not_owned])
+
+    def kinds(proposal: PendingRescheduledEvent) -> list[str]:
+        return [violation.kind for violation in validate_rescheduling_proposals(DATE, me, calendar, [], [proposal])]
+
+    assert kinds(propose(event, at(8))) == ["outside_working_hours"]
+    assert kinds(propose(event, at(16, 30))) == ["outside_working_hours"]
+    assert kinds(propose(event, at(10), minutes=30)) == ["duration_changed"]
+    assert kinds(propose(event, at(10) + timedelta(days=1))) == ["different_day"]
+    assert kinds(propose(not_owned, at(10))) == ["not_owned"]
+
+
+def test_working_hours_of_every_attendee():
+    """Test that a move has to be inside the working hours of every attendee, as in the solver, not only the user's."""
+    # Sally works from 11:00 to 19:00 in Los Angeles, which is 14:00 to 22:00 for the user.
+    meeting = make_event(1, at(13), invitees=(sallys_user,))
+    sallys_calendar = make_calendar(sallys_user, [meeting])
+    calendar = make_calendar(me, [meeting])
+
+    too_early = validate_rescheduling_proposals(DATE, me, calendar, [(sallys_user, sallys_calendar)], [propose(meeting, at(10))])
+    inside_both = validate_rescheduling_proposals(
+        DATE,
+        me,
+        calendar,
+        [(sallys_user, sallys_calendar)],
+        [propose(meeting, at(14))],
+    )
+
+    assert [violation.kind for violation in too_early] == ["outside_working_hours"]
+    assert sallys_user.given_name in too_early[0].message
+    assert me.given_name not in too_early[0].message
+    assert inside_both == []
+
+
+def test_range_rules_for_moves_across_days():
+    """Test that moves to another day of the range are only valid when allowed, and never leave the range."""
+    event = make_event(1, at(13))
+    calendar = make_calendar(me, [event])
+
+    def kinds(proposal: PendingRescheduledEvent, *, allow_cross_day_moves: bool) -> list[str]:
+        violations = validate_rescheduling_proposals(
+            DATE,
+            me,
+            calendar,
+            [],
+            [proposal],
+            days=2,
+            allow_cross_day_moves=allow_cross_day_moves,
+        )
+        return [violation.kind for violation in violations]
+
+    assert kinds(propose(event, at(10) + timedelta(days=1)), allow_cross_day_moves=False) == ["different_day"]
+    assert kinds(propose(event, at(10) + timedelta(days=1)), allow_cross_day_moves=True) == []
+    assert kinds(propose(event, at(10) + timedelta(days=2)), allow_cross_day_moves=True) == ["different_day"]
+
+
+def test_proposals_cannot_overlap_each_other():
+    """Test that two moved events cannot land on top of each other, and that duplicate proposals are rejected."""
+    first, second = make_event(1, at(9)), make_event(2, at(13))
+    calendar = make_calendar(me, [first, second])
+
+    overlapping = [propose(first, at(11)), propose(second, at(11, 30))]
+    duplicated = [propose(first, at(11)), propose(first, at(14))]
+
+    assert [v.kind for v in validate_rescheduling_proposals(DATE, me, calendar, [], overlapping)] == ["conflict"]
+    assert [v.kind for v in validate_rescheduling_proposals(DATE, me, calendar, [], duplicated)] == ["duplicate"]
+
+
+def test_drop_invalid_proposals_repeats_until_valid():
+    """Test that dropping an invalid proposal also drops the proposals that relied on its event moving."""
+    first, second, third = make_event(1, at(9)), make_event(2, at(11)), make_event(3, at(14))
+    calendar = make_calendar(me, [first, second, third])
+    # `first` moves into the slot `second` leaves, but `second` moves outside working hours.
+    proposals = [propose(first, at(11)), propose(second, at(18)), propose(third, at(12))]
+
+    assert drop_invalid_proposals(DATE, me, calendar, [], proposals) == [proposals[2]]
@@ -0,0 +1,31 @@
+"""Unit tests for the bounded LRU cache with a TTL."""
+
+from src.utilities.ttl_cache import TTLCache
+
+
+def test_evicts_the_least_recently_used_entry():
+    """Test that reading an entry keeps it, and the entry untouched for longest is evicted when full."""
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_expires_entries_after_the_ttl():
+    """Test that entries are gone once their TTL has passed, and that a cache without room stores nothing."""
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    now[0] = 9.9
+    assert cache.get("a") == 1
+    now[0] = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+    disabled: TTLCache[str, int] = TTLCache(max_entries=0, ttl_seconds=10)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None